@@ -0,0 +1,76 @@
+"""
+Benchmark for the startup cost of importing eknowledge.
+
+Times fresh interpreters running `import eknowledge`, an empty interpreter
+as the baseline, and `import eknowledge` together with
+`langchain_core.messages`, the cost every import paid while the package
+loaded LangChain eagerly. Each statement runs in its own subprocess so that
+nothing is cached between runs; the minimum and median wall times are
+reported, with the baseline subtracted.
+
+Usage:
+    python -m benchmarks.bench_import [--repeat 20] [--output results.json]
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+STATEMENTS = [
+    ("baseline", "pass"),
+    ("import eknowledge", "import eknowledge"),
+    ("import eknowledge+langchain", "import eknowledge, langchain_core.messages"),
+]
+
+
+def time_statement(statement: str, repeat: int) -> list:
+    """Returns the wall time of repeat fresh interpreters running statement."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    statements = STATEMENTS
+    if importlib.util.find_spec("langchain_core") is None:
+        print("langchain-core is not installed; skipping the comparison with it.")
+        statements = STATEMENTS[:2]
+
+    results = {}
+    for name, statement in statements:
+        timings = time_statement(statement, args.repeat)
+        results[name] = {"min_seconds": min(timings), "median_seconds": statistics.median(timings)}
+    baseline = results["baseline"]
+    for name, metrics in results.items():
+        metrics["import_seconds"] = max(0.0, metrics["median_seconds"] - baseline["median_seconds"])
+        print(
+            f"{name:<28} min {metrics['min_seconds'] * 1000:8.1f} ms  "
+            f"median {metrics['median_seconds'] * 1000:8.1f} ms  "
+            f"import {metrics['import_seconds'] * 1000:8.1f} ms"
+        )
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark for LLM response parsing.
+
+Compares `parse_response` with the per-node regex searches it replaced on
+large synthetic responses.
+
+Usage:
+    python -m benchmarks.bench_parser [--nodes 10000] [--repeat 5]
+"""
+import argparse
+import re
+import time
+
+from eknowledge import parse_response, RELATIONS
+
+
+def make_response(node_count: int) -> str:
+    """Builds a synthetic response with node_count nodes and some noise."""
+    parts = ["Sure! Here are the relationships I found:\n<nodes>\n"]
+    for i in range(node_count):
+        relation = RELATIONS[i % len(RELATIONS)]
+        parts.append(
+            "<node>\n"
+            f"  <from_node>Entity number {i}</from_node>\n"
+            f"  <relationship>{relation}</relationship>\n"
+            f"  <to_node>Entity number {i + 1}</to_node>\n"
+            "</node>\n"
+        )
+    parts.append("</nodes>\nLet me know if you need anything else.")
+    return "".join(parts)
+
+
+def legacy_parse(content: str) -> list:
+    """The parsing previously done inline in `execute_graph_generation`."""
+    edges = []
+    for node_content in re.findall(r"<node>(.*?)</node>", content, re.DOTALL):
+        from_node_match = re.search(r"<from_node>(.*?)</from_node>", node_content)
+        relationship_match = re.search(r"<relationship>(.*?)</relationship>", node_content)
+        to_node_match = re.search(r"<to_node>(.*?)</to_node>", node_content)
+        if from_node_match and relationship_match and to_node_match:
+            edges.append({
+                "from": from_node_match.group(1).strip(),
+                "relationship": relationship_match.group(1).strip(),
+                "to": to_node_match.group(1).strip()
+            })
+    return edges
+
+
+def best_time(func, content: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = make_response(args.nodes)
+    megabytes = len(content.encode("utf-8")) / 1e6
+    candidates = [
+        ("legacy regex", legacy_parse),
+        ("parse_response", parse_response),
+        ("parse_response+validate", lambda text: parse_response(text, relations=RELATIONS)),
+    ]
+
+    print(f"Response: {args.nodes} nodes, {megabytes:.2f} MB")
+    for name, func in candidates:
+        seconds = best_time(func, content, args.repeat)
+        print(f"{name:<26} {seconds * 1000:9.2f} ms  {megabytes / seconds:8.1f} MB/s  {args.nodes / seconds:12.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark suite for the extraction pipeline's own overhead.
+
+Runs text splitting, response parsing and `execute_graph_generation`
+(sequential, concurrent and cached) against `FakeLLM`, and reports
+throughput, chunk latency percentiles, retries and peak memory. Results are
+printed as a table and can be written as JSON for comparison between
+releases with `benchmarks.compare`.
+
+Chunk latency is the time a chunk spent waiting on the LLM plus sleeping
+between retries, as reported by `ChunkResult`. An untimed warm-up chunk
+runs first so that one-off lazy imports do not skew the first pass. Peak memory is measured with
+tracemalloc in a separate pass so that it does not slow the timed pass.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--words 20000] [--chunk-size 100]
+        [--latency 0.001] [--distribution constant] [--failure-rate 0.0]
+        [--malformed-rate 0.0] [--concurrency 8] [--seed 0]
+        [--output results.json]
+"""
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+
+from eknowledge import (
+    ResponseCache, RetryPolicy, execute_graph_generation, iter_graph_generation, parse_response,
+    split_text_by_words, RELATIONS,
+)
+from .bench_parser import make_response
+from .fake_llm import FakeLLM, LATENCY_DISTRIBUTIONS
+
+VOCABULARY = (
+    "Python", "language", "Guido", "created", "interpreter", "library", "module", "package",
+    "network", "protocol", "server", "client", "database", "index", "query", "graph", "node",
+    "edge", "relation", "ontology", "protein", "cell", "disease", "symptom", "treatment",
+)
+
+
+def make_text(word_count: int) -> str:
+    """Builds a deterministic text of word_count words."""
+    return " ".join(VOCABULARY[(i * 7 + i // 13) % len(VOCABULARY)] for i in range(word_count))
+
+
+def percentile(values, fraction: float) -> float:
+    """Returns the nearest-rank percentile of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def peak_memory(func) -> int:
+    """Runs func under tracemalloc and returns the peak allocation in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_split(text: str, chunk_size: int) -> dict:
+    start = time.perf_counter()
+    chunks = split_text_by_words(text, chunk_size)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "chunks": len(chunks),
+        "words_per_second": len(text.split()) / seconds if seconds else 0.0,
+        "peak_memory_bytes": peak_memory(lambda: split_text_by_words(text, chunk_size)),
+    }
+
+
+def bench_parse(node_count: int) -> dict:
+    content = make_response(node_count)
+    start = time.perf_counter()
+    parse_response(content, relations=RELATIONS)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "nodes": node_count,
+        "nodes_per_second": node_count / seconds if seconds else 0.0,
+        "megabytes_per_second": len(content.encode("utf-8")) / 1e6 / seconds if seconds else 0.0,
+        "peak_memory_bytes": peak_memory(lambda: parse_response(content, relations=RELATIONS)),
+    }
+
+
+def run_generation(text, llm_options, options) -> dict:
+    """Runs one generation pass and summarises its chunks."""
+    llm = FakeLLM(**llm_options)
+    start = time.perf_counter()
+    results = list(iter_graph_generation(text=text, llm=llm, **options))
+    seconds = time.perf_counter() - start
+    latencies = [result.llm_seconds + result.sleep_seconds for result in results]
+    return {
+        "seconds": seconds,
+        "chunks": len(results),
+        "chunks_per_second": len(results) / seconds if seconds else 0.0,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p99": percentile(latencies, 0.99),
+        "overhead_seconds": max(0.0, seconds - sum(latencies) / options.get("max_concurrency", 1)),
+        "llm_calls": llm.calls,
+        "retries": sum(result.retries for result in results),
+        "failed_chunks": sum(not result.success for result in results),
+        "cached_chunks": sum(result.cached for result in results),
+        "edges": sum(len(result.edges) for result in results),
+    }
+
+
+def warm_up(chunk_size: int) -> None:
+    """
+    Runs one untimed chunk so that lazy imports are not charged to a pass.
+
+    The first LLM call otherwise pays for importing the LangChain message
+    classes, which inflates the first chunk's latency of whichever pass runs
+    first.
+    """
+    execute_graph_generation(text=make_text(chunk_size), llm=FakeLLM(latency=0.0), chunk_size=chunk_size)
+
+
+def bench_generation(text, llm_options, options, warm_cache=False) -> dict:
+    """Times a generation mode, then measures its peak memory separately."""
+    if warm_cache:
+        options = dict(options, cache=ResponseCache(max_entries=len(text.split())))
+        execute_graph_generation(text=text, llm=FakeLLM(**llm_options), **options)
+    result = run_generation(text, llm_options, options)
+    result["peak_memory_bytes"] = peak_memory(lambda: run_generation(text, llm_options, options))
+    return result
+
+
+def run_suite(args) -> dict:
+    text = make_text(args.words)
+    llm_options = {
+        "latency": args.latency,
+        "distribution": args.distribution,
+        "failure_rate": args.failure_rate,
+        "malformed_rate": args.malformed_rate,
+        "seed": args.seed,
+    }
+    retry_policy = RetryPolicy(base_delay=args.retry_delay, jitter=0, max_attempts=args.max_retries)
+    options = {"chunk_size": args.chunk_size, "retry_policy": retry_policy, "max_retries": args.max_retries}
+    warm_up(args.chunk_size)
+    return {
+        "split_text_by_words": bench_split(text, args.chunk_size),
+        "parse_response": bench_parse(args.nodes),
+        "generation_sequential": bench_generation(text, llm_options, options),
+        "generation_concurrent": bench_generation(text, llm_options, dict(options, max_concurrency=args.concurrency)),
+        "generation_cached": bench_generation(text, llm_options, options, warm_cache=True),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--nodes", type=int, default=10000, help="Nodes in the parsing benchmark's response.")
+    parser.add_argument("--latency", type=float, default=0.001, help="Mean fake LLM latency in seconds.")
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="constant")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--retry-delay", type=float, default=0.001)
+    parser.add_argument("--max-retries", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": results,
+    }
+
+    for name, metrics in results.items():
+        summary = "  ".join(
+            f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in metrics.items()
+        )
+        print(f"{name:<24} {summary}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Compares two JSON reports written by `benchmarks.bench_pipeline`.
+
+Prints every numeric metric present in both reports with its relative
+change, flagging changes larger than the threshold.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.1]
+"""
+import argparse
+import json
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change worth flagging.")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    candidate = load_results(args.candidate)
+    for name in sorted(baseline.keys() & candidate.keys()):
+        for metric in sorted(baseline[name].keys() & candidate[name].keys()):
+            old, new = baseline[name][metric], candidate[name][metric]
+            if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+                continue
+            change = (new - old) / old if old else 0.0
+            flag = "  <--" if abs(change) > args.threshold else ""
+            print(f"{name:<24} {metric:<20} {old:>14.4g} {new:>14.4g} {change:>+8.1%}{flag}")
+
+
+if __name__ == "__main__":
+    main()
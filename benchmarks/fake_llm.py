@@ -0,0 +1,142 @@
+"""
+A deterministic stand-in for a chat model, for benchmarking the pipeline.
+
+`FakeLLM` answers every request locally with well-formed nodes built from
+the words of the chunk, after a simulated latency. Transport failures and
+malformed responses are injected at configurable rates. All randomness is
+derived from the seed and the request itself, so a run produces the same
+responses, failures and latencies regardless of thread scheduling.
+"""
+import asyncio
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+
+from eknowledge import RELATIONS
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+_SECTION = re.compile(r'<section id="(\d+)">(.*?)</section>', re.DOTALL)
+_WORD = re.compile(r"\w+")
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """
+    A local chat model exposing `invoke` and `ainvoke`.
+
+    Args:
+        latency: The mean simulated latency of a call, in seconds.
+        distribution: One of LATENCY_DISTRIBUTIONS.
+        sigma: The shape of the lognormal distribution; larger values give
+               a heavier tail.
+        failure_rate: The probability that a call raises ConnectionError.
+        malformed_rate: The probability that a call returns no parseable
+                        nodes.
+        edges_per_chunk: The number of nodes in a well-formed response.
+        seed: The seed all randomness is derived from.
+    """
+
+    model = "fake"
+
+    def __init__(
+            self,
+            latency: float = 0.001,
+            distribution: str = "constant",
+            sigma: float = 0.5,
+            failure_rate: float = 0.0,
+            malformed_rate: float = 0.0,
+            edges_per_chunk: int = 5,
+            seed: int = 0,
+    ):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {', '.join(LATENCY_DISTRIBUTIONS)}.")
+        if not 0 <= failure_rate < 1 or not 0 <= malformed_rate < 1:
+            raise ValueError("failure_rate and malformed_rate must be between 0 and 1.")
+        self.latency = latency
+        self.distribution = distribution
+        self.sigma = sigma
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.edges_per_chunk = edges_per_chunk
+        self.seed = seed
+        self.calls = 0
+        self.failures = 0
+        self.malformed = 0
+        self._attempts = {}
+        self._lock = threading.Lock()
+
+    def _plan(self, messages):
+        """Decides the latency and outcome of one call deterministically."""
+        prompt = messages[-1].content
+        with self._lock:
+            self.calls += 1
+            attempt = self._attempts.get(prompt, 0)
+            self._attempts[prompt] = attempt + 1
+        digest = hashlib.sha256(f"{self.seed}:{attempt}:{prompt}".encode("utf-8")).digest()
+        rng = random.Random(digest)
+
+        if self.distribution == "constant":
+            delay = self.latency
+        elif self.distribution == "uniform":
+            delay = rng.uniform(0, 2 * self.latency)
+        elif self.distribution == "exponential":
+            delay = rng.expovariate(1 / self.latency) if self.latency > 0 else 0.0
+        else:
+            # Choose mu so that the mean of the distribution equals latency
+            delay = rng.lognormvariate(0, self.sigma) * self.latency / math.exp(self.sigma ** 2 / 2)
+
+        outcome = rng.random()
+        if outcome < self.failure_rate:
+            with self._lock:
+                self.failures += 1
+            return delay, None
+        if outcome < self.failure_rate + self.malformed_rate:
+            with self._lock:
+                self.malformed += 1
+            return delay, "I could not find any relationships in this text."
+        return delay, self._respond(prompt, rng)
+
+    def _respond(self, prompt, rng):
+        """Builds a well-formed response from the words of the prompt's text."""
+        sections = _SECTION.findall(prompt)
+        if not sections:
+            parts = prompt.split("======")
+            sections = [(None, parts[1] if len(parts) > 2 else prompt)]
+        nodes = []
+        for index in range(self.edges_per_chunk):
+            source, text = sections[index % len(sections)]
+            words = _WORD.findall(text) or ["empty"]
+            position = rng.randrange(len(words))
+            nodes.append(
+                "<node>"
+                f"<from_node>{words[position]}</from_node>"
+                f"<relationship>{RELATIONS[rng.randrange(len(RELATIONS))]}</relationship>"
+                f"<to_node>{words[(position + 1) % len(words)]}</to_node>"
+                + (f"<source>{source}</source>" if source is not None else "")
+                + "</node>"
+            )
+        return "<nodes>" + "".join(nodes) + "</nodes>"
+
+    def invoke(self, messages):
+        delay, content = self._plan(messages)
+        if delay > 0:
+            time.sleep(delay)
+        if content is None:
+            raise ConnectionError("Simulated transport failure.")
+        return FakeResponse(content)
+
+    async def ainvoke(self, messages):
+        delay, content = self._plan(messages)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if content is None:
+            raise ConnectionError("Simulated transport failure.")
+        return FakeResponse(content)
@@ -1 +1,15 @@
-from .main import execute_graph_generation, split_text_by_words, SYSTEM_PROMPT, USER_PROMPT, RELATIONS
\ No newline at end of file
+from .main import execute_graph_generation, aexecute_graph_generation, iter_graph_generation, aiter_graph_generation, split_text_by_words, ChunkResult, SYSTEM_PROMPT, USER_PROMPT, PACKED_USER_PROMPT, RELATIONS
+from .cache import ResponseCache, SQLiteCacheBackend, make_cache_key
+from .chunking import iter_word_chunks, Chunker, WordChunker, SentenceChunker, ContentDefinedChunker, estimate_tokens, prompt_overhead_tokens
+from .graph import KnowledgeGraph, normalize_label
+from .parser import parse_response, ParseResult
+from .retry import RetryPolicy, RetryBudget
+from .ratelimit import RateLimiter, TokenBucket
+from .checkpoint import CheckpointJournal
+from .corpus import execute_corpus_graph_generation, iter_corpus_graph_generation, DocumentResult
+from .preselect import RelationSelector
+from .instrumentation import Callback, Event, MetricsAggregator, PrintCallback, OpenTelemetryCallback
+from .export import EdgeWriter, JsonlWriter, CsvWriter, GraphMLWriter, NTriplesWriter, BinaryWriter, BinaryGraphReader, open_writer
+from .incremental import execute_incremental_graph_generation, GraphSnapshot, IncrementalResult
+from .resolution import EntityResolver, AliasTable, resolve_edges, resolve_graph
+from .adaptive import AdaptiveChunker, AdaptiveStep
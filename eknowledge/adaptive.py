@@ -0,0 +1,156 @@
+import threading
+from typing import Iterator, NamedTuple
+from .chunking import Chunker, _iter_words
+from .instrumentation import ATTEMPT_FAILED, CHUNK_END, Callback, Event
+
+
+class AdaptiveStep(NamedTuple):
+    """
+    One adjustment made by `AdaptiveChunker`.
+
+    Attributes:
+        chunk_size: The chunk size the observed window was produced with.
+        next_chunk_size: The chunk size chosen for the following chunks.
+        chunks: The number of chunks observed in the window.
+        failure_rate: Unparseable responses per LLM call in the window.
+        mean_latency: The mean LLM seconds per chunk in the window.
+        edges_per_second: Edges extracted per second spent on the LLM.
+    """
+    chunk_size: int
+    next_chunk_size: int
+    chunks: int
+    failure_rate: float
+    mean_latency: float
+    edges_per_second: float
+
+
+class AdaptiveChunker(Chunker, Callback):
+    """
+    Chunks a word stream with a size tuned while the run progresses.
+
+    Pass it as `chunker`; generation registers it as a callback so that it
+    observes every completed chunk. After each window of chunks it adjusts
+    the chunk size, AIMD style:
+
+    - When the format failure rate exceeds max_failure_rate, or the mean
+      latency exceeds target_latency, the size is cut multiplicatively.
+    - Otherwise the size moves by step words in the current direction,
+      reversing direction when the edges extracted per LLM second (which
+      accounts for both latency and yield) fell by more than tolerance
+      compared with the previous window.
+
+    Words are pulled from the source lazily, so each new chunk uses the
+    latest size. With concurrency, up to twice max_concurrency chunks are
+    cut ahead of the feedback. Cached chunks carry no timing information
+    and are ignored.
+
+    Args:
+        initial_size: The chunk size in words to start with.
+        min_size: The smallest chunk size the controller may choose.
+        max_size: The largest chunk size the controller may choose.
+        step: The additive change in words; defaults to a quarter of
+              initial_size.
+        decrease: The factor applied to the size on failures or slow
+                  responses.
+        window: The number of completed chunks between adjustments.
+        max_failure_rate: The tolerated share of unparseable responses.
+        target_latency: An optional upper bound on the mean LLM seconds per
+                        chunk.
+        tolerance: The relative drop in edges per second that reverses the
+                   search direction.
+
+    Attributes:
+        chunk_size: The size used for the next chunk.
+        history: The `AdaptiveStep` adjustments made so far.
+    """
+
+    def __init__(
+            self,
+            initial_size: int = 100,
+            min_size: int = 20,
+            max_size: int = 1000,
+            step: int = None,
+            decrease: float = 0.5,
+            window: int = 8,
+            max_failure_rate: float = 0.2,
+            target_latency: float = None,
+            tolerance: float = 0.05,
+    ):
+        for name, value in (("initial_size", initial_size), ("min_size", min_size), ("max_size", max_size),
+                            ("window", window)):
+            if not isinstance(value, int) or value <= 0:
+                raise ValueError(f"{name} must be a positive integer.")
+        if not min_size <= initial_size <= max_size:
+            raise ValueError("initial_size must be between min_size and max_size.")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1.")
+        self.chunk_size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.step = step if step is not None else max(1, initial_size // 4)
+        self.decrease = decrease
+        self.window = window
+        self.max_failure_rate = max_failure_rate
+        self.target_latency = target_latency
+        self.tolerance = tolerance
+        self.history = []
+        self._direction = 1
+        self._previous_rate = None
+        self._lock = threading.Lock()
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._chunks = 0
+        self._calls = 0
+        self._format_failures = 0
+        self._edges = 0
+        self._llm_seconds = 0.0
+
+    def split(self, source) -> Iterator[str]:
+        words = _iter_words(source)
+        current = []
+        for word in words:
+            current.append(word)
+            if len(current) >= self.chunk_size:
+                yield " ".join(current)
+                current = []
+        if current:
+            yield " ".join(current)
+
+    def on_event(self, event: Event) -> None:
+        data = event.data
+        if event.name == ATTEMPT_FAILED:
+            if data["reason"] == "format":
+                with self._lock:
+                    self._format_failures += 1
+        elif event.name == CHUNK_END and not data["cached"]:
+            with self._lock:
+                self._chunks += 1
+                self._calls += data["retries"] + 1
+                self._edges += data["edges"]
+                self._llm_seconds += data["llm_seconds"]
+                if self._chunks >= self.window:
+                    self._adjust()
+
+    def _adjust(self) -> None:
+        """Chooses the next chunk size from the completed window."""
+        failure_rate = self._format_failures / self._calls
+        mean_latency = self._llm_seconds / self._chunks
+        rate = self._edges / self._llm_seconds if self._llm_seconds > 0 else 0.0
+        size = self.chunk_size
+
+        if failure_rate > self.max_failure_rate or (
+                self.target_latency is not None and mean_latency > self.target_latency):
+            size = int(size * self.decrease)
+            self._direction = 1
+            self._previous_rate = None
+        else:
+            if self._previous_rate is not None and rate < self._previous_rate * (1 - self.tolerance):
+                self._direction = -self._direction
+            size += self._direction * self.step
+            self._previous_rate = rate
+
+        size = max(self.min_size, min(self.max_size, size))
+        self.history.append(AdaptiveStep(self.chunk_size, size, self._chunks, failure_rate, mean_latency, rate))
+        self.chunk_size = size
+        self._reset_window()
@@ -0,0 +1,237 @@
+import functools
+import hashlib
+import inspect
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _stable_repr(value) -> str:
+    """
+    Returns repr(value) when it is the same in every process, else the type name.
+
+    Default object reprs embed a memory address, and a custom `__repr__` may
+    fail; either would make the key unusable across runs.
+    """
+    try:
+        text = repr(value)
+    except Exception:
+        return type(value).__qualname__
+    if _ADDRESS.search(text):
+        return type(value).__qualname__
+    return text
+
+
+def model_identity(llm) -> str:
+    """
+    Describes which model an LLM object talks to, for use in cache keys.
+
+    LangChain chat models expose the model name as `model` or `model_name`;
+    the class name is included so that different providers serving a model
+    under the same name do not share entries. Callable clients may set a
+    `model` attribute too; otherwise they are identified by their qualified
+    name, plus the bound arguments of a `functools.partial`, the object of a
+    bound method, or the definition site and captured variables of a lambda
+    or nested function. Arguments and variables whose repr is not stable
+    across processes are represented by their type.
+    """
+    for attribute in ("model", "model_name"):
+        value = getattr(llm, attribute, None)
+        if isinstance(value, str):
+            return f"{type(llm).__qualname__}:{value}"
+    if hasattr(llm, "invoke"):
+        return type(llm).__qualname__
+    if isinstance(llm, functools.partial):
+        arguments = [_stable_repr(argument) for argument in llm.args]
+        arguments += [f"{name}={_stable_repr(value)}" for name, value in sorted(llm.keywords.items())]
+        return f"{model_identity(llm.func)}({', '.join(arguments)})"
+    if inspect.ismethod(llm):
+        return f"{model_identity(llm.__self__)}.{llm.__name__}"
+    if inspect.isfunction(llm):
+        name = f"{llm.__module__}.{llm.__qualname__}"
+        if "<" in name:
+            # Lambdas and nested functions share names; where they are defined and what they capture differ
+            code = llm.__code__
+            captured = []
+            for cell in llm.__closure__ or ():
+                try:
+                    contents = cell.cell_contents
+                except ValueError:
+                    captured.append("")
+                else:
+                    captured.append(_stable_repr(contents))
+            name += f"@{code.co_filename}:{code.co_firstlineno}[{', '.join(captured)}]"
+        return name
+    return type(llm).__qualname__
+
+
+def make_cache_key(chunk: str, system_prompt: str, user_prompt: str, relations, model: str, options=None) -> str:
+    """
+    Builds a content-addressed key for a chunk extraction request.
+
+    Args:
+        chunk: The chunk text.
+        system_prompt: The system message sent with the request.
+        user_prompt: The fully formatted user message.
+        relations: The relationship types offered to the LLM.
+        model: The model identity, see `model_identity`.
+        options: An optional dictionary of JSON-serialisable settings that
+                 change which edges are kept, such as relation validation.
+                 Empty options give the same key as none.
+
+    Returns:
+        A hex SHA-256 digest identifying the request.
+    """
+    parts = [chunk, system_prompt, user_prompt, [str(relation) for relation in relations], model]
+    if options:
+        parts.append(options)
+    payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """
+    Persistent cache tier storing parsed edges in a SQLite database.
+
+    Entries are evicted least-recently-used first once the stored payloads
+    exceed `max_bytes`. The backend can be shared between threads.
+    """
+
+    def __init__(self, path: str, max_bytes: int = None):
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes <= 0):
+            raise ValueError("max_bytes must be a positive integer.")
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS edges ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM edges WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE edges SET accessed = ? WHERE key = ?", (time.time(), key)
+                )
+        return json.loads(row[0])
+
+    def set(self, key: str, edges) -> None:
+        value = json.dumps(edges, ensure_ascii=False, separators=(",", ":"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO edges (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            if self.max_bytes is not None:
+                self._evict()
+
+    def _evict(self) -> None:
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM edges").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._connection.execute("SELECT key, size FROM edges ORDER BY accessed ASC")
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._connection.executemany("DELETE FROM edges WHERE key = ?", evicted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM edges")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class ResponseCache:
+    """
+    Caches parsed edges per chunk request so repeated chunks skip the LLM.
+
+    Lookups go to an in-memory LRU tier first and then to an optional
+    persistent backend such as `SQLiteCacheBackend`; backend hits are promoted
+    into memory. The cache is thread-safe and counts hits and misses.
+
+    Args:
+        max_entries: The maximum number of entries kept in memory.
+        backend: An optional persistent tier exposing `get(key)` and
+                 `set(key, edges)`.
+    """
+
+    def __init__(self, max_entries: int = 1024, backend=None):
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer.")
+        self.max_entries = max_entries
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Returns a copy of the cached edges for key, or None on a miss."""
+        with self._lock:
+            edges = self._entries.get(key)
+            if edges is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return [dict(edge) for edge in edges]
+
+        edges = self.backend.get(key) if self.backend is not None else None
+        with self._lock:
+            if edges is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, edges)
+        return [dict(edge) for edge in edges]
+
+    def set(self, key: str, edges) -> None:
+        """Stores the edges produced for key in every tier."""
+        edges = [dict(edge) for edge in edges]
+        with self._lock:
+            self._remember(key, edges)
+        if self.backend is not None:
+            self.backend.set(key, edges)
+
+    def _remember(self, key, edges) -> None:
+        self._entries[key] = edges
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """Empties the in-memory tier and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+
+
+class CheckpointJournal:
+    """
+    An append-only JSONL journal of completed chunks, for resuming runs.
+
+    Every chunk that produced edges is appended as one line holding its
+    request key (see `make_cache_key`), its index and its edges. Opening an
+    existing journal loads these entries so that a rerun over the same input
+    skips finished chunks. Each line is written with a single `os.write` on a
+    file opened in append mode, so concurrent workers (threads or processes)
+    never interleave records, and a line torn by a crash is ignored on load.
+
+    Args:
+        path: The journal file. It is created if it does not exist.
+        fsync: Whether to fsync after every record. Off by default; records
+               are still handed to the OS immediately, so they survive a
+               crash of the Python process.
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self._entries = {}
+        self._lock = threading.Lock()
+        torn = self._load()
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        if torn:
+            # Terminate the torn line so the next record starts cleanly
+            self._write(b"\n")
+
+    def _load(self) -> bool:
+        """Reads existing records and returns whether the last line is torn."""
+        try:
+            handle = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        last_line = b"\n"
+        with handle:
+            for line in handle:
+                last_line = line
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and "key" in record and "edges" in record:
+                    self._entries[record["key"]] = record["edges"]
+        return not last_line.endswith(b"\n")
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        if self.fsync:
+            os.fsync(self._fd)
+
+    def get(self, key: str):
+        """Returns a copy of the edges recorded for key, or None."""
+        edges = self._entries.get(key)
+        if edges is None:
+            return None
+        return [dict(edge) for edge in edges]
+
+    def record(self, key: str, index: int, edges) -> None:
+        """Appends a completed chunk to the journal."""
+        edges = [dict(edge) for edge in edges]
+        line = json.dumps({"key": key, "index": index, "edges": edges}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._write(line.encode("utf-8"))
+            self._entries[key] = edges
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,302 @@
+import math
+import mmap
+import os
+import re
+import zlib
+from collections import deque
+from typing import Iterable, Iterator
+from .prompts import SYSTEM_PROMPT, USER_PROMPT
+from .relations import RELATIONS
+
+# Block size used when reading file objects, in characters.
+READ_BLOCK_SIZE = 64 * 1024
+
+# Rough number of characters per token for English text with BPE tokenizers.
+CHARS_PER_TOKEN = 4
+
+_WORD_BYTES = re.compile(rb"\S+")
+_SENTENCE_END = re.compile(r"[.!?][\"'\)\]]*$")
+
+
+def iter_word_chunks(source, chunk_size: int, use_mmap: bool = False, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Lazily splits a text source into chunks of at most chunk_size words.
+
+    This is the streaming counterpart of `split_text_by_words`: words are
+    read incrementally and each chunk is yielded as soon as it is full, so
+    peak memory is proportional to chunk_size rather than to the size of the
+    document.
+
+    Args:
+        source: The text to split. Accepts a string, a path (`os.PathLike`),
+                a file object opened in text mode, or an iterable of strings
+                (typically lines; item boundaries are treated as whitespace).
+        chunk_size: The maximum number of words allowed in each chunk. Must be
+                    a positive integer.
+        use_mmap: When source is a path, memory-map the file instead of
+                  reading it in blocks. Words are then separated by ASCII
+                  whitespace only.
+        encoding: The encoding used to decode files opened from a path.
+
+    Returns:
+        An iterator over the chunk strings.
+
+    Raises:
+        ValueError: If chunk_size is not a positive integer.
+        TypeError: If source is not one of the supported types.
+    """
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    return _group_words(_iter_words(source, use_mmap, encoding), chunk_size)
+
+
+def _iter_words(source, use_mmap: bool = False, encoding: str = "utf-8") -> Iterator[str]:
+    """Returns an iterator over the words of any text source `iter_word_chunks` accepts."""
+    if isinstance(source, str):
+        return _iter_block_words([source])
+    if isinstance(source, os.PathLike):
+        if use_mmap:
+            return _iter_mmap_words(source, encoding)
+        return _iter_file_words(source, encoding)
+    if hasattr(source, "read"):
+        return _iter_block_words(iter(lambda: source.read(READ_BLOCK_SIZE), ""))
+    if isinstance(source, Iterable) and not isinstance(source, (bytes, bytearray)):
+        return _iter_line_words(source)
+    raise TypeError("Input 'text' must be a string, path, file object or iterable of strings.")
+
+
+def _group_words(words: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """Joins consecutive words into chunks of at most chunk_size words."""
+    current_chunk = []
+    for word in words:
+        current_chunk.append(word)
+        if len(current_chunk) == chunk_size:
+            yield " ".join(current_chunk)
+            current_chunk = []
+    if current_chunk:
+        yield " ".join(current_chunk)
+
+
+def _iter_block_words(blocks: Iterable[str]) -> Iterator[str]:
+    """Yields the words of a text delivered in arbitrary blocks."""
+    # A block can end in the middle of a word, so the trailing fragment is
+    # carried over and prefixed to the next block.
+    carry = ""
+    for block in blocks:
+        if not isinstance(block, str):
+            raise TypeError("Input 'text' must be a string, path, file object or iterable of strings.")
+        words = (carry + block).split()
+        carry = ""
+        if words and not block[-1:].isspace():
+            carry = words.pop()
+        yield from words
+    if carry:
+        yield carry
+
+
+def _iter_line_words(lines: Iterable[str]) -> Iterator[str]:
+    """Yields the words of an iterable of lines."""
+    for line in lines:
+        if not isinstance(line, str):
+            raise TypeError("Input 'text' must be a string, path, file object or iterable of strings.")
+        yield from line.split()
+
+
+def _iter_file_words(path, encoding: str) -> Iterator[str]:
+    """Yields the words of a file read in fixed-size blocks."""
+    with open(path, "r", encoding=encoding) as handle:
+        yield from _iter_block_words(iter(lambda: handle.read(READ_BLOCK_SIZE), ""))
+
+
+def _iter_mmap_words(path, encoding: str) -> Iterator[str]:
+    """Yields the words of a memory-mapped file."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for match in _WORD_BYTES.finditer(mapped):
+                yield match.group().decode(encoding)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximates the number of tokens in a text without a tokenizer.
+
+    The estimate assumes about four characters per token, which is close
+    enough for budgeting context windows.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def prompt_overhead_tokens(system_prompt: str = SYSTEM_PROMPT, user_prompt: str = USER_PROMPT, relations=RELATIONS) -> int:
+    """Estimates the tokens each request spends on prompts before any chunk text."""
+    return estimate_tokens(system_prompt) + estimate_tokens(user_prompt.format(text="", relationships=relations))
+
+
+class Chunker:
+    """
+    Base class for chunking strategies.
+
+    Subclasses implement `split`, which turns a text source into an iterator
+    of chunk strings. A chunker can be passed to `execute_graph_generation`
+    in place of the fixed word-count splitting.
+    """
+
+    def split(self, source) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class WordChunker(Chunker):
+    """Splits text into chunks of at most chunk_size words."""
+
+    def __init__(self, chunk_size: int = 100):
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+        self.chunk_size = chunk_size
+
+    def split(self, source) -> Iterator[str]:
+        return iter_word_chunks(source, self.chunk_size)
+
+
+class SentenceChunker(Chunker):
+    """
+    Packs whole sentences into chunks sized by an approximate token budget.
+
+    Sentences are never cut unless a single sentence exceeds the budget on its
+    own. Consecutive chunks can share trailing sentences so that relations
+    spanning a boundary are seen in full by at least one request.
+
+    Args:
+        max_tokens: The token budget for the chunk text. Derived from
+                    context_window when omitted.
+        overlap: The number of trailing sentences repeated at the start of the
+                 next chunk. Overlap is capped at half of the budget.
+        context_window: The model's context size in tokens. The budget is what
+                        remains after the prompt overhead and reserve_output.
+        reserve_output: Tokens kept free for the model's response.
+        system_prompt: The system prompt used to estimate the overhead.
+        user_prompt: The user prompt template used to estimate the overhead.
+        relations: The relations used to estimate the overhead.
+    """
+
+    def __init__(
+            self,
+            max_tokens: int = None,
+            overlap: int = 0,
+            context_window: int = None,
+            reserve_output: int = 1024,
+            system_prompt: str = SYSTEM_PROMPT,
+            user_prompt: str = USER_PROMPT,
+            relations=RELATIONS,
+    ):
+        if max_tokens is None:
+            if context_window is None:
+                raise ValueError("Either max_tokens or context_window must be provided.")
+            max_tokens = context_window - reserve_output - prompt_overhead_tokens(system_prompt, user_prompt, relations)
+        if not isinstance(max_tokens, int) or max_tokens <= 0:
+            raise ValueError("max_tokens must be a positive integer.")
+        if not isinstance(overlap, int) or overlap < 0:
+            raise ValueError("overlap must be a non-negative integer.")
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+
+    def split(self, source) -> Iterator[str]:
+        budget = self.max_tokens * CHARS_PER_TOKEN
+        current = deque()
+        current_chars = 0
+        has_new_text = False
+
+        for sentence in self._iter_sentences(source):
+            sentence_chars = len(sentence) + 1
+            if current and current_chars + sentence_chars > budget:
+                if has_new_text:
+                    yield " ".join(current)
+                current, current_chars = self._carry_over(current)
+                has_new_text = False
+                # The carried sentences may leave no room for the new one
+                while current and current_chars + sentence_chars > budget:
+                    current_chars -= len(current.popleft()) + 1
+            current.append(sentence)
+            current_chars += sentence_chars
+            has_new_text = True
+
+        if current and has_new_text:
+            yield " ".join(current)
+
+    def _carry_over(self, sentences):
+        """Keeps up to `overlap` trailing sentences within half of the budget."""
+        carried = deque()
+        carried_chars = 0
+        limit = self.max_tokens * CHARS_PER_TOKEN // 2
+        for sentence in reversed(sentences):
+            if len(carried) == self.overlap or carried_chars + len(sentence) + 1 > limit:
+                break
+            carried.appendleft(sentence)
+            carried_chars += len(sentence) + 1
+        return carried, carried_chars
+
+    def _iter_sentences(self, source) -> Iterator[str]:
+        """Yields sentences, cutting any sentence longer than the budget by words."""
+        budget = self.max_tokens * CHARS_PER_TOKEN
+        words = []
+        chars = 0
+        for word in _iter_words(source):
+            if words and chars + len(word) + 1 > budget:
+                yield " ".join(words)
+                words = []
+                chars = 0
+            words.append(word)
+            chars += len(word) + 1
+            if _SENTENCE_END.search(word):
+                yield " ".join(words)
+                words = []
+                chars = 0
+        if words:
+            yield " ".join(words)
+
+
+class ContentDefinedChunker(Chunker):
+    """
+    Cuts chunks where the content says so rather than every N words.
+
+    A rolling hash over the most recent words decides where a chunk ends,
+    so boundaries depend only on nearby text. Inserting or deleting words
+    in a document therefore changes the chunks around the edit, while the
+    chunks before and after it stay identical. This is what lets
+    incremental extraction reuse most of a previous run.
+
+    Args:
+        chunk_size: The target average number of words per chunk.
+        min_size: The minimum number of words per chunk, except for the
+                  last one. Defaults to half of chunk_size.
+        max_size: The maximum number of words per chunk. Defaults to twice
+                  chunk_size.
+    """
+
+    def __init__(self, chunk_size: int = 100, min_size: int = None, max_size: int = None):
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+        if min_size is None:
+            min_size = max(1, chunk_size // 2)
+        if max_size is None:
+            max_size = chunk_size * 2
+        if not isinstance(min_size, int) or not isinstance(max_size, int) or not 0 < min_size <= max_size:
+            raise ValueError("min_size and max_size must be positive integers with min_size <= max_size.")
+        self.chunk_size = chunk_size
+        self.min_size = min_size
+        self.max_size = max_size
+        # After min_size words, a boundary occurs with probability 1/divisor per word
+        self._divisor = max(1, chunk_size - min_size)
+
+    def split(self, source) -> Iterator[str]:
+        words = []
+        rolling = 0
+        for word in _iter_words(source):
+            words.append(word)
+            # Each word's contribution is shifted out after 32 further words
+            rolling = ((rolling << 1) + zlib.crc32(word.encode("utf-8"))) & 0xFFFFFFFF
+            if len(words) >= self.max_size or (len(words) >= self.min_size and rolling % self._divisor == 0):
+                yield " ".join(words)
+                words = []
+        if words:
+            yield " ".join(words)
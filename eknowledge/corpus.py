@@ -0,0 +1,204 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import NamedTuple
+from .chunking import iter_word_chunks
+from .graph import KnowledgeGraph
+from .prompts import PACKED_USER_PROMPT, USER_PROMPT
+from .main import _group, _map_bounded, _pack_steps, _run_chunk, _run_settings, _validate_arguments, iter_graph_generation
+
+
+class DocumentResult(NamedTuple):
+    """
+    The graph extracted from one document of a corpus.
+
+    Attributes:
+        doc_id: The identifier the document was submitted with.
+        chunks: The document's `ChunkResult` objects, in chunk order.
+    """
+    doc_id: object
+    chunks: list
+
+    @property
+    def edges(self) -> list:
+        """The document's edge dictionaries, in chunk order."""
+        return [edge for result in self.chunks for edge in result.edges]
+
+    def edges_with_provenance(self) -> list:
+        """The document's edges, each with "doc_id" and "chunk" keys added."""
+        return [
+            dict(edge, doc_id=self.doc_id, chunk=result.index)
+            for result in self.chunks
+            for edge in result.edges
+        ]
+
+
+def _round_robin_jobs(documents, chunk_size, chunker, active_documents, pack_size=1):
+    """
+    Interleaves the chunks of several documents, one pack per document in turn.
+
+    At most active_documents documents are being chunked at any time; the
+    next document is opened when one runs out of chunks. Each document ends
+    with a `(doc_id, None)` marker so that consumers know when all of its
+    chunks have been scheduled.
+
+    Yields:
+        Tuples of doc_id and a pack, a list of up to pack_size consecutive
+        (chunk index, chunk text) pairs of that document.
+    """
+    documents = iter(documents)
+    active = []
+    exhausted = False
+    while active or not exhausted:
+        while not exhausted and len(active) < active_documents:
+            try:
+                doc_id, text = next(documents)
+            except StopIteration:
+                exhausted = True
+                break
+            chunks = chunker.split(text) if chunker is not None else iter_word_chunks(text, chunk_size)
+            active.append([doc_id, _group(enumerate(chunks, 1), pack_size)])
+
+        still_active = []
+        for entry in active:
+            doc_id, packs = entry
+            pack = next(packs, None)
+            yield doc_id, pack
+            if pack is not None:
+                still_active.append(entry)
+        active = still_active
+
+
+def _process_document(doc_id, text, llm, chunk_size, max_concurrency, chunker, options):
+    """Extracts one whole document; runs inside a worker process."""
+    chunks = list(iter_graph_generation(
+        text=text, llm=llm, chunk_size=chunk_size, max_concurrency=max_concurrency,
+        chunker=chunker, **options,
+    ))
+    return DocumentResult(doc_id, chunks)
+
+
+def iter_corpus_graph_generation(
+        documents,
+        llm=None,
+        chunk_size=100,
+        max_concurrency=1,
+        processes=None,
+        chunker=None,
+        **options,
+):
+    """
+    Generates knowledge graphs for many documents through one shared work queue.
+
+    Chunks from different documents are scheduled round-robin, so one long
+    document cannot starve the others, and all of them share the same pool
+    of max_concurrency workers. With processes set, documents are instead
+    sharded across that many worker processes, each running max_concurrency
+    threads; the LLM object must then be picklable.
+
+    Args:
+        documents: An iterable of (doc_id, text) pairs. text accepts anything
+                   `execute_graph_generation` accepts.
+        llm: A LangChain-compatible chat model exposing `invoke`, or a
+             callable client (see `execute_graph_generation`).
+        chunk_size: The maximum number of words per chunk.
+        max_concurrency: The number of chunks processed at the same time (per
+                         process when processes is set).
+        processes: The number of worker processes, or None to run in threads
+                   of the current process.
+        chunker: An optional `Chunker` used instead of chunk_size.
+        **options: Further arguments for `iter_graph_generation`, such as
+                   relations, max_retries, pack_size, cache or retry_policy.
+                   cache, rate_limiter, checkpoint and callbacks are only
+                   supported without processes.
+
+    Yields:
+        A `DocumentResult` for each document as soon as all of its chunks have
+        completed. With processes set, documents are yielded in completion
+        order; otherwise in the order their last chunk was scheduled.
+
+    Raises:
+        ValueError: If no LLM is provided, max_concurrency, processes or
+                    pack_size is not a positive integer, or a shared object is
+                    combined with processes.
+        TypeError: If llm neither exposes `invoke` nor is callable, or an
+                   option is not accepted by `iter_graph_generation`.
+    """
+    options = dict(options)
+    pack_size = options.pop("pack_size", 1)
+    _validate_arguments(
+        llm, max_concurrency, pack_size,
+        options.get("user_prompt", USER_PROMPT), options.get("packed_user_prompt", PACKED_USER_PROMPT),
+    )
+    # Built in both modes so that unknown options fail here rather than in a worker
+    settings = _run_settings(llm, chunker, **options)
+    if processes is not None:
+        if not isinstance(processes, int) or processes <= 0:
+            raise ValueError("processes must be a positive integer.")
+        shared = ("cache", "rate_limiter", "checkpoint")
+        if any(options.get(name) is not None for name in shared) or options.get("callbacks"):
+            raise ValueError("cache, rate_limiter, checkpoint and callbacks cannot be shared across processes.")
+        options["pack_size"] = pack_size
+        yield from _iter_process_sharded(documents, llm, chunk_size, max_concurrency, processes, chunker, options)
+        return
+
+    results = {}
+
+    def process(job):
+        doc_id, pack = job
+        if pack is None:
+            return doc_id, None
+        return doc_id, _run_chunk(_pack_steps(pack, "?", settings, pack_size > 1), llm)
+
+    jobs = _round_robin_jobs(documents, chunk_size, chunker, max_concurrency * 2, pack_size)
+    if max_concurrency == 1:
+        completed = map(process, jobs)
+    else:
+        completed = _map_bounded(process, jobs, max_concurrency)
+
+    for doc_id, pack_results in completed:
+        if pack_results is None:
+            yield DocumentResult(doc_id, results.pop(doc_id, []))
+        else:
+            results.setdefault(doc_id, []).extend(pack_results)
+
+
+def _iter_process_sharded(documents, llm, chunk_size, max_concurrency, processes, chunker, options):
+    """Runs whole documents in worker processes, yielding them as they finish."""
+    window = processes * 2
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = set()
+        for doc_id, text in documents:
+            pending.add(executor.submit(
+                _process_document, doc_id, text, llm, chunk_size, max_concurrency, chunker, options,
+            ))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def execute_corpus_graph_generation(documents, llm=None, as_graph=False, **kwargs) -> dict:
+    """
+    Generates knowledge graphs for many documents.
+
+    Takes the same arguments as `iter_corpus_graph_generation`.
+
+    Args:
+        as_graph: Whether to map each document to a deduplicated
+                  `KnowledgeGraph` instead of its list of edge dictionaries.
+
+    Returns:
+        A dictionary mapping each doc_id to its list of edge dictionaries, or
+        to its `KnowledgeGraph` when as_graph is set.
+    """
+    graphs = {}
+    for result in iter_corpus_graph_generation(documents, llm=llm, **kwargs):
+        if as_graph:
+            graph = KnowledgeGraph()
+            for chunk in result.chunks:
+                graph.add_chunk(chunk.edges)
+            graphs[result.doc_id] = graph
+        else:
+            graphs[result.doc_id] = result.edges
+    return graphs
@@ -0,0 +1,397 @@
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterator, Tuple
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+from .graph import KnowledgeGraph
+
+# Binary format: header, int32 edge rows, node table, relation table, footer.
+BINARY_MAGIC = b"EKGB"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sI")
+_FOOTER = struct.Struct("<QQQQQ4s")
+_EDGE_BATCH = 65536
+
+
+def _open_target(target, mode: str, **kwargs):
+    """Returns a file object for target and whether the caller must close it."""
+    if isinstance(target, (str, os.PathLike)):
+        return open(target, mode, **kwargs), True
+    return target, False
+
+
+class EdgeWriter:
+    """
+    Base class of the streaming export writers.
+
+    Edges are written as they arrive, so a graph can be exported while it
+    is being generated without holding it in memory. Writers accept a path
+    (opened and closed by the writer) or an open file object.
+    """
+
+    def write_edge(self, from_node: str, relationship: str, to_node: str) -> None:
+        raise NotImplementedError
+
+    def write_edges(self, edges) -> int:
+        """Writes an iterable of edge dictionaries and returns how many were written."""
+        count = 0
+        for edge in edges:
+            self.write_edge(edge["from"], edge["relationship"], edge["to"])
+            count += 1
+        return count
+
+    def write_results(self, results) -> int:
+        """Writes the edges of an iterable of `ChunkResult` objects, as they arrive."""
+        return sum(self.write_edges(result.edges) for result in results)
+
+    def write_graph(self, graph: KnowledgeGraph) -> int:
+        """Writes the unique edges of a `KnowledgeGraph`."""
+        count = 0
+        for edge in graph.edges():
+            self.write_edge(*edge)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _TextWriter(EdgeWriter):
+    def __init__(self, target, newline=None):
+        self._file, self._owned = _open_target(target, "w", encoding="utf-8", newline=newline)
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._finish()
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+        self._file = None
+
+    def _finish(self) -> None:
+        pass
+
+
+class JsonlWriter(_TextWriter):
+    """Writes one JSON edge dictionary per line."""
+
+    def write_edge(self, from_node: str, relationship: str, to_node: str) -> None:
+        self._file.write(json.dumps(
+            {"from": from_node, "relationship": relationship, "to": to_node}, ensure_ascii=False,
+        ) + "\n")
+
+
+class CsvWriter(_TextWriter):
+    """Writes a CSV file with a from,relationship,to header."""
+
+    def __init__(self, target):
+        super().__init__(target, newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(("from", "relationship", "to"))
+
+    def write_edge(self, from_node: str, relationship: str, to_node: str) -> None:
+        self._writer.writerow((from_node, relationship, to_node))
+
+
+class GraphMLWriter(_TextWriter):
+    """
+    Writes a directed GraphML graph.
+
+    Each node is declared the first time it is seen, so only the node IDs
+    are kept in memory. Node labels and edge relationships are stored as
+    "label" and "relationship" data.
+    """
+
+    def __init__(self, target):
+        super().__init__(target)
+        self._node_ids = {}
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+            '  <key id="relationship" for="edge" attr.name="relationship" attr.type="string"/>\n'
+            '  <graph id="G" edgedefault="directed">\n'
+        )
+
+    def _node(self, label: str) -> str:
+        node_id = self._node_ids.get(label)
+        if node_id is None:
+            node_id = f"n{len(self._node_ids)}"
+            self._node_ids[label] = node_id
+            self._file.write(f'    <node id="{node_id}"><data key="label">{escape(label)}</data></node>\n')
+        return node_id
+
+    def write_edge(self, from_node: str, relationship: str, to_node: str) -> None:
+        source, target = self._node(from_node), self._node(to_node)
+        self._file.write(
+            f'    <edge source="{source}" target="{target}">'
+            f'<data key="relationship">{escape(relationship)}</data></edge>\n'
+        )
+
+    def _finish(self) -> None:
+        self._file.write("  </graph>\n</graphml>\n")
+
+
+class NTriplesWriter(_TextWriter):
+    """
+    Writes RDF N-Triples.
+
+    Nodes become `<base_iri>node/<label>` and relationships
+    `<base_iri>relation/<label>` IRIs, percent-encoded. Every node gets an
+    rdfs:label triple the first time it is seen.
+
+    Args:
+        target: A path or text file object.
+        base_iri: The prefix of the generated IRIs.
+    """
+
+    _LABEL = "<http://www.w3.org/2000/01/rdf-schema#label>"
+
+    def __init__(self, target, base_iri: str = "urn:eknowledge:"):
+        super().__init__(target)
+        self.base_iri = base_iri
+        self._labelled = set()
+
+    def _iri(self, kind: str, label: str) -> str:
+        return f"<{self.base_iri}{kind}/{quote(label, safe='')}>"
+
+    def _node(self, label: str) -> str:
+        iri = self._iri("node", label)
+        if label not in self._labelled:
+            self._labelled.add(label)
+            self._file.write(f"{iri} {self._LABEL} {json.dumps(label, ensure_ascii=False)} .\n")
+        return iri
+
+    def write_edge(self, from_node: str, relationship: str, to_node: str) -> None:
+        subject, obj = self._node(from_node), self._node(to_node)
+        self._file.write(f"{subject} {self._iri('relation', relationship)} {obj} .\n")
+
+
+def _write_table(handle, labels) -> None:
+    """Writes a string table: uint64 offsets (len + 1 of them) then UTF-8 data."""
+    encoded = [label.encode("utf-8") for label in labels]
+    offsets = array("Q", [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    handle.write(offsets.tobytes())
+    handle.write(b"".join(encoded))
+
+
+class BinaryWriter(EdgeWriter):
+    """
+    Writes the compact binary edge format read by `BinaryGraphReader`.
+
+    Node and relationship labels are dictionary-encoded; every edge is a
+    row of three little-endian int32 IDs (from, relationship, to), streamed
+    to disk in batches. The label tables and a footer locating them are
+    written on close, so only the label dictionaries are held in memory.
+
+    Args:
+        target: A path or a binary file object positioned at its start.
+    """
+
+    def __init__(self, target):
+        self._file, self._owned = _open_target(target, "wb")
+        self._node_ids = {}
+        self._relation_ids = {}
+        self._batch = array("i")
+        self.edge_count = 0
+        self._file.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION))
+
+    @staticmethod
+    def _intern(label: str, ids: dict) -> int:
+        label_id = ids.get(label)
+        if label_id is None:
+            label_id = ids[label] = len(ids)
+        return label_id
+
+    def write_edge(self, from_node: str, relationship: str, to_node: str) -> None:
+        self._batch.append(self._intern(from_node, self._node_ids))
+        self._batch.append(self._intern(relationship, self._relation_ids))
+        self._batch.append(self._intern(to_node, self._node_ids))
+        self.edge_count += 1
+        if len(self._batch) >= _EDGE_BATCH * 3:
+            self._flush()
+
+    def _flush(self) -> None:
+        if sys.byteorder != "little":
+            self._batch.byteswap()
+        self._file.write(self._batch.tobytes())
+        self._batch = array("i")
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._flush()
+        nodes_offset = _HEADER.size + self.edge_count * 12
+        _write_table(self._file, self._node_ids)
+        relations_offset = nodes_offset + 8 * (len(self._node_ids) + 1) + sum(
+            len(label.encode("utf-8")) for label in self._node_ids
+        )
+        _write_table(self._file, self._relation_ids)
+        self._file.write(_FOOTER.pack(
+            self.edge_count, len(self._node_ids), len(self._relation_ids), nodes_offset, relations_offset,
+            BINARY_MAGIC,
+        ))
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+        self._file = None
+
+
+class _LabelTable:
+    """A lazily decoded string table inside a mapped file."""
+
+    def __init__(self, buffer, offset: int, count: int):
+        self._buffer = buffer
+        self._offsets = buffer[offset:offset + 8 * (count + 1)].cast("Q")
+        self._data = offset + 8 * (count + 1)
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, label_id: int) -> str:
+        if not 0 <= label_id < self._count:
+            raise IndexError("label ID out of range")
+        start, end = self._offsets[label_id], self._offsets[label_id + 1]
+        return bytes(self._buffer[self._data + start:self._data + end]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for label_id in range(self._count):
+            yield self[label_id]
+
+
+class BinaryGraphReader:
+    """
+    Memory-maps a file written by `BinaryWriter`.
+
+    Nothing is loaded up front: edge IDs are read straight from the mapped
+    int32 arrays and labels are decoded on access, so very large graphs can
+    be opened instantly and queried in constant memory.
+
+    Attributes:
+        nodes: The node labels, indexable by node ID.
+        relations: The relationship labels, indexable by relationship ID.
+        sources, relationships, targets: Views of the per-edge int32 IDs.
+
+    Raises:
+        ValueError: If the file is not in the binary edge format.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("BinaryGraphReader requires a little-endian platform.")
+        self._handle = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._handle.close()
+            raise ValueError("Not an eknowledge binary graph file.")
+        buffer = memoryview(self._mmap)
+        if len(buffer) < _HEADER.size + _FOOTER.size or _HEADER.unpack_from(buffer)[0] != BINARY_MAGIC:
+            buffer.release()
+            self.close()
+            raise ValueError("Not an eknowledge binary graph file.")
+        edge_count, node_count, relation_count, nodes_offset, relations_offset, magic = _FOOTER.unpack_from(
+            buffer, len(buffer) - _FOOTER.size,
+        )
+        if magic != BINARY_MAGIC:
+            buffer.release()
+            self.close()
+            raise ValueError("Binary graph file is truncated.")
+        self._buffer = buffer
+        self._edges = buffer[_HEADER.size:_HEADER.size + edge_count * 12].cast("i")
+        self.sources = self._edges[0::3]
+        self.relationships = self._edges[1::3]
+        self.targets = self._edges[2::3]
+        self.nodes = _LabelTable(buffer, nodes_offset, node_count)
+        self.relations = _LabelTable(buffer, relations_offset, relation_count)
+        self._count = edge_count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def edge_ids(self, edge_id: int) -> Tuple[int, int, int]:
+        """Returns the (from, relationship, to) IDs of an edge."""
+        row = edge_id * 3
+        return self._edges[row], self._edges[row + 1], self._edges[row + 2]
+
+    def edge(self, edge_id: int) -> Tuple[str, str, str]:
+        """Returns the (from, relationship, to) labels of an edge."""
+        from_id, relationship_id, to_id = self.edge_ids(edge_id)
+        return self.nodes[from_id], self.relations[relationship_id], self.nodes[to_id]
+
+    def edges(self) -> Iterator[Tuple[str, str, str]]:
+        """Iterates over the edges in file order."""
+        for edge_id in range(self._count):
+            yield self.edge(edge_id)
+
+    def to_graph(self) -> KnowledgeGraph:
+        """Loads the edges into a deduplicated `KnowledgeGraph`."""
+        graph = KnowledgeGraph()
+        for edge in self.edges():
+            graph.add_edge(*edge)
+        return graph
+
+    def close(self) -> None:
+        for view in ("sources", "relationships", "targets", "_edges"):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        for table in ("nodes", "relations"):
+            if hasattr(self, table):
+                getattr(self, table)._offsets.release()
+        if getattr(self, "_buffer", None) is not None:
+            self._buffer.release()
+            self._buffer = None
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+WRITERS = {
+    ".jsonl": JsonlWriter,
+    ".csv": CsvWriter,
+    ".graphml": GraphMLWriter,
+    ".nt": NTriplesWriter,
+    ".ekg": BinaryWriter,
+}
+
+
+def open_writer(path, **kwargs) -> EdgeWriter:
+    """
+    Opens the export writer matching path's extension.
+
+    Supported extensions are .jsonl, .csv, .graphml, .nt and .ekg (binary).
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    writer = WRITERS.get(extension)
+    if writer is None:
+        raise ValueError(f"Unsupported export format '{extension}'. Use one of: {', '.join(WRITERS)}.")
+    return writer(path, **kwargs)
@@ -0,0 +1,156 @@
+import sys
+from array import array
+from typing import Iterable, Iterator, Tuple
+
+
+def normalize_label(label: str) -> str:
+    """Normalises a node or relationship label for comparison (case and whitespace)."""
+    return " ".join(label.split()).casefold()
+
+
+class KnowledgeGraph:
+    """
+    A deduplicated knowledge graph built incrementally from chunk results.
+
+    Node and relationship labels are interned once and referred to by integer
+    IDs; edges are stored as integer triples in compact arrays. Labels that
+    differ only in case or whitespace map to the same ID and keep the first
+    surface form seen. For every edge the graph records how many chunks
+    asserted it, and adjacency indexes give the edges leaving or entering a
+    node without scanning the whole graph.
+    """
+
+    def __init__(self):
+        self.nodes = []
+        self.relations = []
+        self._node_ids = {}
+        self._relation_ids = {}
+        self._edge_ids = {}
+        self._from = array("l")
+        self._relationship = array("l")
+        self._to = array("l")
+        self._counts = array("l")
+        self._outgoing = {}
+        self._incoming = {}
+
+    @classmethod
+    def from_results(cls, results) -> "KnowledgeGraph":
+        """Builds a graph from an iterable of `ChunkResult` objects."""
+        return cls().update(results)
+
+    @classmethod
+    def from_edges(cls, edges) -> "KnowledgeGraph":
+        """Builds a graph from a legacy list of edge dictionaries."""
+        graph = cls()
+        for edge in edges:
+            graph.add_edge(edge["from"], edge["relationship"], edge["to"])
+        return graph
+
+    def _intern(self, label: str, ids: dict, labels: list) -> int:
+        key = normalize_label(label)
+        label_id = ids.get(key)
+        if label_id is None:
+            label_id = len(labels)
+            ids[key] = label_id
+            labels.append(sys.intern(" ".join(label.split())))
+        return label_id
+
+    def _edge_id(self, from_node: str, relationship: str, to_node: str) -> int:
+        key = (
+            self._intern(from_node, self._node_ids, self.nodes),
+            self._intern(relationship, self._relation_ids, self.relations),
+            self._intern(to_node, self._node_ids, self.nodes),
+        )
+        edge_id = self._edge_ids.get(key)
+        if edge_id is None:
+            edge_id = len(self._counts)
+            self._edge_ids[key] = edge_id
+            self._from.append(key[0])
+            self._relationship.append(key[1])
+            self._to.append(key[2])
+            self._counts.append(0)
+            self._outgoing.setdefault(key[0], []).append(edge_id)
+            self._incoming.setdefault(key[2], []).append(edge_id)
+        return edge_id
+
+    def add_edge(self, from_node: str, relationship: str, to_node: str, count: int = 1) -> int:
+        """Adds count assertions (one by default) of an edge and returns its edge ID."""
+        edge_id = self._edge_id(from_node, relationship, to_node)
+        self._counts[edge_id] += count
+        return edge_id
+
+    def add_chunk(self, edges) -> None:
+        """
+        Adds the edges extracted from one chunk.
+
+        An edge repeated within the same chunk counts as a single assertion.
+        """
+        edge_ids = {self._edge_id(edge["from"], edge["relationship"], edge["to"]) for edge in edges}
+        for edge_id in edge_ids:
+            self._counts[edge_id] += 1
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, edge) -> bool:
+        return self._lookup(*edge) is not None
+
+    def _lookup(self, from_node: str, relationship: str, to_node: str):
+        key = (
+            self._node_ids.get(normalize_label(from_node)),
+            self._relation_ids.get(normalize_label(relationship)),
+            self._node_ids.get(normalize_label(to_node)),
+        )
+        return self._edge_ids.get(key)
+
+    def count(self, from_node: str, relationship: str, to_node: str) -> int:
+        """Returns how many chunks asserted the edge, or 0 if it is absent."""
+        edge_id = self._lookup(from_node, relationship, to_node)
+        return 0 if edge_id is None else self._counts[edge_id]
+
+    def edge(self, edge_id: int) -> Tuple[str, str, str]:
+        """Returns the (from, relationship, to) labels of an edge ID."""
+        return (
+            self.nodes[self._from[edge_id]],
+            self.relations[self._relationship[edge_id]],
+            self.nodes[self._to[edge_id]],
+        )
+
+    def edges(self) -> Iterator[Tuple[str, str, str]]:
+        """Iterates over the unique edges in insertion order."""
+        for edge_id in range(len(self._counts)):
+            yield self.edge(edge_id)
+
+    def outgoing(self, node: str) -> Iterator[Tuple[str, str, str]]:
+        """Iterates over the edges whose source is node."""
+        node_id = self._node_ids.get(normalize_label(node))
+        for edge_id in self._outgoing.get(node_id, ()):
+            yield self.edge(edge_id)
+
+    def incoming(self, node: str) -> Iterator[Tuple[str, str, str]]:
+        """Iterates over the edges whose target is node."""
+        node_id = self._node_ids.get(normalize_label(node))
+        for edge_id in self._incoming.get(node_id, ()):
+            yield self.edge(edge_id)
+
+    def to_list(self, with_counts: bool = False) -> list:
+        """
+        Exports the unique edges as the legacy list of dictionaries.
+
+        Args:
+            with_counts: Whether to add a "count" key holding the number of
+                         chunks that asserted each edge.
+        """
+        graph = []
+        for edge_id, (from_node, relationship, to_node) in enumerate(self.edges()):
+            edge = {"from": from_node, "relationship": relationship, "to": to_node}
+            if with_counts:
+                edge["count"] = self._counts[edge_id]
+            graph.append(edge)
+        return graph
+
+    def update(self, results: Iterable) -> "KnowledgeGraph":
+        """Adds every `ChunkResult` from results and returns the graph."""
+        for result in results:
+            self.add_chunk(result.edges)
+        return self
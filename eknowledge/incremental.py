@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+from typing import NamedTuple
+from .chunking import ContentDefinedChunker
+from .graph import KnowledgeGraph, normalize_label
+from .main import _build_settings, _chunk_key, iter_graph_generation
+
+SNAPSHOT_VERSION = 1
+
+
+class GraphSnapshot:
+    """
+    The chunk fingerprints and edges of one extraction run, in chunk order.
+
+    Each chunk is identified by its request key (see `make_cache_key`), which
+    covers the chunk text, the prompts, the relations and the model, so a
+    chunk is only reused when re-extracting it would send the same request.
+
+    Args:
+        chunks: A list of (key, edges) pairs.
+    """
+
+    def __init__(self, chunks=()):
+        self.chunks = [(key, [dict(edge) for edge in edges]) for key, edges in chunks]
+        self._edges_by_key = dict(self.chunks)
+
+    def get(self, key: str):
+        """Returns a copy of the edges recorded for key, or None."""
+        edges = self._edges_by_key.get(key)
+        if edges is None:
+            return None
+        return [dict(edge) for edge in edges]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._edges_by_key
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def edges(self) -> list:
+        """Returns every chunk's edge dictionaries, in chunk order."""
+        return [edge for _, edges in self.chunks for edge in edges]
+
+    def save(self, path) -> None:
+        """Writes the snapshot to a JSON file, replacing it atomically."""
+        temporary = f"{os.fspath(path)}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({
+                "version": SNAPSHOT_VERSION,
+                "chunks": [{"key": key, "edges": edges} for key, edges in self.chunks],
+            }, handle, ensure_ascii=False)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path) -> "GraphSnapshot":
+        """
+        Reads a snapshot written by `save`.
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version.
+        """
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot file.")
+        return cls((chunk["key"], chunk["edges"]) for chunk in data["chunks"])
+
+
+class IncrementalResult(NamedTuple):
+    """
+    The outcome of an incremental extraction.
+
+    Attributes:
+        graph: The deduplicated `KnowledgeGraph` of the new text.
+        added: Edge dictionaries present now but not in the previous run.
+        removed: Edge dictionaries of the previous run that are now gone.
+        snapshot: The `GraphSnapshot` to pass to the next run.
+        reused_chunks: The number of chunks taken from the previous run.
+        extracted_chunks: The number of chunks sent to the LLM.
+    """
+    graph: KnowledgeGraph
+    added: list
+    removed: list
+    snapshot: GraphSnapshot
+    reused_chunks: int
+    extracted_chunks: int
+
+
+class _SnapshotCache:
+    """Serves a previous run's chunks as cache hits, counting reuse."""
+
+    def __init__(self, snapshot, cache):
+        self.snapshot = snapshot
+        self.cache = cache
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        edges = self.snapshot.get(key)
+        if edges is not None:
+            with self._lock:
+                self.reused += 1
+            return edges
+        return self.cache.get(key) if self.cache is not None else None
+
+    def set(self, key, edges):
+        if self.cache is not None:
+            self.cache.set(key, edges)
+
+
+def _edge_key(edge):
+    return (normalize_label(edge["from"]), normalize_label(edge["relationship"]), normalize_label(edge["to"]))
+
+
+def _edge_difference(edges, other_edges) -> list:
+    """Returns the unique edges of edges whose normalised form is not in other_edges."""
+    excluded = {_edge_key(edge) for edge in other_edges}
+    difference = []
+    for edge in edges:
+        key = _edge_key(edge)
+        if key not in excluded:
+            excluded.add(key)
+            difference.append({"from": edge["from"], "relationship": edge["relationship"], "to": edge["to"]})
+    return difference
+
+
+def execute_incremental_graph_generation(
+        text="",
+        llm=None,
+        snapshot=None,
+        chunk_size=100,
+        chunker=None,
+        **options,
+) -> IncrementalResult:
+    """
+    Re-extracts a document, querying the LLM only for chunks that changed.
+
+    The text is split with content-defined boundaries (`ContentDefinedChunker`)
+    so that an edit only changes the chunks around it. Chunks whose request
+    key is in the previous run's snapshot reuse its edges; the others are
+    extracted as usual. Chunks that failed are left out of the new snapshot
+    and retried by the next run.
+
+    Args:
+        text: The new version of the document, in any form
+              `execute_graph_generation` accepts.
+        llm: A LangChain-compatible chat model exposing `invoke`, or a
+             callable client (see `execute_graph_generation`).
+        snapshot: The `GraphSnapshot` of the previous run, or None for the
+                  first run.
+        chunk_size: The target average number of words per chunk.
+        chunker: An optional `Chunker` used instead of the default
+                 `ContentDefinedChunker`. It must match the previous run's.
+        **options: Further arguments for `iter_graph_generation`, such as
+                   relations, max_concurrency, cache or retry_policy.
+
+    Returns:
+        An `IncrementalResult` with the updated graph, the added and removed
+        edges and the snapshot to store for the next run.
+
+    Raises:
+        ValueError: If no LLM is provided.
+    """
+    if llm is None:
+        raise ValueError("LLM object must be provided.")
+    if snapshot is None:
+        snapshot = GraphSnapshot()
+    if chunker is None:
+        chunker = ContentDefinedChunker(chunk_size)
+
+    # The same settings iter_graph_generation builds, for computing chunk keys
+    key_options = {
+        name: value for name, value in options.items()
+        if name in ("relations", "system_prompt", "user_prompt", "compact_relations", "validate_relations",
+                    "packed_user_prompt", "relation_selector")
+    }
+    key_settings = _build_settings(llm, **key_options)
+    cache = _SnapshotCache(snapshot, options.pop("cache", None))
+    # Edges from packed requests are recorded under the packed key, as the cache stores them
+    packed = options.get("pack_size", 1) > 1
+
+    graph = KnowledgeGraph()
+    chunks = []
+    extracted = 0
+    for result in iter_graph_generation(text=text, llm=llm, chunker=chunker, cache=cache, **options):
+        graph.add_chunk(result.edges)
+        if not result.cached:
+            extracted += 1
+        if result.success:
+            chunks.append((_chunk_key(result.chunk, key_settings, packed), result.edges))
+
+    new_snapshot = GraphSnapshot(chunks)
+    new_edges = new_snapshot.edges()
+    old_edges = snapshot.edges()
+    return IncrementalResult(
+        graph=graph,
+        added=_edge_difference(new_edges, old_edges),
+        removed=_edge_difference(old_edges, new_edges),
+        snapshot=new_snapshot,
+        reused_chunks=cache.reused,
+        extracted_chunks=extracted,
+    )
@@ -0,0 +1,270 @@
+import itertools
+import threading
+import time
+from typing import NamedTuple
+
+# Event names, in the order they occur for a chunk.
+CHUNK_START = "chunk_start"
+CACHE_HIT = "cache_hit"
+LLM_CALL = "llm_call"
+PARSE = "parse"
+ATTEMPT_FAILED = "attempt_failed"
+BUDGET_EXHAUSTED = "budget_exhausted"
+SLEEP = "sleep"
+REQUEST_END = "request_end"
+CHUNK_END = "chunk_end"
+
+# Identifies one chunk's processing across all of its events.
+_keys = itertools.count(1)
+
+
+class Event(NamedTuple):
+    """
+    One structured instrumentation event.
+
+    Attributes:
+        name: One of the event names defined in this module.
+        key: A number unique to the chunk being processed in this process.
+             Events of a packed request carry the key of its first chunk.
+        label: Names the chunk or request, e.g. "chunk 3" or "chunks 3-5".
+        data: The event's measurements, see `Callback`.
+        timestamp: The `time.time()` at which the event was emitted.
+    """
+    name: str
+    key: int
+    label: str
+    data: dict
+    timestamp: float
+
+
+class Callback:
+    """
+    Receives instrumentation events from a generation run.
+
+    Subclasses override `on_event`. Events are delivered synchronously from
+    whichever thread or task processes the chunk, so implementations must
+    be thread-safe and cheap. The events and their data are:
+
+    - chunk_start: index, total.
+    - cache_hit: index, total, source ("checkpoint" or "cache").
+    - llm_call: seconds, prompt_chars, prompt_tokens, response_chars, error
+      (the exception message, or None).
+    - parse: seconds, nodes, edges, rejected, truncated.
+    - attempt_failed: reason ("transport" or "format"), message, attempt,
+      max_attempts.
+    - budget_exhausted: no data.
+    - sleep: seconds, reason ("rate_limit" or "backoff"); emitted before
+      the sleep starts.
+    - request_end: progress, success, retries, max_attempts.
+    - chunk_end: index, total, words, edges, retries, success, cached,
+      llm_seconds, sleep_seconds.
+    """
+
+    def on_event(self, event: Event) -> None:
+        pass
+
+
+def emit(callbacks, name: str, key: int, label: str, **data) -> None:
+    """Delivers one event to every callback."""
+    event = Event(name, key, label, data, time.time())
+    for callback in callbacks:
+        callback.on_event(event)
+
+
+def new_key() -> int:
+    return next(_keys)
+
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+class PrintCallback(Callback):
+    """Prints human-readable progress messages; used for verbose=True."""
+
+    def on_event(self, event: Event) -> None:
+        data = event.data
+        if event.name == CHUNK_START:
+            print(f"Processing chunk {data['index']}/{data['total']}...")
+        elif event.name == CACHE_HIT:
+            if data["source"] == "checkpoint":
+                print(f"Skipping chunk {data['index']}/{data['total']}, already in the checkpoint journal.")
+            else:
+                print(f"Loaded chunk {data['index']}/{data['total']} from cache.")
+        elif event.name == ATTEMPT_FAILED:
+            print(f"{data['message']} Retrying (attempt {data['attempt']}/{data['max_attempts']})...")
+        elif event.name == BUDGET_EXHAUSTED:
+            print(f"Retry budget exhausted. Giving up on {event.label}.")
+        elif event.name == REQUEST_END:
+            if data["success"]:
+                print(f"Nodes successfully processed in {data['progress']}.")
+            else:
+                print(f"Max retries ({data['max_attempts']}) reached for {event.label}. No valid nodes added for this chunk.")
+
+
+class MetricsAggregator(Callback):
+    """
+    Aggregates events in-process into counters and latency percentiles.
+
+    A single aggregator may be shared by concurrent runs. Call `summary`
+    at any time for a snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discards everything aggregated so far."""
+        with self._lock:
+            self.chunks = 0
+            self.cached_chunks = 0
+            self.failed_chunks = 0
+            self.edges = 0
+            self.retries = 0
+            self.llm_calls = 0
+            self.llm_errors = 0
+            self.llm_seconds = 0.0
+            self.prompt_chars = 0
+            self.prompt_tokens = 0
+            self.response_chars = 0
+            self.parse_seconds = 0.0
+            self.failures = {}
+            self.sleep_seconds = {}
+            self._llm_latencies = []
+            self._chunk_latencies = []
+
+    def on_event(self, event: Event) -> None:
+        data = event.data
+        with self._lock:
+            if event.name == LLM_CALL:
+                self.llm_calls += 1
+                self.llm_errors += data["error"] is not None
+                self.llm_seconds += data["seconds"]
+                self.prompt_chars += data["prompt_chars"]
+                self.prompt_tokens += data["prompt_tokens"]
+                self.response_chars += data["response_chars"]
+                self._llm_latencies.append(data["seconds"])
+            elif event.name == PARSE:
+                self.parse_seconds += data["seconds"]
+            elif event.name == ATTEMPT_FAILED:
+                self.failures[data["reason"]] = self.failures.get(data["reason"], 0) + 1
+            elif event.name == SLEEP:
+                self.sleep_seconds[data["reason"]] = self.sleep_seconds.get(data["reason"], 0.0) + data["seconds"]
+            elif event.name == CHUNK_END:
+                self.chunks += 1
+                self.cached_chunks += data["cached"]
+                self.failed_chunks += not data["success"]
+                self.edges += data["edges"]
+                self.retries += data["retries"]
+                if not data["cached"]:
+                    self._chunk_latencies.append(data["llm_seconds"] + data["sleep_seconds"])
+
+    def summary(self) -> dict:
+        """Returns the aggregated metrics as a JSON-serialisable dictionary."""
+        with self._lock:
+            return {
+                "chunks": self.chunks,
+                "cached_chunks": self.cached_chunks,
+                "failed_chunks": self.failed_chunks,
+                "edges": self.edges,
+                "retries": self.retries,
+                "failures": dict(self.failures),
+                "llm_calls": self.llm_calls,
+                "llm_errors": self.llm_errors,
+                "llm_seconds": self.llm_seconds,
+                "llm_latency_p50": _percentile(self._llm_latencies, 0.50),
+                "llm_latency_p99": _percentile(self._llm_latencies, 0.99),
+                "chunk_latency_p50": _percentile(self._chunk_latencies, 0.50),
+                "chunk_latency_p99": _percentile(self._chunk_latencies, 0.99),
+                "prompt_chars": self.prompt_chars,
+                "prompt_tokens": self.prompt_tokens,
+                "response_chars": self.response_chars,
+                "parse_seconds": self.parse_seconds,
+                "sleep_seconds": dict(self.sleep_seconds),
+            }
+
+
+class OpenTelemetryCallback(Callback):
+    """
+    Records events as OpenTelemetry spans.
+
+    Each chunk becomes an "eknowledge.chunk" span, with child spans for LLM
+    calls, parsing and sleeps, and span events for failed attempts.
+    Requires the optional `opentelemetry-api` package.
+
+    Args:
+        tracer: The tracer to use, by default the global tracer provider's
+                tracer for "eknowledge".
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryCallback requires the 'opentelemetry-api' package. "
+                "Install it with: pip install eknowledge[otel]"
+            ) from e
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer("eknowledge")
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def _child(self, name, event, seconds, attributes, ends_now=True):
+        """Records a finished child span lasting seconds, ending (or starting) at the event."""
+        with self._lock:
+            parent = self._spans.get(event.key)
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        start = int(event.timestamp * 1e9)
+        if ends_now:
+            start -= int(seconds * 1e9)
+        span = self.tracer.start_span(
+            name, context=context, start_time=start,
+            attributes={key: value for key, value in attributes.items() if value is not None},
+        )
+        span.end(end_time=start + int(seconds * 1e9))
+
+    def on_event(self, event: Event) -> None:
+        data = event.data
+        if event.name == CHUNK_START:
+            span = self.tracer.start_span(
+                "eknowledge.chunk", start_time=int(event.timestamp * 1e9),
+                attributes={"eknowledge.chunk.index": data["index"]},
+            )
+            with self._lock:
+                self._spans[event.key] = span
+        elif event.name == CHUNK_END:
+            with self._lock:
+                span = self._spans.pop(event.key, None)
+            if span is not None:
+                for name in ("edges", "retries", "success", "cached"):
+                    span.set_attribute(f"eknowledge.chunk.{name}", data[name])
+                span.end(end_time=int(event.timestamp * 1e9))
+        elif event.name == LLM_CALL:
+            self._child("eknowledge.llm", event, data["seconds"], {
+                "eknowledge.prompt_chars": data["prompt_chars"],
+                "eknowledge.prompt_tokens": data["prompt_tokens"],
+                "eknowledge.response_chars": data["response_chars"],
+                "eknowledge.error": data["error"],
+            })
+        elif event.name == PARSE:
+            self._child("eknowledge.parse", event, data["seconds"], {
+                "eknowledge.nodes": data["nodes"], "eknowledge.edges": data["edges"],
+            })
+        elif event.name == SLEEP:
+            # Sleeps are announced before they start
+            self._child(
+                "eknowledge.sleep", event, data["seconds"], {"eknowledge.reason": data["reason"]}, ends_now=False,
+            )
+        elif event.name == ATTEMPT_FAILED:
+            with self._lock:
+                span = self._spans.get(event.key)
+            if span is not None:
+                span.add_event("attempt_failed", {
+                    "eknowledge.reason": data["reason"], "eknowledge.message": data["message"],
+                    "eknowledge.attempt": data["attempt"],
+                }, timestamp=int(event.timestamp * 1e9))
@@ -0,0 +1,104 @@
+import asyncio
+import inspect
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class Message(NamedTuple):
+    """
+    A chat message in the neutral form used inside eknowledge.
+
+    Attributes:
+        role: "system", "user" or "assistant".
+        content: The message text.
+    """
+    role: str
+    content: str
+
+
+@lru_cache(maxsize=None)
+def _langchain_message_types():
+    """Imports the LangChain message classes on first use, or returns None."""
+    try:
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+    except ImportError:
+        return None
+    return {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage}
+
+
+def to_langchain_messages(messages) -> list:
+    """
+    Converts messages to LangChain message objects.
+
+    When langchain-core is not installed the `Message` tuples are returned
+    unchanged; they expose `content` like LangChain messages do.
+    """
+    types = _langchain_message_types()
+    if types is None:
+        return list(messages)
+    return [types[message.role](content=message.content) for message in messages]
+
+
+def to_dicts(messages) -> list:
+    """Converts messages to the {"role": ..., "content": ...} dictionaries most chat APIs take."""
+    return [{"role": message.role, "content": message.content} for message in messages]
+
+
+def _is_coroutine_callable(llm) -> bool:
+    """Whether calling llm creates a coroutine, for coroutine functions and objects with an async `__call__`."""
+    return inspect.iscoroutinefunction(llm) or inspect.iscoroutinefunction(getattr(llm, "__call__", None))
+
+
+def is_client(llm, asynchronous=False) -> bool:
+    """
+    Whether llm can be used for generation.
+
+    The blocking entry points need an object exposing `invoke` or a callable
+    that is not a coroutine function; with asynchronous set, an object
+    exposing `ainvoke` or any callable is needed.
+    """
+    if asynchronous:
+        return hasattr(llm, "ainvoke") or (not hasattr(llm, "invoke") and callable(llm))
+    return hasattr(llm, "invoke") or (callable(llm) and not _is_coroutine_callable(llm))
+
+
+def invoke(llm, messages):
+    """
+    Sends messages to a chat client and returns its response.
+
+    LangChain-style models (anything exposing `invoke`) receive LangChain
+    messages; any other callable receives a list of role/content
+    dictionaries. The response may be a string or an object with `content`.
+
+    Raises:
+        TypeError: If a plain callable returns an awaitable; use the async
+                   entry points for coroutine clients.
+    """
+    if hasattr(llm, "invoke"):
+        return llm.invoke(to_langchain_messages(messages))
+    response = llm(to_dicts(messages))
+    if inspect.isawaitable(response):
+        if inspect.iscoroutine(response):
+            response.close()
+        raise TypeError("The LLM callable returned an awaitable; use aexecute_graph_generation instead.")
+    return response
+
+
+async def ainvoke(llm, messages):
+    """
+    Asynchronous version of `invoke`; awaits the response of callables when needed.
+
+    Blocking callables run on the event loop's default executor, so that
+    they do not stall the other chunks while they wait for the model.
+    """
+    if hasattr(llm, "ainvoke"):
+        return await llm.ainvoke(to_langchain_messages(messages))
+    if hasattr(llm, "invoke"):
+        raise TypeError("The LLM object does not support ainvoke().")
+    if _is_coroutine_callable(llm):
+        response = llm(to_dicts(messages))
+    else:
+        response = await asyncio.get_event_loop().run_in_executor(None, llm, to_dicts(messages))
+    if inspect.isawaitable(response):
+        response = await response
+    return response
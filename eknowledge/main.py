@@ -1,8 +1,26 @@
-import re
+import asyncio
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
 from .relations import RELATIONS
-from .prompts import SYSTEM_PROMPT, USER_PROMPT
-from langchain_core.messages import HumanMessage, SystemMessage
+from .prompts import SYSTEM_PROMPT, USER_PROMPT, PACKED_USER_PROMPT, FORMAT_CORRECTION_PROMPT
+from .cache import ResponseCache, make_cache_key, model_identity
+from .checkpoint import CheckpointJournal
+from .chunking import CHARS_PER_TOKEN, estimate_tokens, iter_word_chunks
+from .graph import KnowledgeGraph
+from .instrumentation import (
+    ATTEMPT_FAILED, BUDGET_EXHAUSTED, CACHE_HIT, CHUNK_END, CHUNK_START, LLM_CALL, PARSE, REQUEST_END, SLEEP,
+    Callback, PrintCallback, emit, new_key,
+)
+from .llm import Message, ainvoke, invoke, is_client
+from .parser import ParseResult, parse_response
+from .preselect import RelationSelector
+from .ratelimit import RateLimiter
+from .retry import RetryBudget, RetryPolicy, TRANSPORT_ERROR, FORMAT_ERROR
+
+_INVOKE = "invoke"
+_SLEEP = "sleep"
 
 
 def split_text_by_words(text: str, chunk_size: int) -> list[str]:
@@ -61,7 +79,618 @@ def split_text_by_words(text: str, chunk_size: int) -> list[str]:
     return chunks
 
 
-def execute_graph_generation(
+class ChunkResult(NamedTuple):
+    """
+    The outcome of extracting edges from a single chunk.
+
+    Attributes:
+        index: The 1-based position of the chunk in the input.
+        chunk: The chunk text.
+        edges: The edge dictionaries extracted from the chunk.
+        retries: The number of failed attempts before the chunk completed.
+        success: Whether at least one valid node was extracted.
+        cached: Whether the edges were served from the response cache or the
+                checkpoint journal without calling the LLM.
+        llm_seconds: Time spent waiting on LLM calls.
+        sleep_seconds: Time spent waiting between attempts or for the rate
+                       limiter.
+    """
+    index: int
+    chunk: str
+    edges: list
+    retries: int
+    success: bool
+    cached: bool = False
+    llm_seconds: float = 0.0
+    sleep_seconds: float = 0.0
+
+
+class _Settings(NamedTuple):
+    """Per-run options shared by every chunk of a generation run."""
+    relations: list
+    system_prompt: str
+    user_prompt: str
+    callbacks: tuple
+    cache: Optional[ResponseCache]
+    model: str
+    validate_relations: bool
+    retry_policy: RetryPolicy
+    max_attempts: int
+    retry_budget: RetryBudget
+    rate_limiter: Optional[RateLimiter]
+    checkpoint: Optional[CheckpointJournal]
+    compact_relations: bool
+    packed_user_prompt: str
+    relation_selector: Optional[RelationSelector]
+
+
+class _Attempts(NamedTuple):
+    """The outcome of sending one request with retries."""
+    parsed: Optional[ParseResult]
+    retries: int
+    llm_seconds: float
+    sleep_seconds: float
+
+
+def _format_relations(settings, relations=None):
+    """Renders the relations (all of them by default) for the user prompt."""
+    if relations is None:
+        relations = settings.relations
+    if settings.compact_relations:
+        return ", ".join(str(relation) for relation in relations)
+    return relations
+
+
+def _user_messages(prompt, text, source_text, settings):
+    """
+    Formats the user message for a request, with a relation subset if enabled.
+
+    Returns:
+        A tuple of the message to send first and the message to fall back to
+        on retry (None when the first message already lists every relation).
+    """
+    full_message = prompt.format(text=text, relationships=_format_relations(settings))
+    if settings.relation_selector is None:
+        return full_message, None
+    subset = settings.relation_selector.select(source_text)
+    if len(subset) >= len(settings.relations):
+        return full_message, None
+    return prompt.format(text=text, relationships=_format_relations(settings, subset)), full_message
+
+
+def _request_steps(user_message, label, progress, settings, fallback_message=None, key=None):
+    """
+    Holds the retry logic for one LLM request without doing I/O.
+
+    This generator yields `(_INVOKE, messages)` whenever it needs an LLM
+    response and `(_SLEEP, seconds)` whenever it needs to wait. The driver
+    sends the response back in, or throws the exception raised by the LLM
+    call into it. The sync and async entry points share these generators so
+    their retry and parsing behaviour cannot drift apart.
+
+    Args:
+        user_message: The formatted user message.
+        label: Names the request in progress messages, e.g. "chunk 3".
+        progress: Names the request with its position, e.g. "chunk 3/10".
+        settings: The run's `_Settings`.
+        fallback_message: An optional user message used from the first retry
+                          on, e.g. one listing every relation.
+        key: The instrumentation key of the chunk the request belongs to.
+
+    Returns:
+        An `_Attempts` (as the StopIteration value) whose parsed result is
+        None if no valid node was produced before retries were exhausted.
+    """
+    callbacks = settings.callbacks
+    retry_policy = settings.retry_policy
+    parsed = None
+    retry_count = 0
+    failures = {TRANSPORT_ERROR: 0, FORMAT_ERROR: 0}
+    llm_seconds = 0.0
+    sleep_seconds = 0.0
+    max_retries = settings.max_attempts
+    initial_messages = [
+        Message("system", settings.system_prompt),
+        Message("user", user_message)
+    ]
+    messages = initial_messages
+
+    # Loop until a valid node is found OR retries are exhausted for this request
+    while retry_count < max_retries:
+        if settings.rate_limiter is not None:
+            wait = settings.rate_limiter.reserve(sum(estimate_tokens(message.content) for message in messages))
+            if wait > 0:
+                sleep_seconds += wait
+                if callbacks:
+                    emit(callbacks, SLEEP, key, label, seconds=wait, reason="rate_limit")
+                yield _SLEEP, wait
+
+        content = None
+        candidate = None
+        error = None
+        failure_kind = FORMAT_ERROR
+        started = time.perf_counter()
+        try:
+            response = yield _INVOKE, messages
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - started
+        llm_seconds += elapsed
+
+        parse_seconds = 0.0
+        if error is None:
+            try:
+                # Ensure response and content are usable; plain clients may return a string
+                if isinstance(response, str):
+                    content = response
+                else:
+                    content = response.content if response and hasattr(response, 'content') else ""
+
+                if not isinstance(content, str):
+                    failure = f"LLM response content is not a string (type: {type(content)}) for {label}."
+                else:
+                    parse_started = time.perf_counter()
+                    candidate = parse_response(content, settings.relations if settings.validate_relations else None)
+                    parse_seconds = time.perf_counter() - parse_started
+                    if not candidate.node_count:
+                        # If LLM responds but without any <node> tags
+                        failure = f"No <node> tags found in response for {label}."
+                    elif not candidate.edges:
+                        # Found <node> tags, but none had the correct inner structure
+                        failure = f"<node> tags found but no valid structure in {label}."
+                    else:
+                        parsed = candidate
+            except Exception as e:
+                # Catch unexpected processing errors
+                error = e
+
+        if error is not None:
+            failure = f"Error during LLM invocation or processing for {label}: {error}."
+            failure_kind = TRANSPORT_ERROR
+
+        if callbacks:
+            prompt_chars = sum(len(message.content) for message in messages)
+            emit(
+                callbacks, LLM_CALL, key, label, seconds=elapsed, prompt_chars=prompt_chars,
+                prompt_tokens=prompt_chars // CHARS_PER_TOKEN,
+                response_chars=len(content) if isinstance(content, str) else 0,
+                error=str(error) if error is not None else None,
+            )
+            if candidate is not None:
+                emit(
+                    callbacks, PARSE, key, label, seconds=parse_seconds, nodes=candidate.node_count,
+                    edges=len(candidate.edges), rejected=candidate.rejected, truncated=candidate.truncated,
+                )
+
+        if parsed is not None:
+            break
+
+        retry_count += 1
+        failures[failure_kind] += 1
+        if callbacks:
+            emit(
+                callbacks, ATTEMPT_FAILED, key, label, reason=failure_kind, message=failure,
+                attempt=retry_count, max_attempts=max_retries,
+            )
+        if retry_count >= max_retries:
+            break
+        if not settings.retry_budget.spend():
+            if callbacks:
+                emit(callbacks, BUDGET_EXHAUSTED, key, label)
+            break
+
+        delay = retry_policy.delay(failure_kind, failures[failure_kind])
+        if delay > 0:
+            sleep_seconds += delay
+            if callbacks:
+                emit(callbacks, SLEEP, key, label, seconds=delay, reason="backoff")
+            yield _SLEEP, delay
+
+        if fallback_message is not None:
+            initial_messages = [
+                Message("system", settings.system_prompt),
+                Message("user", fallback_message)
+            ]
+            messages = initial_messages
+            fallback_message = None
+
+        if failure_kind == FORMAT_ERROR and retry_policy.corrective_prompt and isinstance(content, str):
+            messages = initial_messages + [
+                Message("assistant", content),
+                Message("user", FORMAT_CORRECTION_PROMPT)
+            ]
+
+    if callbacks:
+        emit(
+            callbacks, REQUEST_END, key, label, progress=progress, success=parsed is not None,
+            retries=retry_count, max_attempts=max_retries,
+        )
+
+    return _Attempts(parsed, retry_count, llm_seconds, sleep_seconds)
+
+
+def _chunk_key(chunk, settings, packed=False):
+    """
+    Returns the request key identifying a chunk's extraction under settings.
+
+    Edges a packed request attributed to a chunk are only an approximation of
+    what a request for that chunk alone would return, so with packed set the
+    key is derived from the packed prompt and never matches an unpacked one.
+    """
+    prompt = settings.packed_user_prompt if packed else settings.user_prompt
+    user_message = prompt.format(text=chunk, relationships=_format_relations(settings))
+    options = {}
+    # Validation drops edges and retries on different responses, so it changes the result
+    if settings.validate_relations:
+        options["validate_relations"] = True
+    # The first attempt offers only the selected relations, so the selector shapes the result too
+    if settings.relation_selector is not None:
+        selector_options = settings.relation_selector.key_options()
+        if selector_options is not None:
+            options["relation_selector"] = selector_options
+    return make_cache_key(chunk, settings.system_prompt, user_message, settings.relations, settings.model, options)
+
+
+def _lookup_chunk(chunk, count_chunk, total_chunks, settings, key=None, packed=False):
+    """
+    Looks a chunk up in the checkpoint journal and the response cache.
+
+    With packed set, edges stored by an earlier packed request for the chunk
+    are accepted as well as those of an unpacked request.
+
+    Returns:
+        A tuple of the chunk's unpacked request key (None when neither store
+        is used) and its `ChunkResult` if one of the stores already had it,
+        else None.
+    """
+    cache, checkpoint, callbacks = settings.cache, settings.checkpoint, settings.callbacks
+    if cache is None and checkpoint is None:
+        return None, None
+
+    cache_key = _chunk_key(chunk, settings)
+    lookup_keys = [cache_key, _chunk_key(chunk, settings, packed=True)] if packed else [cache_key]
+    for lookup_key in lookup_keys:
+        if checkpoint is not None:
+            journaled_edges = checkpoint.get(lookup_key)
+            if journaled_edges is not None:
+                if callbacks:
+                    emit(
+                        callbacks, CACHE_HIT, key, f"chunk {count_chunk}",
+                        index=count_chunk, total=total_chunks, source="checkpoint",
+                    )
+                return cache_key, ChunkResult(count_chunk, chunk, journaled_edges, 0, True, cached=True)
+        if cache is not None:
+            cached_edges = cache.get(lookup_key)
+            if cached_edges is not None:
+                if callbacks:
+                    emit(
+                        callbacks, CACHE_HIT, key, f"chunk {count_chunk}",
+                        index=count_chunk, total=total_chunks, source="cache",
+                    )
+                if checkpoint is not None:
+                    checkpoint.record(lookup_key, count_chunk, cached_edges)
+                return cache_key, ChunkResult(count_chunk, chunk, cached_edges, 0, True, cached=True)
+    return cache_key, None
+
+
+def _store_chunk(cache_key, result, settings):
+    """Saves a successful chunk result to the response cache and checkpoint journal."""
+    if not result.success or cache_key is None:
+        return
+    if settings.cache is not None:
+        settings.cache.set(cache_key, result.edges)
+    if settings.checkpoint is not None:
+        settings.checkpoint.record(cache_key, result.index, result.edges)
+
+
+def _start_chunk(count_chunk, total_chunks, settings):
+    """Allocates a chunk's instrumentation key and announces the chunk."""
+    key = new_key()
+    if settings.callbacks:
+        emit(settings.callbacks, CHUNK_START, key, f"chunk {count_chunk}", index=count_chunk, total=total_chunks)
+    return key
+
+
+def _end_chunk(key, result, total_chunks, settings):
+    """Reports a finished chunk to the callbacks and returns its result."""
+    if settings.callbacks:
+        emit(
+            settings.callbacks, CHUNK_END, key, f"chunk {result.index}", index=result.index, total=total_chunks,
+            words=len(result.chunk.split()), edges=len(result.edges), retries=result.retries, success=result.success, cached=result.cached,
+            llm_seconds=result.llm_seconds, sleep_seconds=result.sleep_seconds,
+        )
+    return result
+
+
+def _extract_chunk_steps(chunk, count_chunk, total_chunks, cache_key, settings, key=None):
+    """Queries the LLM for a single chunk that missed the cache."""
+    user_message, fallback_message = _user_messages(settings.user_prompt, chunk, chunk, settings)
+    attempts = yield from _request_steps(
+        user_message, f"chunk {count_chunk}", f"chunk {count_chunk}/{total_chunks}", settings,
+        fallback_message, key,
+    )
+    result = ChunkResult(
+        count_chunk, chunk, attempts.parsed.edges if attempts.parsed else [], attempts.retries,
+        attempts.parsed is not None, llm_seconds=attempts.llm_seconds, sleep_seconds=attempts.sleep_seconds,
+    )
+    _store_chunk(cache_key, result, settings)
+    return result
+
+
+def _chunk_steps(chunk, count_chunk, total_chunks, settings):
+    """
+    Holds the cache lookup, extraction and retry logic for a single chunk.
+
+    Returns:
+        A `ChunkResult` for the chunk (as the StopIteration value). Its edges
+        are empty if no valid node was produced before retries were exhausted.
+    """
+    key = _start_chunk(count_chunk, total_chunks, settings)
+    cache_key, result = _lookup_chunk(chunk, count_chunk, total_chunks, settings, key)
+    if result is None:
+        result = yield from _extract_chunk_steps(chunk, count_chunk, total_chunks, cache_key, settings, key)
+    return _end_chunk(key, result, total_chunks, settings)
+
+
+def _pack_steps(pack, total_chunks, settings, packed=False):
+    """
+    Extracts several chunks with a single packed request.
+
+    Chunks found in the cache or checkpoint journal are left out of the
+    request. Each chunk is sent as a numbered section and the LLM is asked to
+    tag every node with the section it came from; nodes without a valid
+    section number are attributed to the first chunk of the request. If no
+    node has one, the other chunks are reported as failed and nothing from
+    the request is cached or journaled, so a later run extracts them. Edges
+    from a packed request are stored under the chunk's packed key (see
+    `_chunk_key`), so unpacked runs sharing the cache do not reuse them.
+
+    Args:
+        packed: Whether the run packs chunks, i.e. its pack_size is greater
+                than 1; such runs also reuse edges stored by packed requests.
+
+    Returns:
+        A list of `ChunkResult` objects in chunk order (as the StopIteration
+        value).
+    """
+    results = {}
+    misses = []
+    keys = {}
+    for count_chunk, chunk in pack:
+        keys[count_chunk] = _start_chunk(count_chunk, total_chunks, settings)
+        cache_key, result = _lookup_chunk(chunk, count_chunk, total_chunks, settings, keys[count_chunk], packed)
+        if result is not None:
+            results[count_chunk] = result
+        else:
+            misses.append((count_chunk, chunk, cache_key))
+
+    if len(misses) == 1:
+        count_chunk, chunk, cache_key = misses[0]
+        results[count_chunk] = yield from _extract_chunk_steps(
+            chunk, count_chunk, total_chunks, cache_key, settings, keys[count_chunk],
+        )
+    elif misses:
+        sections = "\n".join(
+            f'<section id="{section}">\n{chunk}\n</section>'
+            for section, (_, chunk, _) in enumerate(misses, 1)
+        )
+        user_message, fallback_message = _user_messages(
+            settings.packed_user_prompt, sections, " ".join(chunk for _, chunk, _ in misses), settings,
+        )
+        first, last = misses[0][0], misses[-1][0]
+        attempts = yield from _request_steps(
+            user_message, f"chunks {first}-{last}", f"chunks {first}-{last}/{total_chunks}", settings,
+            fallback_message, keys[first],
+        )
+
+        edges_by_section = [[] for _ in misses]
+        attributed = False
+        if attempts.parsed is not None:
+            for edge, source in zip(attempts.parsed.edges, attempts.parsed.sources):
+                if source is not None and 0 < source <= len(misses):
+                    edges_by_section[source - 1].append(edge)
+                    attributed = True
+                else:
+                    edges_by_section[0].append(edge)
+
+        for (count_chunk, chunk, cache_key), edges in zip(misses, edges_by_section):
+            # The request's cost is attributed to its first chunk
+            is_first = count_chunk == first
+            # Without any valid section number the edges cannot be told apart: the
+            # first chunk returns them all and the others count as failed
+            success = attempts.parsed is not None and (attributed or is_first)
+            result = ChunkResult(
+                count_chunk, chunk, edges, attempts.retries, success,
+                llm_seconds=attempts.llm_seconds if is_first else 0.0,
+                sleep_seconds=attempts.sleep_seconds if is_first else 0.0,
+            )
+            if attributed and cache_key is not None:
+                _store_chunk(_chunk_key(chunk, settings, packed=True), result, settings)
+            results[count_chunk] = result
+
+    return [_end_chunk(keys[count_chunk], results[count_chunk], total_chunks, settings) for count_chunk, _ in pack]
+
+
+def _run_chunk(steps, llm):
+    """Drives a step generator such as `_chunk_steps` with blocking LLM calls and sleeps."""
+    try:
+        action, value = next(steps)
+        while True:
+            if action == _SLEEP:
+                time.sleep(value)
+                action, value = steps.send(None)
+                continue
+            try:
+                response = invoke(llm, value)
+            except Exception as e:
+                action, value = steps.throw(e)
+            else:
+                action, value = steps.send(response)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def _arun_chunk(steps, llm):
+    """Drives a step generator such as `_chunk_steps` with `ainvoke` and `asyncio.sleep`."""
+    try:
+        action, value = next(steps)
+        while True:
+            if action == _SLEEP:
+                await asyncio.sleep(value)
+                action, value = steps.send(None)
+                continue
+            try:
+                response = await ainvoke(llm, value)
+            except Exception as e:
+                action, value = steps.throw(e)
+            else:
+                action, value = steps.send(response)
+    except StopIteration as stop:
+        return stop.value
+
+
+def _map_bounded(func, items, max_concurrency):
+    """
+    Applies func to every item on a thread pool, yielding results in input order.
+
+    Only a bounded window of items is submitted ahead of the one being waited
+    on, so arbitrarily long inputs are not materialised as futures up front.
+    """
+    window = max_concurrency * 2
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _group(items, size):
+    """Groups an iterable into lists of up to size items, lazily."""
+    group = []
+    for item in items:
+        group.append(item)
+        if len(group) == size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def _validate_arguments(
+        llm, max_concurrency, pack_size, user_prompt=USER_PROMPT, packed_user_prompt=PACKED_USER_PROMPT,
+        asynchronous=False,
+):
+    """
+    Validates the arguments shared by every generation entry point.
+
+    A client that does not fit the entry point is rejected here rather than
+    on its first call, where the TypeError would be retried as a failed call.
+    """
+    if llm is None:
+        raise ValueError("LLM object must be provided.")
+    if not is_client(llm, asynchronous):
+        if asynchronous:
+            raise TypeError("LLM object must expose ainvoke() or be callable.")
+        if callable(llm):
+            raise TypeError("The LLM callable is a coroutine function; use aexecute_graph_generation instead.")
+        raise TypeError("LLM object must expose invoke() or be callable.")
+    if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer.")
+    if not isinstance(pack_size, int) or pack_size <= 0:
+        raise ValueError("pack_size must be a positive integer.")
+    if pack_size > 1 and user_prompt != USER_PROMPT and packed_user_prompt == PACKED_USER_PROMPT:
+        # Packed requests are built from packed_user_prompt, so a custom user_prompt alone would be ignored
+        raise ValueError("A custom user_prompt requires a matching packed_user_prompt when pack_size is greater than 1.")
+
+
+def _prepare_chunks(
+        text, llm, chunk_size, verbose, max_concurrency, pack_size, chunker,
+        user_prompt=USER_PROMPT, packed_user_prompt=PACKED_USER_PROMPT, asynchronous=False,
+):
+    """
+    Validates the shared generation arguments and splits the text into chunks.
+
+    Returns:
+        A tuple of the chunks and the total number of chunks, which is "?" for
+        streamed input and custom chunkers.
+    """
+    _validate_arguments(llm, max_concurrency, pack_size, user_prompt, packed_user_prompt, asynchronous)
+
+    if chunker is not None:
+        chunks = chunker.split(text)
+        if verbose:
+            print(f"Chunking text with {type(chunker).__name__}.")
+        return chunks, "?"
+
+    if not isinstance(text, str):
+        # Streams are chunked lazily, so the number of chunks is not known.
+        chunks = iter_word_chunks(text, chunk_size)
+        if verbose:
+            print(f"Streaming text in chunks of size {chunk_size} words.")
+        return chunks, "?"
+
+    chunks = split_text_by_words(text, chunk_size)
+    if verbose:
+        print(f"Splitting text into {len(chunks)} chunks of size {chunk_size} words.")
+    return chunks, len(chunks)
+
+
+def _build_settings(
+        llm,
+        relations=RELATIONS,
+        max_retries=10,
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=USER_PROMPT,
+        verbose=False,
+        sleep_time=0.75,
+        cache=None,
+        validate_relations=False,
+        retry_policy=None,
+        rate_limiter=None,
+        checkpoint=None,
+        compact_relations=False,
+        packed_user_prompt=PACKED_USER_PROMPT,
+        relation_selector=None,
+        callbacks=None,
+):
+    """Bundles the per-chunk generation options into a `_Settings` for one run."""
+    if relation_selector is not None:
+        # Rank the run's relations, not the ones the selector was built with
+        relation_selector = relation_selector.for_relations(relations)
+    if retry_policy is None:
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise ValueError("max_retries must be a non-negative integer.")
+        # max_retries=0 makes no attempts at all, which RetryPolicy does not allow
+        retry_policy = RetryPolicy(max_attempts=max(max_retries, 1), base_delay=sleep_time)
+        max_attempts = max_retries
+    else:
+        max_attempts = retry_policy.max_attempts
+    callbacks = tuple(callbacks or ())
+    if verbose:
+        callbacks += (PrintCallback(),)
+    return _Settings(
+        relations, system_prompt, user_prompt, callbacks, cache, model_identity(llm),
+        validate_relations, retry_policy, max_attempts, retry_policy.new_budget(), rate_limiter,
+        checkpoint, compact_relations, packed_user_prompt, relation_selector,
+    )
+
+
+def _run_settings(llm, chunker=None, callbacks=None, **options):
+    """
+    Builds the `_Settings` of a run, taking the options of `_build_settings`.
+
+    A chunker that is also a `Callback`, such as `AdaptiveChunker`, is
+    registered so that it learns from the run.
+    """
+    if isinstance(chunker, Callback):
+        callbacks = list(callbacks or ()) + [chunker]
+    return _build_settings(llm, callbacks=callbacks, **options)
+
+
+def iter_graph_generation(
         text="",
         llm=None,
         chunk_size=100,
@@ -71,92 +700,328 @@ def execute_graph_generation(
         user_prompt=USER_PROMPT,
         verbose=False,
         sleep_time=0.75,
+        max_concurrency=1,
+        cache=None,
+        chunker=None,
+        validate_relations=False,
+        retry_policy=None,
+        rate_limiter=None,
+        checkpoint=None,
+        pack_size=1,
+        packed_user_prompt=PACKED_USER_PROMPT,
+        compact_relations=False,
+        relation_selector=None,
+        callbacks=None,
 ):
-    if llm is None:
-        raise ValueError("LLM object must be provided.")
+    """
+    Generates a knowledge graph incrementally, yielding one result per chunk.
 
-    chunks = split_text_by_words(text, chunk_size)
-    if verbose:
-        print(f"Splitting text into {len(chunks)} chunks of size {chunk_size} words.")
+    Takes the same arguments as `execute_graph_generation`. Each chunk's
+    `ChunkResult` is yielded as soon as it has been parsed (and, when running
+    concurrently, once every earlier chunk has been yielded), so edges can be
+    streamed into a store without waiting for the whole text.
 
-    graph = []
-    total_chunks = len(chunks)
-    for count_chunk, chunk in enumerate(chunks, 1):
-        if verbose:
-            print(f"Processing chunk {count_chunk}/{total_chunks}...")
+    Yields:
+        A `ChunkResult` per chunk, in chunk order.
+    """
+    chunks, total_chunks = _prepare_chunks(
+        text, llm, chunk_size, verbose, max_concurrency, pack_size, chunker, user_prompt, packed_user_prompt,
+    )
+    settings = _run_settings(
+        llm, chunker, callbacks, relations=relations, max_retries=max_retries, system_prompt=system_prompt,
+        user_prompt=user_prompt, verbose=verbose, sleep_time=sleep_time, cache=cache,
+        validate_relations=validate_relations, retry_policy=retry_policy, rate_limiter=rate_limiter,
+        checkpoint=checkpoint, compact_relations=compact_relations, packed_user_prompt=packed_user_prompt,
+        relation_selector=relation_selector,
+    )
 
-        found_valid_node_in_chunk = False
-        retry_count = 0
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt.format(text=chunk, relationships=relations))
-        ]
+    def process(pack):
+        steps = _pack_steps(pack, total_chunks, settings, pack_size > 1)
+        return _run_chunk(steps, llm)
 
-        # Loop until a valid node is found OR retries are exhausted for this chunk
-        while not found_valid_node_in_chunk and retry_count < max_retries:
-            try:
-                response = llm.invoke(messages)
-                # Ensure response and content are usable
-                content = response.content if response and hasattr(response, 'content') else ""
+    packs = _group(enumerate(chunks, 1), pack_size)
+    if max_concurrency == 1:
+        results = map(process, packs)
+    else:
+        results = _map_bounded(process, packs, max_concurrency)
+    for pack_results in results:
+        yield from pack_results
 
-                if not isinstance(content, str):
-                    if verbose:
-                        print(
-                            f"LLM response content is not a string (type: {type(content)}) for chunk {count_chunk}. Retrying (attempt {retry_count + 1}/{max_retries})...")
-                    retry_count += 1
-                    continue  # Retry if content isn't a string
-
-                nodes_raw = re.findall(r"<node>(.*?)</node>", content, re.DOTALL)
-
-                if not nodes_raw:
-                    # If LLM responds but without any <node> tags
-                    if verbose:
-                        print(
-                            f"No <node> tags found in response for chunk {count_chunk}. Retrying (attempt {retry_count + 1}/{max_retries})...")
-                    # No need to raise error here, just retry
-                    retry_count += 1
-                    continue  # Retry
-
-                # --- Process found <node> tags ---
-                processed_at_least_one_node = False
-                for node_content in nodes_raw:
-                    from_node_match = re.search(r"<from_node>(.*?)</from_node>", node_content)
-                    relationship_match = re.search(r"<relationship>(.*?)</relationship>", node_content)
-                    to_node_match = re.search(r"<to_node>(.*?)</to_node>", node_content)
-
-                    if from_node_match and relationship_match and to_node_match:
-                        graph.append({
-                            "from": from_node_match.group(1).strip(),
-                            "relationship": relationship_match.group(1).strip(),
-                            "to": to_node_match.group(1).strip()
-                        })
-                        processed_at_least_one_node = True  # Mark that we found a valid one
-
-                # --- Decide whether to exit the while loop ---
-                if processed_at_least_one_node:
-                    if verbose:
-                        print(f"Nodes successfully processed in chunk {count_chunk}/{total_chunks}.")
-                    found_valid_node_in_chunk = True  # Exit the while loop for this chunk
-                else:
-                    # Found <node> tags, but none had the correct inner structure
-                    if verbose:
-                        print(
-                            f"<node> tags found but no valid structure in chunk {count_chunk}. Retrying (attempt {retry_count + 1}/{max_retries})...")
-                    retry_count += 1
-                    # Loop continues (while condition checked again)
 
-            except Exception as e:
-                # Catch LLM errors or unexpected processing errors (like regex on bad types if check failed)
-                if verbose:
-                    print(
-                        f"Error during LLM invocation or processing for chunk {count_chunk}: {e}. Retrying (attempt {retry_count + 1}/{max_retries})...")
-                retry_count += 1
-                time.sleep(sleep_time)
-                continue  # Retry
-            time.sleep(sleep_time)
-        if not found_valid_node_in_chunk and verbose:
-            print(f"Max retries ({max_retries}) reached for chunk {count_chunk}. No valid nodes added for this chunk.")
+async def aiter_graph_generation(
+        text="",
+        llm=None,
+        chunk_size=100,
+        relations=RELATIONS,
+        max_retries=10,
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=USER_PROMPT,
+        verbose=False,
+        sleep_time=0.75,
+        max_concurrency=1,
+        cache=None,
+        chunker=None,
+        validate_relations=False,
+        retry_policy=None,
+        rate_limiter=None,
+        checkpoint=None,
+        pack_size=1,
+        packed_user_prompt=PACKED_USER_PROMPT,
+        compact_relations=False,
+        relation_selector=None,
+        callbacks=None,
+):
+    """
+    Asynchronous version of `iter_graph_generation`.
+
+    Chunks are scheduled as tasks in a bounded window, with a semaphore
+    limiting how many of them await the LLM at once. Results are yielded in
+    chunk order.
+    """
+    chunks, total_chunks = _prepare_chunks(
+        text, llm, chunk_size, verbose, max_concurrency, pack_size, chunker, user_prompt, packed_user_prompt,
+        asynchronous=True,
+    )
+    settings = _run_settings(
+        llm, chunker, callbacks, relations=relations, max_retries=max_retries, system_prompt=system_prompt,
+        user_prompt=user_prompt, verbose=verbose, sleep_time=sleep_time, cache=cache,
+        validate_relations=validate_relations, retry_policy=retry_policy, rate_limiter=rate_limiter,
+        checkpoint=checkpoint, compact_relations=compact_relations, packed_user_prompt=packed_user_prompt,
+        relation_selector=relation_selector,
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def process(pack):
+        async with semaphore:
+            steps = _pack_steps(pack, total_chunks, settings, pack_size > 1)
+            return await _arun_chunk(steps, llm)
+
+    window = max_concurrency * 2
+    pending = deque()
+    try:
+        for pack in _group(enumerate(chunks, 1), pack_size):
+            pending.append(asyncio.ensure_future(process(pack)))
+            if len(pending) >= window:
+                for result in await pending.popleft():
+                    yield result
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def execute_graph_generation(
+        text="",
+        llm=None,
+        chunk_size=100,
+        relations=RELATIONS,
+        max_retries=10,
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=USER_PROMPT,
+        verbose=False,
+        sleep_time=0.75,
+        max_concurrency=1,
+        cache=None,
+        chunker=None,
+        validate_relations=False,
+        retry_policy=None,
+        rate_limiter=None,
+        checkpoint=None,
+        pack_size=1,
+        packed_user_prompt=PACKED_USER_PROMPT,
+        compact_relations=False,
+        relation_selector=None,
+        callbacks=None,
+        as_graph=False,
+):
+    """
+    Generates a knowledge graph from a text by querying an LLM chunk by chunk.
+
+    Args:
+        text: The input string to extract relationships from. A path, file
+              object or iterable of lines is also accepted and chunked lazily
+              with `iter_word_chunks`, so large documents are never held in
+              memory at once.
+        llm: A LangChain-compatible chat model exposing `invoke` (and
+             `ainvoke` for the async entry points), or any callable that
+             takes a list of {"role": ..., "content": ...} dictionaries and
+             returns a string or an object with `content`.
+        chunk_size: The maximum number of words sent to the LLM per request.
+        relations: The relationship types offered to the LLM.
+        max_retries: The maximum number of attempts per chunk. With 0 the
+                     LLM is never called and no edges are returned.
+        system_prompt: The system message sent with every request.
+        user_prompt: The user message template, formatted with `text` and
+                     `relationships`.
+        verbose: Whether to print progress information.
+        sleep_time: Seconds to wait after the first failed LLM call of a
+                    chunk; further failures back off exponentially.
+        max_concurrency: The maximum number of chunks processed at the same
+                         time. Chunks are dispatched to a thread pool when this
+                         is greater than 1; edges are always returned in chunk
+                         order.
+        cache: An optional `ResponseCache`. Chunks whose request was seen
+               before reuse the cached edges without calling the LLM or
+               sleeping. Keys include the model identity (see
+               `model_identity`); give a callable client a `model`
+               attribute naming its model so that its entries are not
+               shared with other clients and stay valid across processes.
+        chunker: An optional `Chunker` used instead of splitting the text into
+                 chunk_size words, e.g. a `SentenceChunker` with overlap. A
+                 chunker that is also a `Callback`, such as
+                 `AdaptiveChunker`, receives the run's events.
+        validate_relations: Whether to drop edges whose relationship is not
+                            one of relations.
+        retry_policy: An optional `RetryPolicy` controlling backoff, jitter,
+                      the per-run retry budget and corrective re-prompting.
+                      Replaces max_retries and sleep_time when given.
+        rate_limiter: An optional `RateLimiter` consulted before every LLM
+                      call. Share one limiter between concurrent runs to keep
+                      their combined traffic under the backend's limits.
+        checkpoint: An optional `CheckpointJournal`. Completed chunks are
+                    appended to it, and chunks already recorded are skipped,
+                    so an interrupted run can be resumed.
+        pack_size: The number of chunks sent together in one request. Chunks
+                   are sent as numbered sections and the returned nodes are
+                   mapped back to their section.
+        packed_user_prompt: The user message template for packed requests,
+                            formatted with the numbered sections as `text`
+                            and `relationships`. Required when a custom
+                            user_prompt is combined with pack_size.
+        compact_relations: Whether to list relations as comma-separated names
+                           instead of a Python list repr.
+        relation_selector: An optional `RelationSelector` that offers only
+                           the relations most relevant to each chunk on the
+                           first attempt; retries offer the full list.
+        callbacks: An optional list of `Callback` objects receiving
+                   structured events such as LLM latency, parse time and
+                   retries, e.g. a `MetricsAggregator`.
+        as_graph: Whether to return a deduplicated `KnowledgeGraph` instead
+                  of the list of edge dictionaries.
+
+    Returns:
+        A list of dictionaries with the keys "from", "relationship" and "to",
+        or a `KnowledgeGraph` when as_graph is set.
+
+    Raises:
+        ValueError: If no LLM is provided, max_concurrency is not a positive
+                    integer, max_retries is not a non-negative integer, or a
+                    custom user_prompt is packed without packed_user_prompt.
+        TypeError: If llm neither exposes `invoke` nor is callable, or is
+                   a coroutine function.
+    """
+    graph = KnowledgeGraph() if as_graph else []
+    llm_seconds = 0.0
+    sleep_seconds = 0.0
+    for result in iter_graph_generation(
+            text=text,
+            llm=llm,
+            chunk_size=chunk_size,
+            relations=relations,
+            max_retries=max_retries,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            verbose=verbose,
+            sleep_time=sleep_time,
+            max_concurrency=max_concurrency,
+            cache=cache,
+            chunker=chunker,
+            validate_relations=validate_relations,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            checkpoint=checkpoint,
+            pack_size=pack_size,
+            packed_user_prompt=packed_user_prompt,
+            compact_relations=compact_relations,
+            relation_selector=relation_selector,
+            callbacks=callbacks,
+    ):
+        if as_graph:
+            graph.add_chunk(result.edges)
+        else:
+            graph.extend(result.edges)
+        llm_seconds += result.llm_seconds
+        sleep_seconds += result.sleep_seconds
+
+    if verbose:
+        print(f"Spent {llm_seconds:.2f}s waiting on the LLM and {sleep_seconds:.2f}s sleeping between retries.")
 
     return graph
 
 
+async def aexecute_graph_generation(
+        text="",
+        llm=None,
+        chunk_size=100,
+        relations=RELATIONS,
+        max_retries=10,
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=USER_PROMPT,
+        verbose=False,
+        sleep_time=0.75,
+        max_concurrency=1,
+        cache=None,
+        chunker=None,
+        validate_relations=False,
+        retry_policy=None,
+        rate_limiter=None,
+        checkpoint=None,
+        pack_size=1,
+        packed_user_prompt=PACKED_USER_PROMPT,
+        compact_relations=False,
+        relation_selector=None,
+        callbacks=None,
+        as_graph=False,
+):
+    """
+    Asynchronous version of `execute_graph_generation`.
+
+    The LLM is queried with `ainvoke` and waits use `asyncio.sleep`, so the
+    event loop is never blocked; blocking callables run on the loop's default
+    executor. Up to `max_concurrency` chunks are in flight at once, bounded
+    by a semaphore. Arguments, retry behaviour and the returned graph are the
+    same as for `execute_graph_generation`.
+
+    Raises:
+        TypeError: If llm neither exposes `ainvoke` nor is callable; objects
+                   exposing only `invoke` need the blocking entry points.
+    """
+    graph = KnowledgeGraph() if as_graph else []
+    llm_seconds = 0.0
+    sleep_seconds = 0.0
+    async for result in aiter_graph_generation(
+            text=text,
+            llm=llm,
+            chunk_size=chunk_size,
+            relations=relations,
+            max_retries=max_retries,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            verbose=verbose,
+            sleep_time=sleep_time,
+            max_concurrency=max_concurrency,
+            cache=cache,
+            chunker=chunker,
+            validate_relations=validate_relations,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            checkpoint=checkpoint,
+            pack_size=pack_size,
+            packed_user_prompt=packed_user_prompt,
+            compact_relations=compact_relations,
+            relation_selector=relation_selector,
+            callbacks=callbacks,
+    ):
+        if as_graph:
+            graph.add_chunk(result.edges)
+        else:
+            graph.extend(result.edges)
+        llm_seconds += result.llm_seconds
+        sleep_seconds += result.sleep_seconds
+
+    if verbose:
+        print(f"Spent {llm_seconds:.2f}s waiting on the LLM and {sleep_seconds:.2f}s sleeping between retries.")
+
+    return graph
@@ -0,0 +1,109 @@
+import re
+from typing import NamedTuple
+
+_TAG = re.compile(r"<(/?)(node|from_node|relationship|to_node|source)>")
+_FIELDS = ("from_node", "relationship", "to_node")
+
+
+class ParseResult(NamedTuple):
+    """
+    The edges recovered from one LLM response.
+
+    Attributes:
+        edges: The valid edge dictionaries, in response order.
+        node_count: The number of <node> elements seen, including one left
+                    open by truncated output.
+        rejected: The number of nodes dropped because a field was missing or
+                  empty, or the relationship was not allowed.
+        truncated: Whether the response ended inside a <node> element.
+        sources: For each edge, the integer in its optional <source> tag, or
+                 None. Used to map nodes of packed requests back to chunks.
+    """
+    edges: list
+    node_count: int
+    rejected: int
+    truncated: bool
+    sources: list
+
+
+def _section_number(source: str):
+    """Returns the section number a <source> tag names, or None if it is not one."""
+    # isdigit() would accept characters such as "²" that int() rejects
+    if not source.isdecimal():
+        return None
+    try:
+        return int(source)
+    except ValueError:
+        # Longer than the interpreter's integer string conversion limit
+        return None
+
+
+def parse_response(content: str, relations=None, salvage: bool = True) -> ParseResult:
+    """
+    Extracts edges from an LLM response in a single scan over its tags.
+
+    The response is expected to contain <node> elements, optionally wrapped
+    in <nodes>, each holding <from_node>, <relationship> and <to_node>, and
+    optionally <source>. Text
+    outside the tags is ignored. A node that is never closed (because the
+    response was cut off, or the next <node> starts first) is still used
+    when salvage is enabled and all three of its fields are complete.
+
+    Args:
+        content: The response text.
+        relations: If given, only edges whose relationship is one of these
+                   (ignoring case and surrounding whitespace) are kept.
+        salvage: Whether to keep complete fields of unclosed nodes.
+
+    Returns:
+        A `ParseResult`.
+    """
+    allowed = None
+    if relations is not None:
+        allowed = {str(relation).strip().casefold() for relation in relations}
+
+    edges = []
+    sources = []
+    node_count = 0
+    rejected = 0
+    fields = None
+    open_field = None
+    open_at = 0
+
+    def close_node(fields):
+        values = [fields.get(name) for name in _FIELDS]
+        if not all(values) or (allowed is not None and values[1].casefold() not in allowed):
+            return False
+        edges.append({"from": values[0], "relationship": values[1], "to": values[2]})
+        sources.append(_section_number(fields.get("source", "")))
+        return True
+
+    for match in _TAG.finditer(content):
+        closing, name = match.groups()
+        if name == "node":
+            if closing:
+                if fields is not None and not close_node(fields):
+                    rejected += 1
+                fields = None
+            else:
+                # A new node while one is open means the previous was never closed
+                if fields is not None and not (salvage and close_node(fields)):
+                    rejected += 1
+                node_count += 1
+                fields = {}
+            open_field = None
+        elif fields is None:
+            continue
+        elif not closing:
+            open_field = name
+            open_at = match.end()
+        elif open_field == name:
+            # The first occurrence of a field wins
+            fields.setdefault(name, content[open_at:match.start()].strip())
+            open_field = None
+
+    truncated = fields is not None
+    if truncated and not (salvage and close_node(fields)):
+        rejected += 1
+
+    return ParseResult(edges, node_count, rejected, truncated, sources)
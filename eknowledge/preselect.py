@@ -0,0 +1,115 @@
+import math
+import re
+from .relations import RELATIONS, RELATION_DESCRIPTIONS
+
+_WORD = re.compile(r"[a-z]+")
+_SUFFIXES = ("ations", "ation", "ments", "ment", "ities", "ity", "ness", "ions", "ion",
+             "ing", "ies", "ive", "ed", "es", "al", "ly", "s")
+_STOPWORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in",
+    "is", "it", "its", "of", "on", "or", "than", "that", "the", "this", "to", "was",
+    "were", "with", "relationship", "relation", "general", "specific", "context",
+))
+
+
+def _stem(word: str) -> str:
+    """Strips a common English suffix so that inflected forms match."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def _terms(text: str) -> set:
+    return {_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS}
+
+
+class RelationSelector:
+    """
+    Picks the relations most likely to be relevant to a chunk, locally.
+
+    Each relation is described by the words of its name and description;
+    a chunk scores each relation by the inverse-document-frequency weight of
+    the terms they share. No model or network access is involved, so
+    selection costs microseconds per chunk. The generation entry points call
+    `for_relations` so that only the run's own relations are offered.
+
+    Args:
+        relations: The full list of relations to choose from.
+        top_k: The number of relations to offer per chunk.
+        descriptions: A mapping from relation to a short description.
+        always_include: Relations offered for every chunk, counted within
+                        top_k.
+    """
+
+    def __init__(self, relations=RELATIONS, top_k: int = 15, descriptions=RELATION_DESCRIPTIONS,
+                 always_include=("is_a", "part_of", "associated_with")):
+        if not isinstance(top_k, int) or top_k <= 0:
+            raise ValueError("top_k must be a positive integer.")
+        self.relations = list(relations)
+        self.top_k = top_k
+        self.descriptions = descriptions
+        self._requested_always_include = tuple(always_include)
+        self.always_include = [relation for relation in always_include if relation in self.relations]
+
+        relation_terms = [
+            _terms(str(relation).replace("_", " ") + " " + descriptions.get(relation, ""))
+            for relation in self.relations
+        ]
+        document_frequency = {}
+        for terms in relation_terms:
+            for term in terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        count = len(self.relations)
+        self._index = {}
+        for position, terms in enumerate(relation_terms):
+            for term in terms:
+                weight = math.log(1 + count / document_frequency[term])
+                self._index.setdefault(term, []).append((position, weight))
+
+    def for_relations(self, relations) -> "RelationSelector":
+        """Returns a selector with the same settings that chooses among relations instead."""
+        relations = list(relations)
+        if relations == self.relations:
+            return self
+        return RelationSelector(relations, self.top_k, self.descriptions, self._requested_always_include)
+
+    def key_options(self):
+        """
+        Returns the JSON-serialisable settings that decide which relations
+        are offered, for cache and checkpoint keys, or None when every
+        relation is always offered.
+        """
+        if self.top_k >= len(self.relations):
+            return None
+        return {
+            "top_k": self.top_k,
+            "always_include": [str(relation) for relation in self.always_include],
+            "descriptions": {str(relation): self.descriptions.get(relation, "") for relation in self.relations},
+        }
+
+    def scores(self, text: str) -> list:
+        """Returns a relevance score per relation, in relation order."""
+        scores = [0.0] * len(self.relations)
+        for term in _terms(text):
+            for position, weight in self._index.get(term, ()):
+                scores[position] += weight
+        return scores
+
+    def select(self, text: str) -> list:
+        """
+        Returns up to top_k relations for text, in their original order.
+
+        The always_include relations come first in priority, then the best
+        scoring ones; ties keep the original relation order.
+        """
+        if self.top_k >= len(self.relations):
+            return list(self.relations)
+        scores = self.scores(text)
+        chosen = set(self.always_include[:self.top_k])
+        ranked = sorted(range(len(self.relations)), key=lambda position: -scores[position])
+        for position in ranked:
+            if len(chosen) >= self.top_k:
+                break
+            chosen.add(self.relations[position])
+        return [relation for relation in self.relations if relation in chosen]
@@ -16,3 +16,15 @@ Please identify and list the relationships between nodes for the ontology based
 Possible relationships include: 
 {relationships}
 """
+FORMAT_CORRECTION_PROMPT = """
+Your previous response could not be parsed. Respond ONLY with <nodes>...</nodes>, where each connection is a <node> element containing exactly one <from_node>, one <relationship> and one <to_node>, using only the relationships listed above.
+"""
+PACKED_USER_PROMPT = """
+Please identify and list the relationships between nodes for the ontology based on the user's input text, which is split into numbered sections:
+======
+{text}
+======
+Only relate entities that appear in the same section. Inside every <node>, add <source>N</source> with the id of the section it came from.
+Possible relationships include: 
+{relationships}
+"""
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    A token bucket that hands out reservations instead of blocking.
+
+    Reservations may drive the balance negative; the caller is told how long
+    to wait until the tokens it took would have accumulated. This keeps the
+    bucket usable from threads and coroutines alike.
+
+    Args:
+        rate: Tokens added per second.
+        capacity: The maximum balance, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Takes amount tokens and returns the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Client-side throttle on request rate and estimated token throughput.
+
+    A single limiter can be shared by any number of threads, coroutines and
+    concurrent generation runs so that together they stay under the
+    backend's limits.
+
+    Args:
+        requests_per_second: The maximum sustained request rate, or None.
+        tokens_per_minute: The maximum sustained prompt tokens per minute, or
+                           None. Prompt sizes are estimated with
+                           `estimate_tokens`.
+        burst_seconds: How many seconds' worth of capacity may be spent at
+                       once after an idle period.
+    """
+
+    def __init__(self, requests_per_second: float = None, tokens_per_minute: float = None, burst_seconds: float = 1.0):
+        if requests_per_second is None and tokens_per_minute is None:
+            raise ValueError("Either requests_per_second or tokens_per_minute must be provided.")
+        self.requests = None
+        self.tokens = None
+        if requests_per_second is not None:
+            self.requests = TokenBucket(requests_per_second, max(1.0, requests_per_second * burst_seconds))
+        if tokens_per_minute is not None:
+            tokens_per_second = tokens_per_minute / 60
+            self.tokens = TokenBucket(tokens_per_second, tokens_per_second * burst_seconds)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserves one request using tokens and returns the seconds to wait."""
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.reserve(1)
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Blocks until a request using tokens may be sent; returns the wait."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Asynchronous version of `acquire`."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,289 @@
+import random
+import re
+import zlib
+from typing import Tuple
+from .graph import KnowledgeGraph, normalize_label
+
+# Generic words that qualify a name without changing the entity it names.
+QUALIFIERS = (
+    "the", "language", "programming language", "company", "corporation", "corp", "inc", "ltd", "llc",
+    "co", "organization", "organisation", "concept", "entity",
+)
+
+_PARENTHETICAL = re.compile(r"\([^()]*\)|\[[^\[\]]*\]")
+# "+" and "#" name different entities ("C", "C++", "C#"), so they are kept
+_PUNCTUATION = re.compile(r"[^\w\s+#]")
+# Numbers and symbol runs that must agree for two keys to merge
+_MARKERS = re.compile(r"\d+|[+#]+")
+
+
+class AliasTable:
+    """
+    Maps node surface forms to canonical entities.
+
+    Every entity has an integer ID and a canonical label, the surface form
+    it was mentioned by most often (the first one seen on a tie). Lookups
+    ignore case and whitespace.
+    """
+
+    def __init__(self):
+        self.labels = []
+        self._ids = {}
+        self._aliases = []
+
+    def _add(self, canonical_label: str, aliases) -> int:
+        entity_id = len(self.labels)
+        self.labels.append(canonical_label)
+        self._aliases.append(list(aliases))
+        for alias in aliases:
+            self._ids[normalize_label(alias)] = entity_id
+        return entity_id
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def canonical_id(self, label: str):
+        """Returns the entity ID of a surface form, or None if it is unknown."""
+        return self._ids.get(normalize_label(label))
+
+    def canonical(self, label: str) -> str:
+        """Returns the canonical label of a surface form, or label itself if unknown."""
+        entity_id = self._ids.get(normalize_label(label))
+        return label if entity_id is None else self.labels[entity_id]
+
+    def aliases(self, label: str) -> list:
+        """Returns every surface form of the entity label belongs to."""
+        entity_id = self._ids.get(normalize_label(label))
+        return [] if entity_id is None else list(self._aliases[entity_id])
+
+    def to_dict(self) -> dict:
+        """Returns a mapping from each canonical label to its surface forms."""
+        return {label: list(aliases) for label, aliases in zip(self.labels, self._aliases)}
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, first: int, second: int) -> None:
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+class EntityResolver:
+    """
+    Clusters node surface forms that name the same entity.
+
+    Resolution runs in three stages, none of which compares all pairs:
+
+    1. Normalisation: case, whitespace, punctuation other than "+" and "#",
+       parentheticals such as "(language)" and generic qualifiers such as
+       "language" or "inc" are removed, so "Python", "python language" and
+       "Python (language)" share one key while "C", "C++" and "C#" do not.
+    2. Blocking: each distinct key gets a MinHash signature over its
+       character trigrams, and locality-sensitive hashing puts keys whose
+       signatures agree on any band into the same bucket.
+    3. Verification: keys sharing a bucket are merged with union-find when
+       the Jaccard similarity of their trigram sets reaches threshold and
+       they contain the same numbers and "+"/"#" symbols ("Python 2" never
+       merges with "Python 3", nor "Visual C++" with "Visual C#").
+
+    Args:
+        threshold: The minimum trigram Jaccard similarity for a fuzzy merge.
+        num_perm: The MinHash signature length.
+        bands: The number of LSH bands; must divide num_perm. More bands
+               find more candidates at the cost of more comparisons.
+        qualifiers: The generic words stripped from either end of a name.
+        max_bucket: Buckets larger than this only compare their members with
+                    the bucket's first key, keeping the work linear.
+        seed: The seed of the MinHash permutations.
+    """
+
+    def __init__(
+            self,
+            threshold: float = 0.7,
+            num_perm: int = 24,
+            bands: int = 8,
+            qualifiers=QUALIFIERS,
+            max_bucket: int = 100,
+            seed: int = 1,
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1.")
+        if not isinstance(num_perm, int) or not isinstance(bands, int) or bands <= 0 or num_perm % bands:
+            raise ValueError("bands must be a positive integer dividing num_perm.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.max_bucket = max_bucket
+        # Longest qualifiers first so that "programming language" wins over "language"
+        self.qualifiers = sorted({normalize_label(qualifier) for qualifier in qualifiers}, key=len, reverse=True)
+        # Each MinHash permutation is approximated by XOR with a random mask
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(32) for _ in range(num_perm)]
+
+    def key(self, label: str) -> str:
+        """Returns the normalised form used to match label against others."""
+        text = _PARENTHETICAL.sub(" ", label)
+        text = cleaned = " ".join(_PUNCTUATION.sub(" ", text).split()).casefold()
+        stripped = True
+        while stripped:
+            stripped = False
+            for qualifier in self.qualifiers:
+                if text.startswith(qualifier + " "):
+                    text, stripped = text[len(qualifier) + 1:], True
+                elif text.endswith(" " + qualifier):
+                    text, stripped = text[:-len(qualifier) - 1], True
+        # A label made only of qualifiers or punctuation keeps its plain form
+        if text in self.qualifiers:
+            return cleaned
+        return text or normalize_label(label)
+
+    @staticmethod
+    def _shingles(key: str) -> set:
+        padded = f" {key} "
+        return {padded[i:i + 3] for i in range(max(1, len(padded) - 2))}
+
+    def _signature(self, shingles) -> list:
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+
+    def _similar(self, first, second) -> bool:
+        (first_shingles, first_markers), (second_shingles, second_markers) = first, second
+        if first_markers != second_markers:
+            return False
+        intersection = len(first_shingles & second_shingles)
+        return intersection / (len(first_shingles) + len(second_shingles) - intersection) >= self.threshold
+
+    def resolve(self, mentions) -> AliasTable:
+        """
+        Clusters the surface forms of an iterable of node mentions.
+
+        Args:
+            mentions: Node labels; repeated labels count as more mentions and
+                      make a form more likely to become canonical.
+
+        Returns:
+            An `AliasTable` covering every distinct surface form.
+        """
+        # Distinct surface forms (ignoring case and whitespace) with counts
+        forms = {}
+        for label in mentions:
+            normalized = normalize_label(label)
+            entry = forms.get(normalized)
+            if entry is None:
+                forms[normalized] = [" ".join(label.split()), 1, len(forms)]
+            else:
+                entry[1] += 1
+
+        # Stage 1: forms with the same key are the same entity
+        keys = {}
+        form_keys = []
+        for normalized, (surface, _, _) in forms.items():
+            key = self.key(surface)
+            form_keys.append(keys.setdefault(key, len(keys)))
+        key_list = list(keys)
+
+        # Stages 2 and 3: LSH blocking over distinct keys, verified merges
+        union_find = _UnionFind(len(key_list))
+        features = [(self._shingles(key), tuple(_MARKERS.findall(key))) for key in key_list]
+        rows = self.num_perm // self.bands
+        buckets = {}
+        for key_id, (shingles, markers) in enumerate(features):
+            signature = self._signature(shingles)
+            for band in range(self.bands):
+                # Keys with different markers never merge, so they need not share buckets
+                bucket = (band, markers, *signature[band * rows:(band + 1) * rows])
+                buckets.setdefault(bucket, []).append(key_id)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_bucket:
+                pairs = ((members[0], member) for member in members[1:])
+            else:
+                pairs = ((first, second) for i, first in enumerate(members) for second in members[i + 1:])
+            for first, second in pairs:
+                if union_find.find(first) != union_find.find(second) and self._similar(features[first], features[second]):
+                    union_find.union(first, second)
+
+        # Group surface forms by cluster; the most mentioned (then first seen) is canonical
+        clusters = {}
+        for (surface, count, order), key_id in zip(forms.values(), form_keys):
+            clusters.setdefault(union_find.find(key_id), []).append((-count, order, surface))
+        table = AliasTable()
+        for members in sorted(clusters.values(), key=lambda members: min(member[1] for member in members)):
+            members.sort()
+            table._add(members[0][2], [member[2] for member in sorted(members, key=lambda member: member[1])])
+        return table
+
+
+def resolve_edges(edges, resolver: EntityResolver = None, drop_self_loops: bool = True) -> Tuple[list, AliasTable]:
+    """
+    Rewrites edge dictionaries to canonical node labels.
+
+    Args:
+        edges: Edge dictionaries as returned by `execute_graph_generation`.
+        resolver: The `EntityResolver` to use, by default one with default
+                  settings.
+        drop_self_loops: Whether to drop edges whose ends merged into the
+                         same entity.
+
+    Returns:
+        A tuple of the rewritten, deduplicated edge dictionaries (in first
+        occurrence order, each with "from_id" and "to_id" entity IDs) and the
+        `AliasTable`.
+    """
+    edges = list(edges)
+    table = (resolver or EntityResolver()).resolve(
+        label for edge in edges for label in (edge["from"], edge["to"])
+    )
+    resolved = []
+    seen = set()
+    for edge in edges:
+        from_id, to_id = table.canonical_id(edge["from"]), table.canonical_id(edge["to"])
+        if drop_self_loops and from_id == to_id:
+            continue
+        key = (from_id, normalize_label(edge["relationship"]), to_id)
+        if key in seen:
+            continue
+        seen.add(key)
+        resolved.append({
+            "from": table.labels[from_id], "relationship": edge["relationship"], "to": table.labels[to_id],
+            "from_id": from_id, "to_id": to_id,
+        })
+    return resolved, table
+
+
+def resolve_graph(
+        graph: KnowledgeGraph, resolver: EntityResolver = None, drop_self_loops: bool = True,
+) -> Tuple[KnowledgeGraph, AliasTable]:
+    """
+    Merges the nodes of a `KnowledgeGraph` that name the same entity.
+
+    Edge counts are summed when several edges collapse into one, and each
+    node's mention count is its number of edge ends.
+
+    Returns:
+        A tuple of the resolved `KnowledgeGraph` and the `AliasTable`.
+    """
+    edges = list(graph.edges())
+    table = (resolver or EntityResolver()).resolve(
+        label for from_node, _, to_node in edges for label in (from_node, to_node)
+    )
+    resolved = KnowledgeGraph()
+    for from_node, relationship, to_node in edges:
+        from_label, to_label = table.canonical(from_node), table.canonical(to_node)
+        if drop_self_loops and normalize_label(from_label) == normalize_label(to_label):
+            continue
+        resolved.add_edge(from_label, relationship, to_label, count=graph.count(from_node, relationship, to_node))
+    return resolved, table
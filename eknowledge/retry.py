@@ -0,0 +1,111 @@
+import math
+import random
+import threading
+
+# Failure kinds passed to `RetryPolicy.delay`.
+TRANSPORT_ERROR = "transport"
+FORMAT_ERROR = "format"
+
+
+class RetryBudget:
+    """
+    A thread-safe cap on the total number of retries spent by one run.
+
+    Args:
+        limit: The maximum number of retries, or None for no cap.
+    """
+
+    def __init__(self, limit: int = None):
+        self.limit = limit
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def spend(self) -> bool:
+        """Takes one retry from the budget, returning False if none is left."""
+        with self._lock:
+            if self.limit is not None and self.spent >= self.limit:
+                return False
+            self.spent += 1
+            return True
+
+    @property
+    def exhausted(self) -> bool:
+        return self.limit is not None and self.spent >= self.limit
+
+
+class RetryPolicy:
+    """
+    Decides how often and how long to wait before retrying a chunk.
+
+    Transport errors (exceptions raised by the LLM call) back off
+    exponentially with jitter. Unparseable responses mean the backend is
+    healthy, so they are retried after `format_delay`, immediately by
+    default, optionally with a corrective follow-up message. Nothing waits
+    after a successful response.
+
+    Args:
+        max_attempts: The maximum number of LLM calls per chunk.
+        base_delay: Seconds to wait after the first transport error.
+        max_delay: The upper bound for a single wait.
+        multiplier: The factor applied to the wait after each further
+                    transport error.
+        jitter: The fraction of each wait that is randomised (0 disables
+                jitter, 1 gives "full jitter").
+        format_delay: Seconds to wait after an unparseable response.
+        retry_budget: The maximum number of retries across a whole run, or
+                      None for no cap.
+        corrective_prompt: Whether to follow an unparseable response with a
+                           message restating the expected format instead of
+                           resending the original request.
+        seed: An optional seed for the jitter, for reproducible runs.
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 10,
+            base_delay: float = 0.75,
+            max_delay: float = 30.0,
+            multiplier: float = 2.0,
+            jitter: float = 0.5,
+            format_delay: float = 0.0,
+            retry_budget: int = None,
+            corrective_prompt: bool = False,
+            seed: int = None,
+    ):
+        if not isinstance(max_attempts, int) or max_attempts <= 0:
+            raise ValueError("max_attempts must be a positive integer.")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1.")
+        if retry_budget is not None and (not isinstance(retry_budget, int) or retry_budget < 0):
+            raise ValueError("retry_budget must be a non-negative integer.")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.format_delay = format_delay
+        self.retry_budget = retry_budget
+        self.corrective_prompt = corrective_prompt
+        self._random = random.Random(seed)
+
+    def delay(self, kind: str, failures: int) -> float:
+        """
+        Returns the seconds to wait before the next attempt.
+
+        Args:
+            kind: TRANSPORT_ERROR or FORMAT_ERROR.
+            failures: How many failures of this kind the chunk has had so far.
+        """
+        if kind != TRANSPORT_ERROR:
+            return self.format_delay
+        try:
+            growth = float(self.multiplier) ** (failures - 1)
+        except OverflowError:
+            # Long past max_delay; happens with thousands of attempts
+            growth = math.inf
+        delay = min(self.max_delay, self.base_delay * growth) if self.base_delay else 0.0
+        return delay * (1 - self.jitter * self._random.random())
+
+    def new_budget(self) -> RetryBudget:
+        """Creates the retry budget for one run."""
+        return RetryBudget(self.retry_budget)
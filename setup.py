@@ -11,10 +11,12 @@ setup(
     long_description_content_type='text/markdown',
     url='https://github.com/chigwell/eknowledge',
     packages=find_packages(),
-    install_requires=[
-        'langchain-core==0.3.51',
-        'langchain-ollama==0.3.0'
-    ],
+    install_requires=[],
+    extras_require={
+        'langchain': ['langchain-core==0.3.51'],
+        'ollama': ['langchain-core==0.3.51', 'langchain-ollama==0.3.0'],
+        'otel': ['opentelemetry-api'],
+    },
     classifiers=[
         'License :: OSI Approved :: MIT License',
         'Development Status :: 3 - Alpha',
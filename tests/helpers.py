@@ -0,0 +1,35 @@
+"""Shared fixtures for the test modules."""
+
+
+class MockLLMResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+def node_xml(from_node, relationship, to_node, source=None) -> str:
+    """Returns one <node> element as the LLM is prompted to emit it."""
+    source_tag = "" if source is None else f"<source>{source}</source>"
+    return (f"<node><from_node>{from_node}</from_node><relationship>{relationship}</relationship>"
+            f"<to_node>{to_node}</to_node>{source_tag}</node>")
+
+
+SUCCESS_RESPONSE = node_xml("A", "R", "B")
+SUCCESS_EDGES = [{"from": "A", "relationship": "R", "to": "B"}]
+
+
+class EchoLLM:
+    """
+    A picklable LLM relating the first word of each chunk to to_node, or to
+    the chunk's last word when to_node is None. Counts its calls.
+    """
+
+    model = "echo"
+
+    def __init__(self, to_node=None):
+        self.to_node = to_node
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        words = messages[1].content.split("======")[1].split()
+        return MockLLMResponse(content=node_xml(words[0], "R", self.to_node or words[-1]))
@@ -0,0 +1,98 @@
+import unittest
+from eknowledge import AdaptiveChunker, execute_graph_generation, iter_graph_generation
+from eknowledge.instrumentation import Event
+from .helpers import MockLLMResponse, node_xml
+
+
+class SizeSensitiveLLM:
+    """Answers with one edge per chunk, but fails to produce nodes for long chunks."""
+
+    def __init__(self, max_words):
+        self.max_words = max_words
+
+    def invoke(self, messages):
+        words = messages[1].content.split("======")[1].split()
+        if len(words) > self.max_words:
+            return MockLLMResponse("The text is too long, sorry.")
+        return MockLLMResponse(node_xml(words[0], "R", words[-1]))
+
+
+def chunk_end(edges=1, retries=0, llm_seconds=1.0, cached=False):
+    return Event("chunk_end", 1, "chunk 1", {
+        "index": 1, "total": "?", "words": 10, "edges": edges, "retries": retries, "success": True,
+        "cached": cached, "llm_seconds": llm_seconds, "sleep_seconds": 0.0,
+    }, 0.0)
+
+
+def format_failure():
+    return Event("attempt_failed", 1, "chunk 1", {
+        "reason": "format", "message": "", "attempt": 1, "max_attempts": 2,
+    }, 0.0)
+
+
+class TestAdaptiveController(unittest.TestCase):
+
+    def test_increases_while_yield_improves(self):
+        chunker = AdaptiveChunker(initial_size=100, step=10, window=2)
+        for edges in (4, 4, 6, 6):
+            chunker.on_event(chunk_end(edges=edges))
+        self.assertEqual([step.next_chunk_size for step in chunker.history], [110, 120])
+
+    def test_reverses_when_yield_drops(self):
+        chunker = AdaptiveChunker(initial_size=100, step=10, window=1)
+        for edges in (10, 5):
+            chunker.on_event(chunk_end(edges=edges))
+        self.assertEqual(chunker.chunk_size, 100)
+        self.assertEqual(chunker.history[-1].edges_per_second, 5.0)
+
+    def test_cuts_size_on_failures_and_latency(self):
+        chunker = AdaptiveChunker(initial_size=100, window=1, target_latency=2.0)
+        chunker.on_event(format_failure())
+        chunker.on_event(chunk_end(retries=1))
+        self.assertEqual(chunker.chunk_size, 50)
+        self.assertEqual(chunker.history[0].failure_rate, 0.5)
+        chunker.on_event(chunk_end(llm_seconds=3.0))
+        self.assertEqual(chunker.chunk_size, 25)
+        chunker.on_event(chunk_end(llm_seconds=3.0))
+        self.assertEqual(chunker.chunk_size, 20)
+
+    def test_ignores_cached_chunks(self):
+        chunker = AdaptiveChunker(window=1)
+        chunker.on_event(chunk_end(cached=True))
+        self.assertEqual(chunker.history, [])
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesRegex(ValueError, "initial_size must be between min_size and max_size."):
+            AdaptiveChunker(initial_size=10, min_size=20)
+        with self.assertRaisesRegex(ValueError, "window must be a positive integer."):
+            AdaptiveChunker(window=0)
+
+
+class TestAdaptiveGeneration(unittest.TestCase):
+
+    def test_converges_below_failure_threshold(self):
+        # tolerance=1 never reverses on throughput, which is measured in wall time and would make this flaky
+        chunker = AdaptiveChunker(initial_size=100, min_size=10, step=5, window=1, tolerance=1.0)
+        text = " ".join(f"w{i}" for i in range(1000))
+        results = list(iter_graph_generation(text=text, llm=SizeSensitiveLLM(60), chunker=chunker, max_retries=1))
+        self.assertEqual(" ".join(result.chunk for result in results).split(), text.split())
+        self.assertFalse(results[0].success)
+        self.assertEqual(len(results[1].chunk.split()), 50)
+        # Probing above the threshold fails occasionally and is cut back at once
+        self.assertLess(sum(not result.success for result in results), len(results) * 0.3)
+        self.assertTrue(all(step.next_chunk_size <= 65 for step in chunker.history))
+
+    def test_lazy_split_uses_current_size(self):
+        chunker = AdaptiveChunker(initial_size=2, min_size=1)
+        chunks = chunker.split("a b c d e")
+        self.assertEqual(next(chunks), "a b")
+        chunker.chunk_size = 3
+        self.assertEqual(list(chunks), ["c d e"])
+
+    def test_execute_accepts_adaptive_chunker(self):
+        edges = execute_graph_generation(text="a b c", llm=SizeSensitiveLLM(10), chunker=AdaptiveChunker(initial_size=20))
+        self.assertEqual(edges, [{"from": "a", "relationship": "R", "to": "c"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
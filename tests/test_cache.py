@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from eknowledge import execute_graph_generation, ResponseCache, SQLiteCacheBackend, make_cache_key
+from .helpers import MockLLMResponse, SUCCESS_RESPONSE, node_xml
+
+
+class TestMakeCacheKey(unittest.TestCase):
+
+    def test_key_is_stable(self):
+        key = make_cache_key("chunk", "system", "user", ["REL1"], "model")
+        self.assertEqual(key, make_cache_key("chunk", "system", "user", ["REL1"], "model"))
+
+    def test_key_depends_on_every_part(self):
+        base = make_cache_key("chunk", "system", "user", ["REL1"], "model")
+        self.assertNotEqual(base, make_cache_key("other", "system", "user", ["REL1"], "model"))
+        self.assertNotEqual(base, make_cache_key("chunk", "other", "user", ["REL1"], "model"))
+        self.assertNotEqual(base, make_cache_key("chunk", "system", "other", ["REL1"], "model"))
+        self.assertNotEqual(base, make_cache_key("chunk", "system", "user", ["REL2"], "model"))
+        self.assertNotEqual(base, make_cache_key("chunk", "system", "user", ["REL1"], "other"))
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache()
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", [{"from": "A", "relationship": "R", "to": "B"}])
+        self.assertEqual(cache.get("key"), [{"from": "A", "relationship": "R", "to": "B"}])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", [])
+        cache.set("b", [])
+        cache.get("a")
+        cache.set("c", [])
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_returned_edges_are_copies(self):
+        cache = ResponseCache()
+        cache.set("key", [{"from": "A", "relationship": "R", "to": "B"}])
+        cache.get("key")[0]["from"] = "changed"
+        self.assertEqual(cache.get("key")[0]["from"], "A")
+
+    def test_invalid_max_entries(self):
+        with self.assertRaisesRegex(ValueError, "max_entries must be a positive integer."):
+            ResponseCache(max_entries=0)
+
+
+class TestSQLiteCacheBackend(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_persists_between_instances(self):
+        backend = SQLiteCacheBackend(self.path)
+        backend.set("key", [{"from": "A", "relationship": "R", "to": "B"}])
+        backend.close()
+
+        cache = ResponseCache(backend=SQLiteCacheBackend(self.path))
+        self.assertEqual(cache.get("key"), [{"from": "A", "relationship": "R", "to": "B"}])
+        self.assertEqual(cache.hits, 1)
+        cache.backend.close()
+
+    def test_size_based_eviction(self):
+        backend = SQLiteCacheBackend(self.path, max_bytes=120)
+        edges = [{"from": "A", "relationship": "R", "to": "B"}]
+        for key in ("a", "b", "c", "d"):
+            backend.set(key, edges)
+        self.assertLess(len(backend), 4)
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.get("d"), edges)
+        backend.close()
+
+
+class TestGenerationWithCache(unittest.TestCase):
+
+    def test_cache_hit_skips_llm(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=SUCCESS_RESPONSE)
+        cache = ResponseCache()
+
+        first = execute_graph_generation(text="same words", llm=llm, cache=cache, sleep_time=0)
+        second = execute_graph_generation(text="same words", llm=llm, cache=cache, sleep_time=0)
+
+        self.assertEqual(first, second)
+        self.assertEqual(llm.invoke.call_count, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_repeated_chunks_within_a_document(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=SUCCESS_RESPONSE)
+        cache = ResponseCache()
+
+        graph = execute_graph_generation(text="boiler plate boiler plate", llm=llm, chunk_size=2, cache=cache, sleep_time=0)
+
+        self.assertEqual(len(graph), 2)
+        self.assertEqual(llm.invoke.call_count, 1)
+
+    def test_failed_chunks_are_not_cached(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content="no nodes")
+        cache = ResponseCache()
+
+        execute_graph_generation(text="words", llm=llm, cache=cache, max_retries=1, sleep_time=0)
+
+        self.assertEqual(len(cache), 0)
+
+    def test_packed_sections_are_not_reused_unpacked(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=node_xml("A", "R", "B", source=1))
+        cache = ResponseCache()
+
+        packed = execute_graph_generation(text="one two three", llm=llm, chunk_size=1, pack_size=3, cache=cache)
+        single = execute_graph_generation(text="two", llm=llm, cache=cache)
+
+        self.assertEqual(packed, [{"from": "A", "relationship": "R", "to": "B"}])
+        self.assertEqual(single, [{"from": "A", "relationship": "R", "to": "B"}])
+        self.assertEqual(llm.invoke.call_count, 2)
+
+    def test_packed_runs_reuse_packed_and_unpacked_entries(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=node_xml("A", "R", "B", source=1))
+        cache = ResponseCache()
+
+        execute_graph_generation(text="one", llm=llm, cache=cache)
+        execute_graph_generation(text="two three", llm=llm, chunk_size=1, pack_size=2, cache=cache)
+        llm.invoke.reset_mock()
+        execute_graph_generation(text="one two three", llm=llm, chunk_size=1, pack_size=3, cache=cache)
+
+        llm.invoke.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
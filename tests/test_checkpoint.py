@@ -0,0 +1,95 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+from eknowledge import CheckpointJournal, execute_graph_generation, iter_graph_generation
+from .helpers import MockLLMResponse, SUCCESS_RESPONSE
+
+
+EDGES = [{"from": "A", "relationship": "R", "to": "B"}]
+
+
+class TestCheckpointJournal(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_records_survive_reopening(self):
+        with CheckpointJournal(self.path) as journal:
+            journal.record("key", 1, EDGES)
+            self.assertIn("key", journal)
+
+        with CheckpointJournal(self.path) as journal:
+            self.assertEqual(journal.get("key"), EDGES)
+            self.assertIsNone(journal.get("missing"))
+            self.assertEqual(len(journal), 1)
+
+    def test_torn_last_line_is_ignored(self):
+        with CheckpointJournal(self.path) as journal:
+            journal.record("good", 1, EDGES)
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write('{"key": "torn", "edges": [{"from"')
+
+        with CheckpointJournal(self.path) as journal:
+            self.assertEqual(len(journal), 1)
+            journal.record("after", 2, EDGES)
+
+        with CheckpointJournal(self.path) as journal:
+            self.assertEqual(journal.get("after"), EDGES)
+            self.assertNotIn("torn", journal)
+
+    def test_concurrent_records(self):
+        journal = CheckpointJournal(self.path)
+
+        def worker(offset):
+            for i in range(50):
+                journal.record(f"{offset}-{i}", i, EDGES * 20)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        journal.close()
+
+        with CheckpointJournal(self.path) as reloaded:
+            self.assertEqual(len(reloaded), 200)
+
+
+class TestResumeFromCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_rerun_skips_finished_chunks(self):
+        llm = MagicMock()
+        llm.invoke.side_effect = [
+            MockLLMResponse(content=SUCCESS_RESPONSE),
+            MockLLMResponse(content="no nodes"),
+        ]
+        with CheckpointJournal(self.path) as journal:
+            first = list(iter_graph_generation(
+                text="one two", llm=llm, chunk_size=1, max_retries=1, checkpoint=journal))
+        self.assertEqual([result.success for result in first], [True, False])
+
+        llm.invoke.side_effect = None
+        llm.invoke.return_value = MockLLMResponse(content=SUCCESS_RESPONSE)
+        with CheckpointJournal(self.path) as journal:
+            graph = execute_graph_generation(text="one two", llm=llm, chunk_size=1, checkpoint=journal)
+
+        self.assertEqual(graph, EDGES * 2)
+        # Only the unfinished second chunk was sent again
+        self.assertEqual(llm.invoke.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,136 @@
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from eknowledge import iter_word_chunks, split_text_by_words, execute_graph_generation
+from eknowledge import SentenceChunker, WordChunker, estimate_tokens, prompt_overhead_tokens
+from eknowledge import chunking
+from .helpers import MockLLMResponse, SUCCESS_RESPONSE
+
+
+class TestIterWordChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.text = "Word1  Word2   Word3 \n Word4\tWord5 Word6 Word7"
+
+    def test_string_matches_split_text_by_words(self):
+        self.assertEqual(list(iter_word_chunks(self.text, 3)), split_text_by_words(self.text, 3))
+
+    def test_iterable_of_lines(self):
+        lines = ["Word1 Word2\n", "Word3\n", "\n", "Word4 Word5"]
+        self.assertEqual(list(iter_word_chunks(lines, 2)), ["Word1 Word2", "Word3 Word4", "Word5"])
+
+    def test_file_object_with_words_across_blocks(self):
+        original_block_size = chunking.READ_BLOCK_SIZE
+        chunking.READ_BLOCK_SIZE = 4
+        try:
+            chunks = list(iter_word_chunks(io.StringIO(self.text), 3))
+        finally:
+            chunking.READ_BLOCK_SIZE = original_block_size
+        self.assertEqual(chunks, split_text_by_words(self.text, 3))
+
+    def test_path_and_mmap(self):
+        handle, path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            file.write("Zoë  naïve\ncafé words")
+        try:
+            expected = ["Zoë naïve", "café words"]
+            self.assertEqual(list(iter_word_chunks(pathlib.Path(path), 2)), expected)
+            self.assertEqual(list(iter_word_chunks(pathlib.Path(path), 2, use_mmap=True)), expected)
+        finally:
+            os.remove(path)
+
+    def test_empty_file_with_mmap(self):
+        handle, path = tempfile.mkstemp(suffix=".txt")
+        os.close(handle)
+        try:
+            self.assertEqual(list(iter_word_chunks(pathlib.Path(path), 2, use_mmap=True)), [])
+        finally:
+            os.remove(path)
+
+    def test_chunks_are_lazy(self):
+        def lines():
+            yield "one two"
+            raise AssertionError("read past the first chunk")
+
+        chunks = iter_word_chunks(lines(), 2)
+        self.assertEqual(next(chunks), "one two")
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaisesRegex(ValueError, "chunk_size must be a positive integer."):
+            iter_word_chunks(["text"], 0)
+
+    def test_invalid_source(self):
+        with self.assertRaises(TypeError):
+            iter_word_chunks(12345, 5)
+        with self.assertRaises(TypeError):
+            list(iter_word_chunks([1, 2], 5))
+
+
+class TestSentenceChunker(unittest.TestCase):
+
+    def setUp(self):
+        self.text = "Alice knows Bob. Bob works at Acme! Acme makes rockets. Rockets need fuel?"
+
+    def test_sentences_are_kept_whole(self):
+        chunks = list(SentenceChunker(max_tokens=9).split(self.text))
+        self.assertEqual(chunks, ["Alice knows Bob. Bob works at Acme!", "Acme makes rockets.", "Rockets need fuel?"])
+        for chunk in chunks:
+            self.assertLessEqual(estimate_tokens(chunk), 9)
+
+    def test_overlap_repeats_trailing_sentences(self):
+        chunks = list(SentenceChunker(max_tokens=10, overlap=1).split(self.text))
+        self.assertEqual(chunks, [
+            "Alice knows Bob. Bob works at Acme!",
+            "Bob works at Acme! Acme makes rockets.",
+            "Acme makes rockets. Rockets need fuel?",
+        ])
+
+    def test_long_sentence_is_cut_by_words(self):
+        chunks = list(SentenceChunker(max_tokens=2).split("one two three four five"))
+        self.assertEqual(chunks, ["one two", "three", "four", "five"])
+
+    def test_budget_from_context_window(self):
+        overhead = prompt_overhead_tokens(relations=["REL1"])
+        chunker = SentenceChunker(context_window=overhead + 150, reserve_output=50, relations=["REL1"])
+        self.assertEqual(chunker.max_tokens, 100)
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesRegex(ValueError, "Either max_tokens or context_window must be provided."):
+            SentenceChunker()
+        with self.assertRaisesRegex(ValueError, "max_tokens must be a positive integer."):
+            SentenceChunker(context_window=10)
+        with self.assertRaisesRegex(ValueError, "overlap must be a non-negative integer."):
+            SentenceChunker(max_tokens=10, overlap=-1)
+
+    def test_word_chunker(self):
+        self.assertEqual(list(WordChunker(2).split("a b c")), ["a b", "c"])
+
+
+class TestGenerationFromStream(unittest.TestCase):
+
+    def test_generation_accepts_file_object(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=SUCCESS_RESPONSE)
+
+        graph = execute_graph_generation(
+            text=io.StringIO("one two three four five"), llm=llm, chunk_size=2, sleep_time=0)
+
+        self.assertEqual(len(graph), 3)
+        self.assertEqual(llm.invoke.call_count, 3)
+
+    def test_generation_with_chunker(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=SUCCESS_RESPONSE)
+
+        graph = execute_graph_generation(
+            text="First sentence here. Second one.", llm=llm, chunker=SentenceChunker(max_tokens=5), sleep_time=0)
+
+        self.assertEqual(len(graph), 2)
+        self.assertIn("Second one.", llm.invoke.call_args_list[1][0][0][1].content)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import MagicMock
+from eknowledge import AdaptiveChunker, KnowledgeGraph, execute_corpus_graph_generation, iter_corpus_graph_generation
+from eknowledge.corpus import _round_robin_jobs
+from .helpers import EchoLLM, MockLLMResponse, node_xml
+
+
+class TestCorpusGraphGeneration(unittest.TestCase):
+
+    def setUp(self):
+        self.documents = [
+            ("long", "a1 a2 a3 a4"),
+            ("short", "b1"),
+            ("empty", ""),
+            ("medium", "c1 c2"),
+        ]
+
+    def test_execute_returns_graph_per_document(self):
+        graphs = execute_corpus_graph_generation(self.documents, llm=EchoLLM("X"), chunk_size=1)
+
+        self.assertEqual(set(graphs), {"long", "short", "empty", "medium"})
+        self.assertEqual([edge["from"] for edge in graphs["long"]], ["a1", "a2", "a3", "a4"])
+        self.assertEqual(graphs["empty"], [])
+
+    def test_chunks_are_scheduled_round_robin(self):
+        jobs = list(_round_robin_jobs(self.documents, 1, None, active_documents=4))
+
+        self.assertEqual(jobs, [
+            ("long", [(1, "a1")]), ("short", [(1, "b1")]), ("empty", None), ("medium", [(1, "c1")]),
+            ("long", [(2, "a2")]), ("short", None), ("medium", [(2, "c2")]),
+            ("long", [(3, "a3")]), ("medium", None),
+            ("long", [(4, "a4")]),
+            ("long", None),
+        ])
+
+    def test_jobs_pack_consecutive_chunks(self):
+        jobs = list(_round_robin_jobs(self.documents, 1, None, active_documents=4, pack_size=3))
+
+        self.assertEqual(jobs[0], ("long", [(1, "a1"), (2, "a2"), (3, "a3")]))
+        self.assertIn(("long", [(4, "a4")]), jobs)
+
+    def test_active_documents_are_bounded(self):
+        jobs = list(_round_robin_jobs(self.documents, 1, None, active_documents=2))
+
+        self.assertEqual([job[0] for job in jobs[:4]], ["long", "short", "long", "short"])
+        self.assertEqual(len(jobs), 11)
+
+    def test_documents_stream_with_provenance(self):
+        results = iter_corpus_graph_generation(self.documents, llm=EchoLLM("X"), chunk_size=2, max_concurrency=3)
+        by_id = {result.doc_id: result for result in results}
+
+        self.assertEqual(by_id["long"].edges_with_provenance(), [
+            {"from": "a1", "relationship": "R", "to": "X", "doc_id": "long", "chunk": 1},
+            {"from": "a3", "relationship": "R", "to": "X", "doc_id": "long", "chunk": 2},
+        ])
+        self.assertEqual([result.index for result in by_id["medium"].chunks], [1])
+
+    def test_process_sharding(self):
+        graphs = execute_corpus_graph_generation(self.documents, llm=EchoLLM("X"), chunk_size=1, processes=2)
+
+        self.assertEqual([edge["from"] for edge in graphs["medium"]], ["c1", "c2"])
+        self.assertEqual(len(graphs), 4)
+
+    def test_packed_requests(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=node_xml("A", "R", "B", source=2))
+
+        results = {result.doc_id: result for result in iter_corpus_graph_generation(
+            self.documents, llm=llm, chunk_size=1, pack_size=4)}
+
+        # One request per non-empty document
+        self.assertEqual(llm.invoke.call_count, 3)
+        self.assertEqual([result.index for result in results["long"].chunks], [1, 2, 3, 4])
+        self.assertEqual([len(result.edges) for result in results["long"].chunks], [0, 1, 0, 0])
+
+    def test_execute_as_graph(self):
+        graphs = execute_corpus_graph_generation(self.documents, llm=EchoLLM("X"), chunk_size=1, as_graph=True)
+
+        self.assertIsInstance(graphs["long"], KnowledgeGraph)
+        self.assertEqual(len(graphs["long"]), 4)
+
+    def test_adaptive_chunker_receives_events(self):
+        chunker = AdaptiveChunker(initial_size=1, min_size=1, window=2)
+        execute_corpus_graph_generation(self.documents, llm=EchoLLM("X"), chunker=chunker)
+
+        self.assertTrue(chunker.history)
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesRegex(ValueError, "LLM object must be provided."):
+            list(iter_corpus_graph_generation(self.documents))
+        with self.assertRaisesRegex(ValueError, "processes must be a positive integer."):
+            list(iter_corpus_graph_generation(self.documents, llm=EchoLLM("X"), processes=0))
+        with self.assertRaisesRegex(ValueError, "cannot be shared across processes"):
+            list(iter_corpus_graph_generation(self.documents, llm=EchoLLM("X"), processes=2, cache=object()))
+        with self.assertRaisesRegex(ValueError, "pack_size must be a positive integer."):
+            list(iter_corpus_graph_generation(self.documents, llm=EchoLLM("X"), pack_size=0))
+
+    def test_invalid_client_without_processes(self):
+        with self.assertRaisesRegex(TypeError, "LLM object must expose invoke"):
+            list(iter_corpus_graph_generation(self.documents, llm=object()))
+
+    def test_unknown_option(self):
+        with self.assertRaises(TypeError):
+            list(iter_corpus_graph_generation(self.documents, llm=EchoLLM("X"), unknown_option=True))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -1,6 +1,9 @@
+import asyncio
+import time
 import unittest
-from unittest.mock import MagicMock, patch, call
-from eknowledge import split_text_by_words, execute_graph_generation, RELATIONS, SYSTEM_PROMPT, USER_PROMPT
+from unittest.mock import AsyncMock, MagicMock, patch, call
+from eknowledge import split_text_by_words, execute_graph_generation, aexecute_graph_generation, iter_graph_generation, aiter_graph_generation, RELATIONS, SYSTEM_PROMPT, USER_PROMPT
+from eknowledge import ResponseCache
 
 try:
     from langchain_core.messages import HumanMessage, SystemMessage
@@ -268,5 +271,257 @@ class TestExecuteGraphGeneration(unittest.TestCase):
         mock_print.assert_any_call("Nodes successfully processed in chunk 1/1.")
 
 
+    def test_concurrent_chunks_keep_order(self):
+        """Test that edges come back in chunk order when chunks run on a thread pool."""
+        text = "w1 w2 w3 w4 w5 w6 w7 w8"
+
+        def respond(messages):
+            # Slow down early chunks so they finish after later ones
+            chunk = messages[1].content
+            first_word = chunk.split(":")[1].split()[0]
+            time.sleep(0.02 * (8 - int(first_word[1:])))
+            return MockLLMResponse(
+                content=f"<node><from_node>{first_word}</from_node><relationship>R</relationship><to_node>X</to_node></node>")
+
+        self.mock_llm.invoke.side_effect = respond
+
+        result_graph = execute_graph_generation(
+            text=text,
+            llm=self.mock_llm,
+            chunk_size=1,
+            user_prompt=self.default_user_prompt,
+            sleep_time=0,
+            max_concurrency=4
+        )
+
+        self.assertEqual([edge["from"] for edge in result_graph], [f"w{i}" for i in range(1, 9)])
+        self.assertEqual(self.mock_llm.invoke.call_count, 8)
+
+    def test_concurrent_chunks_retry_independently(self):
+        """Test that per-chunk retries still apply when running concurrently."""
+        success_response = "<node><from_node>A</from_node><relationship>R</relationship><to_node>B</to_node></node>"
+        self.mock_llm.invoke.side_effect = [
+            ValueError("Simulated LLM API error"),
+            MockLLMResponse(content=success_response),
+            MockLLMResponse(content=success_response),
+        ]
+
+        result_graph = execute_graph_generation(
+            text="one two",
+            llm=self.mock_llm,
+            chunk_size=1,
+            sleep_time=0,
+            max_concurrency=2
+        )
+
+        self.assertEqual(result_graph, [{"from": "A", "relationship": "R", "to": "B"}] * 2)
+        self.assertEqual(self.mock_llm.invoke.call_count, 3)
+
+    def test_invalid_max_concurrency(self):
+        with self.assertRaisesRegex(ValueError, "max_concurrency must be a positive integer."):
+            execute_graph_generation(text="Some text", llm=self.mock_llm, max_concurrency=0)
+
+    def test_zero_max_retries(self):
+        """Test that max_retries=0 returns no edges without calling the LLM."""
+        self.assertEqual(execute_graph_generation(text="Some text", llm=self.mock_llm, max_retries=0), [])
+        self.mock_llm.invoke.assert_not_called()
+
+    def test_invalid_max_retries(self):
+        with self.assertRaisesRegex(ValueError, "max_retries must be a non-negative integer."):
+            execute_graph_generation(text="Some text", llm=self.mock_llm, max_retries=-1)
+
+
+
+class TestIterGraphGeneration(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_llm = MagicMock()
+        self.success_response = "<node><from_node>A</from_node><relationship>R</relationship><to_node>B</to_node></node>"
+
+    def test_yields_one_result_per_chunk(self):
+        self.mock_llm.invoke.side_effect = [
+            MockLLMResponse(content=self.success_response),
+            ValueError("Simulated LLM API error"),
+            MockLLMResponse(content=self.success_response),
+        ]
+
+        results = list(iter_graph_generation(
+            text="one two three four", llm=self.mock_llm, chunk_size=2, sleep_time=0))
+
+        self.assertEqual([result.index for result in results], [1, 2])
+        self.assertEqual([result.chunk for result in results], ["one two", "three four"])
+        self.assertEqual([result.retries for result in results], [0, 1])
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(results[0].edges, [{"from": "A", "relationship": "R", "to": "B"}])
+
+    def test_results_are_produced_lazily(self):
+        self.mock_llm.invoke.return_value = MockLLMResponse(content=self.success_response)
+
+        results = iter_graph_generation(text="one two three", llm=self.mock_llm, chunk_size=1, sleep_time=0)
+        first = next(results)
+
+        self.assertEqual(first.index, 1)
+        self.assertEqual(self.mock_llm.invoke.call_count, 1)
+
+    def test_failed_chunk_is_reported(self):
+        self.mock_llm.invoke.return_value = MockLLMResponse(content="nothing")
+
+        result, = iter_graph_generation(text="words", llm=self.mock_llm, max_retries=2, sleep_time=0)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.edges, [])
+        self.assertEqual(result.retries, 2)
+
+
+
+class TestPromptPacking(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_llm = MagicMock()
+
+    def test_chunks_share_one_request(self):
+        self.mock_llm.invoke.return_value = MockLLMResponse(content="""
+        <nodes>
+        <node><from_node>A</from_node><relationship>R</relationship><to_node>B</to_node><source>2</source></node>
+        <node><from_node>C</from_node><relationship>R</relationship><to_node>D</to_node><source>1</source></node>
+        <node><from_node>E</from_node><relationship>R</relationship><to_node>F</to_node></node>
+        </nodes>
+        """)
+
+        results = list(iter_graph_generation(
+            text="one two three four five", llm=self.mock_llm, chunk_size=1, pack_size=3, sleep_time=0))
+
+        self.assertEqual(self.mock_llm.invoke.call_count, 2)
+        packed_message = self.mock_llm.invoke.call_args_list[0][0][0][1].content
+        self.assertIn('<section id="1">\none\n</section>', packed_message)
+        self.assertIn('<section id="3">\nthree\n</section>', packed_message)
+        self.assertEqual([result.index for result in results], [1, 2, 3, 4, 5])
+        self.assertEqual([edge["from"] for edge in results[0].edges], ["C", "E"])
+        self.assertEqual([edge["from"] for edge in results[1].edges], ["A"])
+        self.assertEqual(results[2].edges, [])
+        self.assertTrue(all(result.success for result in results))
+
+    def test_untagged_nodes_are_not_cached_for_other_sections(self):
+        self.mock_llm.invoke.return_value = MockLLMResponse(
+            content="<node><from_node>A</from_node><relationship>R</relationship><to_node>B</to_node></node>")
+        cache = ResponseCache()
+
+        results = list(iter_graph_generation(
+            text="one two three", llm=self.mock_llm, chunk_size=1, pack_size=3, cache=cache, sleep_time=0))
+
+        self.assertEqual([len(result.edges) for result in results], [1, 0, 0])
+        self.assertEqual([result.success for result in results], [True, False, False])
+        self.assertEqual(len(cache), 0)
+
+        list(iter_graph_generation(
+            text="one two three", llm=self.mock_llm, chunk_size=1, pack_size=3, cache=cache, sleep_time=0))
+        self.assertEqual(self.mock_llm.invoke.call_count, 2)
+
+    def test_compact_relations(self):
+        self.mock_llm.invoke.return_value = MockLLMResponse(
+            content="<node><from_node>A</from_node><relationship>R</relationship><to_node>B</to_node></node>")
+
+        execute_graph_generation(
+            text="words", llm=self.mock_llm, relations=["is_a", "part_of"], compact_relations=True)
+
+        user_message = self.mock_llm.invoke.call_args[0][0][1].content
+        self.assertIn("is_a, part_of", user_message)
+        self.assertNotIn("['is_a'", user_message)
+
+    def test_invalid_pack_size(self):
+        with self.assertRaisesRegex(ValueError, "pack_size must be a positive integer."):
+            execute_graph_generation(text="Some text", llm=self.mock_llm, pack_size=0)
+
+    def test_custom_packed_user_prompt(self):
+        self.mock_llm.invoke.return_value = MockLLMResponse(
+            content="<node><from_node>A</from_node><relationship>R</relationship><to_node>B</to_node><source>1</source></node>")
+
+        execute_graph_generation(
+            text="one two", llm=self.mock_llm, chunk_size=1, pack_size=2,
+            user_prompt="Single: {text} {relationships}", packed_user_prompt="Packed: {text} {relationships}")
+
+        self.assertEqual(self.mock_llm.invoke.call_count, 1)
+        self.assertTrue(self.mock_llm.invoke.call_args[0][0][1].content.startswith("Packed: "))
+
+    def test_custom_user_prompt_requires_packed_user_prompt(self):
+        with self.assertRaisesRegex(ValueError, "packed_user_prompt"):
+            execute_graph_generation(text="one two", llm=self.mock_llm, pack_size=2, user_prompt="{text} {relationships}")
+        self.mock_llm.invoke.assert_not_called()
+
+
+
+class TestAsyncExecuteGraphGeneration(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.mock_llm = MagicMock()
+        self.mock_llm.ainvoke = AsyncMock()
+        self.success_response = "<node><from_node>A</from_node><relationship>R</relationship><to_node>B</to_node></node>"
+
+    async def test_no_llm_provided(self):
+        with self.assertRaisesRegex(ValueError, "LLM object must be provided."):
+            await aexecute_graph_generation(text="Some text", llm=None)
+
+    async def test_single_chunk_success(self):
+        self.mock_llm.ainvoke.return_value = MockLLMResponse(content=self.success_response)
+
+        result_graph = await aexecute_graph_generation(text="A relates to B", llm=self.mock_llm, sleep_time=0)
+
+        self.assertEqual(result_graph, [{"from": "A", "relationship": "R", "to": "B"}])
+        self.mock_llm.ainvoke.assert_awaited_once()
+        self.mock_llm.invoke.assert_not_called()
+
+    async def test_error_then_success(self):
+        self.mock_llm.ainvoke.side_effect = [
+            ValueError("Simulated LLM API error"),
+            MockLLMResponse(content=self.success_response),
+        ]
+
+        result_graph = await aexecute_graph_generation(
+            text="Some text", llm=self.mock_llm, max_retries=3, sleep_time=0)
+
+        self.assertEqual(result_graph, [{"from": "A", "relationship": "R", "to": "B"}])
+        self.assertEqual(self.mock_llm.ainvoke.await_count, 2)
+
+    async def test_max_retries_exceeded(self):
+        self.mock_llm.ainvoke.return_value = MockLLMResponse(content="nothing here")
+
+        result_graph = await aexecute_graph_generation(
+            text="Some text", llm=self.mock_llm, max_retries=2, sleep_time=0)
+
+        self.assertEqual(result_graph, [])
+        self.assertEqual(self.mock_llm.ainvoke.await_count, 2)
+
+    async def test_concurrency_is_bounded_and_ordered(self):
+        in_flight = 0
+        peak = 0
+
+        async def respond(messages):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            word = messages[1].content.split("======")[1].split()[0]
+            return MockLLMResponse(
+                content=f"<node><from_node>{word}</from_node><relationship>R</relationship><to_node>X</to_node></node>")
+
+        self.mock_llm.ainvoke.side_effect = respond
+
+        result_graph = await aexecute_graph_generation(
+            text="w1 w2 w3 w4 w5 w6", llm=self.mock_llm, chunk_size=1, sleep_time=0, max_concurrency=2)
+
+        self.assertEqual([edge["from"] for edge in result_graph], ["w1", "w2", "w3", "w4", "w5", "w6"])
+        self.assertEqual(peak, 2)
+
+
+    async def test_aiter_yields_results_in_order(self):
+        self.mock_llm.ainvoke.return_value = MockLLMResponse(content=self.success_response)
+
+        indexes = [result.index async for result in aiter_graph_generation(
+            text="one two three", llm=self.mock_llm, chunk_size=1, sleep_time=0, max_concurrency=2)]
+
+        self.assertEqual(indexes, [1, 2, 3])
+
+
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file
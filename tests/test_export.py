@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+from eknowledge import (
+    BinaryGraphReader, BinaryWriter, ChunkResult, CsvWriter, GraphMLWriter, JsonlWriter, KnowledgeGraph,
+    NTriplesWriter, open_writer,
+)
+
+EDGES = [
+    {"from": "Python", "relationship": "is_a", "to": "Language"},
+    {"from": "Guido <van>", "relationship": "created", "to": "Python"},
+    {"from": "Zürich", "relationship": "located_in", "to": "Switzerland"},
+]
+
+
+class TestTextWriters(unittest.TestCase):
+
+    def test_jsonl(self):
+        buffer = io.StringIO()
+        with JsonlWriter(buffer) as writer:
+            self.assertEqual(writer.write_edges(EDGES), 3)
+        self.assertEqual([json.loads(line) for line in buffer.getvalue().splitlines()], EDGES)
+
+    def test_csv(self):
+        buffer = io.StringIO()
+        with CsvWriter(buffer) as writer:
+            writer.write_edges(EDGES)
+        rows = list(csv.DictReader(io.StringIO(buffer.getvalue())))
+        self.assertEqual([dict(row) for row in rows], EDGES)
+
+    def test_graphml_declares_each_node_once(self):
+        buffer = io.StringIO()
+        with GraphMLWriter(buffer) as writer:
+            writer.write_edges(EDGES)
+        namespace = {"g": "http://graphml.graphdrawing.org/xmlns"}
+        root = ElementTree.fromstring(buffer.getvalue())
+        labels = [data.text for data in root.findall("g:graph/g:node/g:data", namespace)]
+        self.assertEqual(labels, ["Python", "Language", "Guido <van>", "Zürich", "Switzerland"])
+        self.assertEqual(len(root.findall("g:graph/g:edge", namespace)), 3)
+
+    def test_ntriples(self):
+        buffer = io.StringIO()
+        with NTriplesWriter(buffer, base_iri="http://example.org/") as writer:
+            writer.write_edges(EDGES[:2])
+        lines = buffer.getvalue().splitlines()
+        self.assertIn(
+            "<http://example.org/node/Python> <http://example.org/relation/is_a> "
+            "<http://example.org/node/Language> .", lines)
+        self.assertIn(
+            '<http://example.org/node/Guido%20%3Cvan%3E> <http://www.w3.org/2000/01/rdf-schema#label> '
+            '"Guido <van>" .', lines)
+        self.assertEqual(len(lines), 5)
+
+    def test_write_results_and_graph(self):
+        buffer = io.StringIO()
+        with JsonlWriter(buffer) as writer:
+            writer.write_results([ChunkResult(1, "a", EDGES[:2], 0, True), ChunkResult(2, "b", EDGES[2:], 0, True)])
+            writer.write_graph(KnowledgeGraph.from_edges(EDGES + EDGES))
+        self.assertEqual(len(buffer.getvalue().splitlines()), 6)
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.ekg")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        with BinaryWriter(self.path) as writer:
+            writer.write_edges(EDGES)
+        with BinaryGraphReader(self.path) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(list(reader.edges()), [(e["from"], e["relationship"], e["to"]) for e in EDGES])
+            self.assertEqual(reader.edge_ids(1), (2, 1, 0))
+            self.assertEqual(reader.sources.tolist(), [0, 2, 3])
+            self.assertEqual(len(reader.nodes), 5)
+            self.assertEqual(reader.relations[2], "located_in")
+            self.assertEqual(len(reader.to_graph()), 3)
+
+    def test_batches_and_empty_graph(self):
+        with BinaryWriter(self.path) as writer:
+            for i in range(70000):
+                writer.write_edge(f"n{i % 100}", "r", f"n{(i + 1) % 100}")
+        with BinaryGraphReader(self.path) as reader:
+            self.assertEqual(len(reader), 70000)
+            self.assertEqual(reader.edge(69999), ("n99", "r", "n0"))
+
+        with BinaryWriter(self.path):
+            pass
+        with BinaryGraphReader(self.path) as reader:
+            self.assertEqual(list(reader.edges()), [])
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as handle:
+            handle.write(b"not a graph at all, just some bytes padding it out" * 2)
+        with self.assertRaisesRegex(ValueError, "Not an eknowledge binary graph file."):
+            BinaryGraphReader(self.path)
+
+
+class TestOpenWriter(unittest.TestCase):
+
+    def test_picks_writer_by_extension(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for extension, writer_class in [(".jsonl", JsonlWriter), (".CSV", CsvWriter), (".ekg", BinaryWriter)]:
+                with open_writer(os.path.join(directory, "graph" + extension)) as writer:
+                    self.assertIsInstance(writer, writer_class)
+        with self.assertRaisesRegex(ValueError, "Unsupported export format '.txt'"):
+            open_writer("graph.txt")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock
+from eknowledge import KnowledgeGraph, ChunkResult, execute_graph_generation, normalize_label
+from .helpers import MockLLMResponse, SUCCESS_RESPONSE
+
+
+class TestKnowledgeGraph(unittest.TestCase):
+
+    def test_normalize_label(self):
+        self.assertEqual(normalize_label("  Node \n  A "), "node a")
+
+    def test_duplicates_are_merged_and_counted_per_chunk(self):
+        graph = KnowledgeGraph()
+        graph.add_chunk([
+            {"from": "Alice", "relationship": "knows", "to": "Bob"},
+            {"from": "alice", "relationship": "KNOWS", "to": " Bob "},
+        ])
+        graph.add_chunk([{"from": "Alice", "relationship": "knows", "to": "Bob"}])
+
+        self.assertEqual(len(graph), 1)
+        self.assertEqual(graph.count("ALICE", "knows", "bob"), 2)
+        self.assertEqual(graph.count("Alice", "knows", "Carol"), 0)
+        self.assertIn(("alice", "knows", "bob"), graph)
+        self.assertEqual(graph.nodes, ["Alice", "Bob"])
+
+    def test_adjacency_indexes(self):
+        graph = KnowledgeGraph.from_edges([
+            {"from": "A", "relationship": "r", "to": "B"},
+            {"from": "A", "relationship": "r", "to": "C"},
+            {"from": "C", "relationship": "s", "to": "B"},
+        ])
+
+        self.assertEqual(list(graph.outgoing("a")), [("A", "r", "B"), ("A", "r", "C")])
+        self.assertEqual(list(graph.incoming("B")), [("A", "r", "B"), ("C", "s", "B")])
+        self.assertEqual(list(graph.outgoing("missing")), [])
+
+    def test_to_list_exports_legacy_format(self):
+        graph = KnowledgeGraph.from_results([
+            ChunkResult(1, "text", [{"from": "A", "relationship": "r", "to": "B"}], 0, True),
+            ChunkResult(2, "text", [{"from": "a", "relationship": "r", "to": "b"}], 0, True),
+        ])
+
+        self.assertEqual(graph.to_list(), [{"from": "A", "relationship": "r", "to": "B"}])
+        self.assertEqual(graph.to_list(with_counts=True), [{"from": "A", "relationship": "r", "to": "B", "count": 2}])
+
+    def test_generation_can_return_graph(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=SUCCESS_RESPONSE)
+
+        graph = execute_graph_generation(text="one two three", llm=llm, chunk_size=1, sleep_time=0, as_graph=True)
+
+        self.assertIsInstance(graph, KnowledgeGraph)
+        self.assertEqual(len(graph), 1)
+        self.assertEqual(graph.count("A", "R", "B"), 3)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,106 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from eknowledge import ContentDefinedChunker, GraphSnapshot, execute_incremental_graph_generation
+from .helpers import EchoLLM, MockLLMResponse, node_xml
+
+
+def make_words(count, seed=0):
+    rng = random.Random(seed)
+    return [f"w{rng.randrange(300)}" for _ in range(count)]
+
+
+class TestContentDefinedChunker(unittest.TestCase):
+
+    def test_sizes_and_lossless(self):
+        words = make_words(5000)
+        chunks = list(ContentDefinedChunker(50).split(" ".join(words)))
+        self.assertEqual(" ".join(chunks).split(), words)
+        sizes = [len(chunk.split()) for chunk in chunks]
+        self.assertTrue(all(25 <= size <= 100 for size in sizes[:-1]))
+        self.assertTrue(30 <= sum(sizes) / len(sizes) <= 80)
+
+    def test_insertion_only_changes_nearby_chunks(self):
+        words = make_words(5000)
+        chunker = ContentDefinedChunker(50)
+        before = list(chunker.split(" ".join(words)))
+        after = list(chunker.split(" ".join(words[:2500] + ["new", "words"] + words[2500:])))
+        self.assertLessEqual(len(set(after) - set(before)), 2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesRegex(ValueError, "chunk_size must be a positive integer."):
+            ContentDefinedChunker(0)
+        with self.assertRaisesRegex(ValueError, "min_size and max_size"):
+            ContentDefinedChunker(10, min_size=20, max_size=5)
+
+
+class TestIncrementalGeneration(unittest.TestCase):
+
+    def setUp(self):
+        self.words = make_words(2000)
+
+    def test_first_run_extracts_everything(self):
+        llm = EchoLLM()
+        result = execute_incremental_graph_generation(text=" ".join(self.words), llm=llm, chunk_size=50)
+        self.assertEqual(result.reused_chunks, 0)
+        self.assertEqual(result.extracted_chunks, llm.calls)
+        self.assertEqual(len(result.snapshot), llm.calls)
+        self.assertEqual(result.removed, [])
+        self.assertEqual(len(result.added), len(result.graph))
+
+    def test_edit_only_requeries_changed_chunks(self):
+        first = execute_incremental_graph_generation(text=" ".join(self.words), llm=EchoLLM(), chunk_size=50)
+        edited = self.words[:1000] + ["inserted"] + self.words[1000:]
+        llm = EchoLLM()
+        second = execute_incremental_graph_generation(
+            text=" ".join(edited), llm=llm, chunk_size=50, snapshot=first.snapshot,
+        )
+        self.assertLessEqual(llm.calls, 2)
+        self.assertEqual(second.extracted_chunks, llm.calls)
+        self.assertEqual(second.reused_chunks + second.extracted_chunks, len(second.snapshot))
+        self.assertTrue(second.added or second.removed)
+
+        unchanged = execute_incremental_graph_generation(
+            text=" ".join(edited), llm=EchoLLM(), chunk_size=50, snapshot=second.snapshot,
+        )
+        self.assertEqual((unchanged.extracted_chunks, unchanged.added, unchanged.removed), (0, [], []))
+
+    def test_removed_edges(self):
+        first = execute_incremental_graph_generation(text="alpha beta", llm=EchoLLM())
+        second = execute_incremental_graph_generation(text="gamma delta", llm=EchoLLM(), snapshot=first.snapshot)
+        self.assertEqual(second.removed, [{"from": "alpha", "relationship": "R", "to": "beta"}])
+        self.assertEqual(second.added, [{"from": "gamma", "relationship": "R", "to": "delta"}])
+
+    def test_failed_chunks_are_not_snapshotted(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse("nothing")
+        result = execute_incremental_graph_generation(text="alpha beta", llm=llm, max_retries=1)
+        self.assertEqual(len(result.snapshot), 0)
+
+    def test_custom_packed_prompt_reuses_snapshot(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(
+            node_xml("A", "R", "B", source=1) + node_xml("C", "R", "D", source=2))
+        options = dict(chunk_size=1, pack_size=2, packed_user_prompt="Packed: {text} {relationships}")
+        first = execute_incremental_graph_generation(text="alpha beta", llm=llm, **options)
+        second = execute_incremental_graph_generation(text="alpha beta", llm=llm, snapshot=first.snapshot, **options)
+        self.assertEqual(llm.invoke.call_count, 1)
+        self.assertEqual(second.reused_chunks, 2)
+
+    def test_snapshot_round_trip(self):
+        first = execute_incremental_graph_generation(text=" ".join(self.words), llm=EchoLLM(), chunk_size=50)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.json")
+            first.snapshot.save(path)
+            loaded = GraphSnapshot.load(path)
+            with open(path, "w") as handle:
+                handle.write("{}")
+            with self.assertRaisesRegex(ValueError, "Unsupported snapshot file."):
+                GraphSnapshot.load(path)
+        self.assertEqual(loaded.chunks, first.snapshot.chunks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import sys
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+from eknowledge import (
+    Callback, MetricsAggregator, OpenTelemetryCallback, ResponseCache, RetryPolicy, execute_graph_generation,
+)
+from .helpers import MockLLMResponse, SUCCESS_RESPONSE
+
+
+class RecordingCallback(Callback):
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event):
+        self.events.append(event)
+
+
+class TestCallbacks(unittest.TestCase):
+
+    def setUp(self):
+        self.llm = MagicMock()
+        self.policy = RetryPolicy(base_delay=0.01, jitter=0)
+
+    def test_event_sequence(self):
+        self.llm.invoke.side_effect = [
+            Exception("boom"), MockLLMResponse("no nodes"), MockLLMResponse(SUCCESS_RESPONSE),
+        ]
+        recorder = RecordingCallback()
+        with patch("time.sleep"):
+            execute_graph_generation(text="one", llm=self.llm, retry_policy=self.policy, callbacks=[recorder])
+        self.assertEqual([event.name for event in recorder.events], [
+            "chunk_start",
+            "llm_call", "attempt_failed", "sleep",
+            "llm_call", "parse", "attempt_failed",
+            "llm_call", "parse",
+            "request_end", "chunk_end",
+        ])
+        self.assertEqual(len({event.key for event in recorder.events}), 1)
+        failures = [event.data for event in recorder.events if event.name == "attempt_failed"]
+        self.assertEqual([failure["reason"] for failure in failures], ["transport", "format"])
+        self.assertIn("boom", failures[0]["message"])
+        first_call = recorder.events[1].data
+        self.assertEqual(first_call["error"], "boom")
+        self.assertGreater(first_call["prompt_chars"], 0)
+        end = recorder.events[-1].data
+        self.assertEqual((end["edges"], end["retries"], end["success"]), (1, 2, True))
+
+    def test_aggregator(self):
+        self.llm.invoke.side_effect = [
+            MockLLMResponse("no nodes"), MockLLMResponse(SUCCESS_RESPONSE), MockLLMResponse(SUCCESS_RESPONSE),
+        ]
+        aggregator = MetricsAggregator()
+        cache = ResponseCache()
+        execute_graph_generation(
+            text="one two one", llm=self.llm, chunk_size=1, cache=cache, retry_policy=self.policy,
+            callbacks=[aggregator],
+        )
+        summary = aggregator.summary()
+        self.assertEqual(summary["chunks"], 3)
+        self.assertEqual(summary["llm_calls"], 3)
+        self.assertEqual(summary["retries"], 1)
+        self.assertEqual(summary["failures"], {"format": 1})
+        self.assertEqual(summary["edges"], 3)
+        self.assertEqual(summary["cached_chunks"], 1)
+        self.assertGreater(summary["response_chars"], 0)
+
+        aggregator.reset()
+        self.assertEqual(aggregator.summary()["chunks"], 0)
+
+    def test_verbose_uses_print_callback(self):
+        self.llm.invoke.return_value = MockLLMResponse(SUCCESS_RESPONSE)
+        recorder = RecordingCallback()
+        with patch("builtins.print") as mock_print:
+            execute_graph_generation(text="one", llm=self.llm, verbose=True, callbacks=[recorder])
+        mock_print.assert_any_call("Processing chunk 1/1...")
+        mock_print.assert_any_call("Nodes successfully processed in chunk 1/1.")
+        self.assertTrue(recorder.events)
+
+
+class TestOpenTelemetryCallback(unittest.TestCase):
+
+    def test_missing_dependency(self):
+        with patch.dict(sys.modules, {"opentelemetry": None}):
+            with self.assertRaisesRegex(ImportError, "opentelemetry-api"):
+                OpenTelemetryCallback()
+
+    def test_spans(self):
+        trace = types.ModuleType("opentelemetry.trace")
+        trace.set_span_in_context = lambda span: ("context", span)
+        package = types.ModuleType("opentelemetry")
+        package.trace = trace
+        tracer = MagicMock()
+        with patch.dict(sys.modules, {"opentelemetry": package, "opentelemetry.trace": trace}):
+            callback = OpenTelemetryCallback(tracer=tracer)
+
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(SUCCESS_RESPONSE)
+        execute_graph_generation(text="one", llm=llm, callbacks=[callback])
+        names = [call.args[0] for call in tracer.start_span.call_args_list]
+        self.assertEqual(names, ["eknowledge.chunk", "eknowledge.llm", "eknowledge.parse"])
+        chunk_span = tracer.start_span.return_value
+        self.assertEqual(tracer.start_span.call_args_list[1].kwargs["context"], ("context", chunk_span))
+        chunk_span.set_attribute.assert_any_call("eknowledge.chunk.edges", 1)
+        self.assertEqual(chunk_span.end.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import asyncio
+import subprocess
+import sys
+import time
+import unittest
+from functools import partial
+from unittest.mock import MagicMock
+from eknowledge import aexecute_graph_generation, execute_graph_generation
+from eknowledge.cache import model_identity
+from eknowledge.llm import Message, invoke, to_dicts, to_langchain_messages
+from .helpers import MockLLMResponse, SUCCESS_RESPONSE
+
+
+def fake_client(messages):
+    return SUCCESS_RESPONSE
+
+
+class TestMessages(unittest.TestCase):
+
+    def test_to_dicts(self):
+        messages = [Message("system", "be brief"), Message("user", "hello")]
+        self.assertEqual(to_dicts(messages), [
+            {"role": "system", "content": "be brief"}, {"role": "user", "content": "hello"},
+        ])
+
+    def test_to_langchain_messages(self):
+        try:
+            from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+        except ImportError:
+            self.skipTest("langchain-core is not installed")
+        converted = to_langchain_messages([Message("system", "s"), Message("user", "u"), Message("assistant", "a")])
+        self.assertEqual([type(message) for message in converted], [SystemMessage, HumanMessage, AIMessage])
+        self.assertEqual([message.content for message in converted], ["s", "u", "a"])
+
+    def test_invoke_rejects_coroutine_from_callable(self):
+        async def client(messages):
+            return SUCCESS_RESPONSE
+
+        with self.assertRaises(TypeError):
+            invoke(client, [Message("user", "hello")])
+
+
+class TestCallableClients(unittest.TestCase):
+
+    def test_callable_receives_role_dicts(self):
+        received = []
+
+        def client(messages):
+            received.append(messages)
+            return SUCCESS_RESPONSE
+
+        graph = execute_graph_generation(text="one two", llm=client)
+        self.assertEqual(graph, [{"from": "A", "relationship": "R", "to": "B"}])
+        self.assertEqual([message["role"] for message in received[0]], ["system", "user"])
+        self.assertIn("one two", received[0][1]["content"])
+
+    def test_callable_may_return_response_object(self):
+        graph = execute_graph_generation(text="one", llm=lambda messages: MockLLMResponse(SUCCESS_RESPONSE))
+        self.assertEqual(len(graph), 1)
+
+    def test_async_callable(self):
+        async def client(messages):
+            await asyncio.sleep(0)
+            return SUCCESS_RESPONSE
+
+        graph = asyncio.run(aexecute_graph_generation(text="one two three", llm=client, chunk_size=1))
+        self.assertEqual(len(graph), 3)
+
+    def test_sync_callable_in_async_entry_point(self):
+        graph = asyncio.run(aexecute_graph_generation(text="one", llm=fake_client))
+        self.assertEqual(len(graph), 1)
+
+    def test_invoke_object_still_supported(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(SUCCESS_RESPONSE)
+        self.assertEqual(len(execute_graph_generation(text="one", llm=llm)), 1)
+
+    def test_coroutine_client_rejected_by_blocking_entry_point(self):
+        calls = []
+
+        async def client(messages):
+            calls.append(messages)
+            return SUCCESS_RESPONSE
+
+        class AsyncClient:
+            async def __call__(self, messages):
+                calls.append(messages)
+                return SUCCESS_RESPONSE
+
+        for llm in (client, AsyncClient()):
+            with self.assertRaisesRegex(TypeError, "aexecute_graph_generation"):
+                execute_graph_generation(text="one", llm=llm, sleep_time=0)
+        self.assertEqual(calls, [])
+
+    def test_invoke_only_client_rejected_by_async_entry_point(self):
+        class InvokeOnly:
+            def __init__(self):
+                self.calls = 0
+
+            def invoke(self, messages):
+                self.calls += 1
+                return MockLLMResponse(SUCCESS_RESPONSE)
+
+        llm = InvokeOnly()
+        with self.assertRaisesRegex(TypeError, "ainvoke"):
+            asyncio.run(aexecute_graph_generation(text="one", llm=llm, sleep_time=0))
+        self.assertEqual(llm.calls, 0)
+
+    def test_sync_callable_does_not_block_event_loop(self):
+        in_flight = []
+        overlapped = []
+
+        def client(messages):
+            in_flight.append(messages)
+            time.sleep(0.05)
+            overlapped.append(len(in_flight) > 1)
+            in_flight.remove(messages)
+            return SUCCESS_RESPONSE
+
+        graph = asyncio.run(aexecute_graph_generation(
+            text="one two three", llm=client, chunk_size=1, max_concurrency=3, sleep_time=0))
+        self.assertEqual(len(graph), 3)
+        self.assertTrue(any(overlapped))
+
+    def test_non_client_rejected(self):
+        with self.assertRaises(TypeError):
+            execute_graph_generation(text="one", llm=object())
+
+    def test_model_identity_of_function(self):
+        self.assertEqual(model_identity(fake_client), f"{__name__}.fake_client")
+
+    def test_model_identity_tells_callables_apart(self):
+        def make_client(model):
+            return lambda messages: model
+
+        identities = {
+            model_identity(partial(fake_client)),
+            model_identity(partial(execute_graph_generation, model="a")),
+            model_identity(partial(execute_graph_generation, model="b")),
+            model_identity(make_client("a")),
+            model_identity(make_client("b")),
+            model_identity(lambda messages: SUCCESS_RESPONSE),
+        }
+        self.assertEqual(len(identities), 6)
+
+    def test_model_identity_is_stable_for_unrepresentable_captures(self):
+        class Unrepresentable:
+            def __repr__(self):
+                raise RuntimeError("no repr")
+
+        def make_client(value):
+            return lambda messages: value
+
+        identities = {model_identity(make_client(value)) for value in (object(), object(), Unrepresentable())}
+        self.assertEqual(len(identities), 2)
+        self.assertNotIn(" at 0x", "".join(identities))
+        self.assertEqual(model_identity(partial(fake_client, object())), f"{__name__}.fake_client(object)")
+
+    def test_model_attribute_names_callable(self):
+        def client(messages):
+            return SUCCESS_RESPONSE
+
+        client.model = "local-model"
+        self.assertEqual(model_identity(client), "function:local-model")
+
+
+class TestImport(unittest.TestCase):
+
+    def test_import_does_not_load_langchain(self):
+        output = subprocess.run(
+            [sys.executable, "-c", "import sys, eknowledge; print(any(name.startswith('langchain') for name in sys.modules))"],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
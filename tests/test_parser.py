@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from eknowledge import CheckpointJournal, ResponseCache, parse_response, execute_graph_generation
+from .helpers import MockLLMResponse, node_xml as node
+
+
+class TestParseResponse(unittest.TestCase):
+
+    def test_nodes_inside_wrapper(self):
+        content = "Here you go:\n<nodes>\n" + node("A", "is_a", "B") + "\n" + node(" C ", "part_of", "D") + "\n</nodes>"
+        result = parse_response(content)
+
+        self.assertEqual(result.edges, [
+            {"from": "A", "relationship": "is_a", "to": "B"},
+            {"from": "C", "relationship": "part_of", "to": "D"},
+        ])
+        self.assertEqual((result.node_count, result.rejected, result.truncated), (2, 0, False))
+
+    def test_no_nodes(self):
+        result = parse_response("Nothing relevant.")
+        self.assertEqual((result.edges, result.node_count), ([], 0))
+
+    def test_incomplete_nodes_are_rejected(self):
+        content = "<node><from_node>Bad</from_node></node>" + node("", "is_a", "B") + node("A", "is_a", "B")
+        result = parse_response(content)
+
+        self.assertEqual(result.edges, [{"from": "A", "relationship": "is_a", "to": "B"}])
+        self.assertEqual((result.node_count, result.rejected), (3, 2))
+
+    def test_truncated_output_is_salvaged(self):
+        content = node("A", "is_a", "B") + "<node><from_node>C</from_node><relationship>part_of</relationship><to_node>D</to_node>"
+        result = parse_response(content)
+
+        self.assertEqual(len(result.edges), 2)
+        self.assertTrue(result.truncated)
+
+        result = parse_response(content, salvage=False)
+        self.assertEqual(len(result.edges), 1)
+        self.assertEqual(result.rejected, 1)
+
+    def test_unclosed_node_followed_by_another(self):
+        content = "<node><from_node>A</from_node><relationship>r</relationship><to_node>B</to_node>" + node("C", "r", "D")
+        result = parse_response(content)
+
+        self.assertEqual([edge["from"] for edge in result.edges], ["A", "C"])
+        self.assertFalse(result.truncated)
+
+    def test_cut_off_field_is_not_used(self):
+        result = parse_response("<node><from_node>A</from_node><relationship>r</relationship><to_node>Bo")
+        self.assertEqual(result.edges, [])
+        self.assertEqual((result.node_count, result.rejected, result.truncated), (1, 1, True))
+
+    def test_relations_are_validated(self):
+        content = node("A", " IS_A ", "B") + node("A", "made_up", "B")
+        result = parse_response(content, relations=["is_a", "part_of"])
+
+        self.assertEqual(result.edges, [{"from": "A", "relationship": "IS_A", "to": "B"}])
+        self.assertEqual(result.rejected, 1)
+
+    def test_sources(self):
+        content = node("A", "r", "B", source=2) + node("C", "r", "D")
+        self.assertEqual(parse_response(content).sources, [2, None])
+
+    def test_non_ascii_sources(self):
+        content = node("A", "r", "B", source="²") + node("C", "r", "D", source="٣") + node("E", "r", "F", source="-1")
+        result = parse_response(content)
+        self.assertEqual(len(result.edges), 3)
+        self.assertEqual(result.sources, [None, 3, None])
+
+    def test_generation_validates_relations_when_asked(self):
+        llm = MagicMock()
+        llm.invoke.side_effect = [
+            MockLLMResponse(content=node("A", "made_up", "B")),
+            MockLLMResponse(content=node("A", "REL1", "B")),
+        ]
+
+        graph = execute_graph_generation(
+            text="words", llm=llm, relations=["REL1"], validate_relations=True, sleep_time=0)
+
+        self.assertEqual(graph, [{"from": "A", "relationship": "REL1", "to": "B"}])
+        self.assertEqual(llm.invoke.call_count, 2)
+
+    def test_validation_is_part_of_the_cache_key(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=node("A", "BOGUS", "B"))
+        cache = ResponseCache()
+
+        unvalidated = execute_graph_generation(text="words", llm=llm, relations=["REL1"], cache=cache)
+        validated = execute_graph_generation(
+            text="words", llm=llm, relations=["REL1"], validate_relations=True, max_retries=1, cache=cache)
+
+        self.assertEqual(unvalidated, [{"from": "A", "relationship": "BOGUS", "to": "B"}])
+        self.assertEqual(validated, [])
+        self.assertEqual(llm.invoke.call_count, 2)
+
+    def test_validated_checkpoint_is_not_reused_unvalidated(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=node("A", "REL1", "B") + node("C", "BOGUS", "D"))
+        handle, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+
+        with CheckpointJournal(path) as journal:
+            execute_graph_generation(text="words", llm=llm, relations=["REL1"], validate_relations=True, checkpoint=journal)
+        with CheckpointJournal(path) as journal:
+            unvalidated = execute_graph_generation(text="words", llm=llm, relations=["REL1"], checkpoint=journal)
+
+        self.assertEqual(len(unvalidated), 2)
+        self.assertEqual(llm.invoke.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
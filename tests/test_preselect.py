@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import MagicMock
+from eknowledge import RelationSelector, ResponseCache, execute_graph_generation, RELATIONS
+from .helpers import MockLLMResponse, node_xml
+
+
+SUCCESS_RESPONSE = node_xml("A", "is_a", "B")
+
+
+class TestRelationSelector(unittest.TestCase):
+
+    def test_selects_relevant_relations(self):
+        selector = RelationSelector(top_k=8)
+        selected = selector.select("Aspirin treats headaches; the drug is produced by Bayer, which is located in Germany.")
+        self.assertEqual(len(selected), 8)
+        for relation in ("produced_by", "located_in", "treated_by"):
+            self.assertIn(relation, selected)
+
+    def test_keeps_original_order_and_always_include(self):
+        selector = RelationSelector(top_k=5)
+        selected = selector.select("Paris is located in France.")
+        self.assertEqual(selected, [relation for relation in RELATIONS if relation in selected])
+        for relation in ("is_a", "part_of", "associated_with"):
+            self.assertIn(relation, selected)
+
+    def test_top_k_covering_all_relations(self):
+        self.assertEqual(RelationSelector(top_k=len(RELATIONS)).select("anything"), RELATIONS)
+
+    def test_custom_relations_without_descriptions(self):
+        selector = RelationSelector(relations=["likes", "owns", "knows"], top_k=1, always_include=())
+        self.assertEqual(selector.select("Bob owns a car."), ["owns"])
+
+    def test_for_relations(self):
+        selector = RelationSelector(top_k=2)
+        self.assertIs(selector.for_relations(RELATIONS), selector)
+        custom = selector.for_relations(["likes", "owns", "part_of"])
+        self.assertEqual(custom.select("Bob owns a wheel."), ["owns", "part_of"])
+
+    def test_invalid_top_k(self):
+        with self.assertRaisesRegex(ValueError, "top_k must be a positive integer."):
+            RelationSelector(top_k=0)
+
+
+class TestPreselectionInGeneration(unittest.TestCase):
+
+    def test_subset_on_first_attempt_and_full_list_on_retry(self):
+        llm = MagicMock()
+        llm.invoke.side_effect = [MockLLMResponse("garbage"), MockLLMResponse(SUCCESS_RESPONSE)]
+        selector = RelationSelector(top_k=5)
+        edges = execute_graph_generation(
+            text="Paris is located in France", llm=llm, relation_selector=selector, compact_relations=True,
+        )
+        self.assertEqual(edges, [{"from": "A", "relationship": "is_a", "to": "B"}])
+        first = llm.invoke.call_args_list[0][0][0][1].content
+        second = llm.invoke.call_args_list[1][0][0][1].content
+        self.assertNotIn("has_symptom", first)
+        self.assertIn("located_in", first)
+        self.assertIn("has_symptom", second)
+
+    def test_subset_is_drawn_from_run_relations(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(node_xml("A", "rel_3", "B"))
+        relations = [f"rel_{i}" for i in range(30)]
+        execute_graph_generation(
+            text="Paris is located in France", llm=llm, relations=relations,
+            relation_selector=RelationSelector(top_k=5), compact_relations=True,
+        )
+        offered = llm.invoke.call_args_list[0][0][0][1].content.split("Possible relationships include: \n")[1].strip()
+        self.assertEqual(offered.split(", "), relations[:5])
+
+    def test_selector_is_part_of_the_cache_key(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(SUCCESS_RESPONSE)
+        cache = ResponseCache()
+        text = "Paris is located in France"
+
+        execute_graph_generation(text=text, llm=llm, cache=cache)
+        execute_graph_generation(text=text, llm=llm, cache=cache, relation_selector=RelationSelector(top_k=5))
+        execute_graph_generation(text=text, llm=llm, cache=cache, relation_selector=RelationSelector(top_k=6))
+        self.assertEqual(llm.invoke.call_count, 3)
+
+        execute_graph_generation(text=text, llm=llm, cache=cache, relation_selector=RelationSelector(top_k=5))
+        execute_graph_generation(text=text, llm=llm, cache=cache, relation_selector=RelationSelector(top_k=1000))
+        self.assertEqual(llm.invoke.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from eknowledge import RateLimiter, TokenBucket, iter_graph_generation
+from .helpers import MockLLMResponse, SUCCESS_RESPONSE
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket.reserve(1), 0.0)
+        self.assertEqual(bucket.reserve(1), 0.0)
+        self.assertAlmostEqual(bucket.reserve(1), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(1), 0.2, places=2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesRegex(ValueError, "rate must be positive."):
+            TokenBucket(rate=0, capacity=1)
+        with self.assertRaisesRegex(ValueError, "capacity must be positive."):
+            TokenBucket(rate=1, capacity=0)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_requires_a_limit(self):
+        with self.assertRaisesRegex(ValueError, "Either requests_per_second or tokens_per_minute must be provided."):
+            RateLimiter()
+
+    def test_token_limit(self):
+        limiter = RateLimiter(tokens_per_minute=600)
+        self.assertEqual(limiter.reserve(10), 0.0)
+        self.assertAlmostEqual(limiter.reserve(10), 1.0, places=2)
+
+    def test_shared_between_threads(self):
+        limiter = RateLimiter(requests_per_second=1000, burst_seconds=0.01)
+        waits = []
+
+        def worker():
+            for _ in range(10):
+                waits.append(limiter.reserve())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 40 requests with a burst of 10 must be spread over at least 30 ms
+        self.assertGreaterEqual(max(waits), 0.029)
+
+    def test_aacquire(self):
+        limiter = RateLimiter(requests_per_second=100)
+        wait = asyncio.run(limiter.aacquire())
+        self.assertEqual(wait, 0.0)
+
+    def test_generation_consults_limiter(self):
+        llm = MagicMock()
+        llm.invoke.return_value = MockLLMResponse(content=SUCCESS_RESPONSE)
+        limiter = MagicMock()
+        limiter.reserve.return_value = 0.25
+
+        with patch("eknowledge.main.time.sleep") as mock_sleep:
+            results = list(iter_graph_generation(text="one two", llm=llm, chunk_size=1, rate_limiter=limiter))
+
+        self.assertEqual(limiter.reserve.call_count, 2)
+        self.assertGreater(limiter.reserve.call_args[0][0], 0)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(results[0].sleep_seconds, 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,88 @@
+import unittest
+from eknowledge import AliasTable, EntityResolver, KnowledgeGraph, resolve_edges, resolve_graph
+
+
+class TestEntityResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.resolver = EntityResolver()
+
+    def test_key_normalisation(self):
+        for label in ("Python", "python language", "Python (language)", "  PYTHON  ", "Python programming language"):
+            self.assertEqual(self.resolver.key(label), "python")
+        self.assertEqual(self.resolver.key("Microsoft Corp."), "microsoft")
+        self.assertEqual(self.resolver.key("The Company"), "the company")
+        self.assertEqual(self.resolver.key("Language"), "language")
+
+    def test_resolve_clusters_variants(self):
+        table = self.resolver.resolve([
+            "Python (language)", "Python", "python language", "Python",
+            "Guido van Rossum", "Guido van Rosum", "Java", "JavaScript", "Python 2", "Python 3",
+        ])
+        self.assertIsInstance(table, AliasTable)
+        self.assertEqual(table.canonical("python language"), "Python")
+        self.assertEqual(table.aliases("PYTHON"), ["Python (language)", "Python", "python language"])
+        self.assertEqual(table.canonical("Guido van Rosum"), "Guido van Rossum")
+        self.assertNotEqual(table.canonical_id("Java"), table.canonical_id("JavaScript"))
+        self.assertNotEqual(table.canonical_id("Python 2"), table.canonical_id("Python 3"))
+        self.assertEqual(len(table), 6)
+        self.assertEqual(table.canonical("Unknown"), "Unknown")
+        self.assertIsNone(table.canonical_id("Unknown"))
+
+    def test_symbols_distinguish_entities(self):
+        self.assertEqual(self.resolver.key("C++ (language)"), "c++")
+        table = self.resolver.resolve([
+            "C", "C++", "C#", "c++ language", "C (programming language)", "Microsoft Visual C++", "Microsoft Visual C#",
+        ])
+        self.assertEqual(table.to_dict(), {
+            "C": ["C", "C (programming language)"],
+            "C++": ["C++", "c++ language"],
+            "C#": ["C#"],
+            "Microsoft Visual C++": ["Microsoft Visual C++"],
+            "Microsoft Visual C#": ["Microsoft Visual C#"],
+        })
+
+    def test_large_input_without_pairwise_comparison(self):
+        labels = [f"entity {i} corp" for i in range(5000)] + [f"Entity {i}" for i in range(5000)]
+        table = self.resolver.resolve(labels)
+        self.assertEqual(len(table), 5000)
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesRegex(ValueError, "threshold must be between 0 and 1."):
+            EntityResolver(threshold=0)
+        with self.assertRaisesRegex(ValueError, "bands must be a positive integer dividing num_perm."):
+            EntityResolver(num_perm=10, bands=3)
+
+
+class TestResolveEdges(unittest.TestCase):
+
+    def test_resolve_edges(self):
+        edges = [
+            {"from": "Python", "relationship": "created_by", "to": "Guido van Rossum"},
+            {"from": "Python (language)", "relationship": "created_by", "to": "Guido van Rossum"},
+            {"from": "python language", "relationship": "is_a", "to": "Language"},
+            {"from": "Python", "relationship": "equivalent_to", "to": "Python (language)"},
+        ]
+        resolved, table = resolve_edges(edges)
+        self.assertEqual(resolved, [
+            {"from": "Python", "relationship": "created_by", "to": "Guido van Rossum", "from_id": 0, "to_id": 1},
+            {"from": "Python", "relationship": "is_a", "to": "Language", "from_id": 0, "to_id": 2},
+        ])
+        self.assertEqual(table.labels, ["Python", "Guido van Rossum", "Language"])
+
+        resolved, _ = resolve_edges(edges, drop_self_loops=False)
+        self.assertEqual(len(resolved), 3)
+
+    def test_resolve_graph_sums_counts(self):
+        graph = KnowledgeGraph()
+        graph.add_edge("Python", "is_a", "Language")
+        graph.add_edge("Python", "is_a", "Language")
+        graph.add_edge("Python (language)", "is_a", "Language")
+        resolved, table = resolve_graph(graph)
+        self.assertEqual(len(resolved), 1)
+        self.assertEqual(resolved.count("Python", "is_a", "Language"), 3)
+        self.assertEqual(table.canonical("Python (language)"), "Python")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from eknowledge import RetryPolicy, RetryBudget, iter_graph_generation, execute_graph_generation
+from eknowledge.retry import TRANSPORT_ERROR, FORMAT_ERROR
+from .helpers import MockLLMResponse, SUCCESS_RESPONSE
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_exponential_backoff_without_jitter(self):
+        policy = RetryPolicy(base_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=0)
+        self.assertEqual([policy.delay(TRANSPORT_ERROR, n) for n in range(1, 5)], [1.0, 2.0, 4.0, 5.0])
+
+    def test_delay_stays_capped_after_many_failures(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=30.0, jitter=0, max_attempts=5000)
+        self.assertEqual(policy.delay(TRANSPORT_ERROR, 2000), 30.0)
+        self.assertEqual(RetryPolicy(base_delay=0, jitter=0).delay(TRANSPORT_ERROR, 2000), 0.0)
+
+    def test_jitter_stays_within_bounds(self):
+        policy = RetryPolicy(base_delay=1.0, jitter=0.5, seed=1)
+        for _ in range(100):
+            self.assertTrue(0.5 <= policy.delay(TRANSPORT_ERROR, 1) <= 1.0)
+
+    def test_format_errors_use_format_delay(self):
+        self.assertEqual(RetryPolicy().delay(FORMAT_ERROR, 3), 0.0)
+        self.assertEqual(RetryPolicy(format_delay=0.2).delay(FORMAT_ERROR, 1), 0.2)
+
+    def test_budget(self):
+        budget = RetryBudget(2)
+        self.assertEqual([budget.spend() for _ in range(3)], [True, True, False])
+        self.assertTrue(budget.exhausted)
+        self.assertTrue(RetryBudget(None).spend())
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesRegex(ValueError, "max_attempts must be a positive integer."):
+            RetryPolicy(max_attempts=0)
+        with self.assertRaisesRegex(ValueError, "jitter must be between 0 and 1."):
+            RetryPolicy(jitter=2)
+        with self.assertRaisesRegex(ValueError, "retry_budget must be a non-negative integer."):
+            RetryPolicy(retry_budget=-1)
+
+
+class TestGenerationRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_llm = MagicMock()
+
+    def test_no_sleep_after_success(self):
+        self.mock_llm.invoke.return_value = MockLLMResponse(content=SUCCESS_RESPONSE)
+
+        with patch("eknowledge.main.time.sleep") as mock_sleep:
+            execute_graph_generation(text="one two three", llm=self.mock_llm, chunk_size=1)
+
+        mock_sleep.assert_not_called()
+
+    def test_transport_errors_back_off(self):
+        self.mock_llm.invoke.side_effect = [
+            ConnectionError("down"),
+            ConnectionError("down"),
+            MockLLMResponse(content=SUCCESS_RESPONSE),
+        ]
+        policy = RetryPolicy(base_delay=0.5, multiplier=2.0, jitter=0)
+
+        with patch("eknowledge.main.time.sleep") as mock_sleep:
+            result, = iter_graph_generation(text="words", llm=self.mock_llm, retry_policy=policy)
+
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.5, 1.0])
+        self.assertEqual(result.retries, 2)
+        self.assertEqual(result.sleep_seconds, 1.5)
+        self.assertGreaterEqual(result.llm_seconds, 0.0)
+
+    def test_format_errors_retry_immediately(self):
+        self.mock_llm.invoke.side_effect = [
+            MockLLMResponse(content="no nodes"),
+            MockLLMResponse(content=SUCCESS_RESPONSE),
+        ]
+
+        with patch("eknowledge.main.time.sleep") as mock_sleep:
+            result, = iter_graph_generation(text="words", llm=self.mock_llm)
+
+        mock_sleep.assert_not_called()
+        self.assertTrue(result.success)
+
+    def test_retry_budget_is_shared_across_chunks(self):
+        self.mock_llm.invoke.return_value = MockLLMResponse(content="no nodes")
+        policy = RetryPolicy(max_attempts=5, retry_budget=3)
+
+        results = list(iter_graph_generation(text="one two", llm=self.mock_llm, chunk_size=1, retry_policy=policy))
+
+        # Chunk 1 uses the whole budget (1 call + 3 retries); chunk 2 gets a single call
+        self.assertEqual(self.mock_llm.invoke.call_count, 5)
+        self.assertFalse(any(result.success for result in results))
+
+    def test_corrective_prompt(self):
+        self.mock_llm.invoke.side_effect = [
+            MockLLMResponse(content="I found A relates to B."),
+            MockLLMResponse(content=SUCCESS_RESPONSE),
+        ]
+        policy = RetryPolicy(corrective_prompt=True)
+
+        result, = iter_graph_generation(text="words", llm=self.mock_llm, retry_policy=policy)
+
+        self.assertTrue(result.success)
+        retry_messages = self.mock_llm.invoke.call_args_list[1][0][0]
+        self.assertEqual(len(retry_messages), 4)
+        self.assertEqual(retry_messages[2].content, "I found A relates to B.")
+        self.assertIn("could not be parsed", retry_messages[3].content)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)